@@ -40,9 +40,47 @@ class Config:
 
     # Application Settings
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-    MAX_KEYWORDS = int(os.getenv('MAX_KEYWORDS', '1000'))
+    MAX_KEYWORDS = int(os.getenv('MAX_KEYWORDS', '200000'))  # per batch; larger uploads are rejected
     MAX_CLUSTERS = int(os.getenv('MAX_CLUSTERS', '10'))
     PROCESSING_TIMEOUT = int(os.getenv('PROCESSING_TIMEOUT', '600'))  # 10 minutes
+    CLUSTER_WORKERS = int(os.getenv('CLUSTER_WORKERS', '4'))  # clusters researched in parallel
+    LARGE_BATCH_THRESHOLD = int(os.getenv('LARGE_BATCH_THRESHOLD', '20000'))  # mini-batch clustering above this
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))  # batches, regenerations and exports run at once per process
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1'))  # seconds an idle worker waits between queue checks
+    JOB_HEARTBEAT_TTL = int(os.getenv('JOB_HEARTBEAT_TTL', '30'))  # seconds before a stopped process's jobs are recovered
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))  # runs of a job before recovery gives up on it
+    HISTORY_CACHE_TTL = int(os.getenv('HISTORY_CACHE_TTL', '30'))  # seconds /history reuses a user's batch list, 0 disables
+    USER_ACTIVITY_INTERVAL = int(os.getenv('USER_ACTIVITY_INTERVAL', '300'))  # seconds between last_active_at writes per user
+
+    # Web Search
+    SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', '86400'))  # seconds search results are reused
+    SEARCH_RATE_PER_SECOND = float(os.getenv('SEARCH_RATE_PER_SECOND', '1'))  # shared SerpAPI token refill rate
+    SEARCH_RATE_BURST = int(os.getenv('SEARCH_RATE_BURST', '1'))  # SerpAPI requests allowed back to back
+
+    # Web Scraping
+    SCRAPE_WORKERS = int(os.getenv('SCRAPE_WORKERS', '8'))  # concurrent fetches per scraper
+    SCRAPE_DEADLINE = float(os.getenv('SCRAPE_DEADLINE', '15'))  # seconds per cluster
+    SCRAPE_HOST_DELAY = float(os.getenv('SCRAPE_HOST_DELAY', '0.5'))  # seconds between requests to one host
+    SCRAPE_MAX_BYTES = int(os.getenv('SCRAPE_MAX_BYTES', '524288'))  # HTML bytes parsed per page
+    SCRAPE_CACHE_TTL = int(os.getenv('SCRAPE_CACHE_TTL', '86400'))  # seconds a page is used without revalidation
+    SCRAPE_CACHE_MAX_AGE = int(os.getenv('SCRAPE_CACHE_MAX_AGE', '604800'))  # seconds kept for revalidation
+
+    # LLM (Groq)
+    LLM_WORKERS = int(os.getenv('LLM_WORKERS', '4'))  # concurrent completions per batch call
+    LLM_REQUESTS_PER_MINUTE = float(os.getenv('LLM_REQUESTS_PER_MINUTE', '30'))  # shared Groq request budget, 0 disables
+    LLM_REQUEST_BURST = int(os.getenv('LLM_REQUEST_BURST', '4'))  # Groq requests allowed back to back
+    LLM_TOKENS_PER_MINUTE = int(os.getenv('LLM_TOKENS_PER_MINUTE', '0'))  # shared Groq token budget, 0 disables
+    LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', '86400'))  # seconds identical prompts reuse a response, 0 disables
+    LLM_CACHE_SIZE = int(os.getenv('LLM_CACHE_SIZE', '256'))  # responses kept in the in-process LRU
+    LLM_JSON_MODE = os.getenv('LLM_JSON_MODE', 'true').lower() == 'true'  # strict JSON responses where supported
+    FUSED_GENERATION = os.getenv('FUSED_GENERATION', 'false').lower() == 'true'  # outline + idea in one completion
+    STREAM_OUTLINES = os.getenv('STREAM_OUTLINES', 'false').lower() == 'true'  # show outline progress in Slack while generating (without JSON mode)
+    STREAM_UPDATE_INTERVAL = float(os.getenv('STREAM_UPDATE_INTERVAL', '1.5'))  # seconds between Slack draft updates
+    PROGRESS_UPDATE_INTERVAL = float(os.getenv('PROGRESS_UPDATE_INTERVAL', '2'))  # seconds between edits of one Slack message
+    LLM_COMPACT_PROMPTS = os.getenv('LLM_COMPACT_PROMPTS', 'false').lower() == 'true'  # instructions in the system message, minified schemas
+
+    # Embeddings
+    EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
 
     # Health Check
     HEALTH_CHECK_PORT = int(os.getenv('HEALTH_CHECK_PORT', '3000'))
@@ -1,8 +1,8 @@
 import redis
 import json
 import re
-import threading
 from app.config import Config
+from app.services.data.job_queue import enqueue_job, register_job_handler
 from app.services.processing.keyword_parser import KeywordParser
 from app.services.processing.pipeline import ProcessingPipeline
 
@@ -11,6 +11,13 @@ redis_client = redis.from_url(Config.REDIS_URL) if Config.REDIS_URL else None
 def register(app):
     """Register all command handlers"""
     
+    # Long-running work is queued and run by the job worker pool
+    register_job_handler('process_keywords', ProcessingPipeline.run_job)
+    register_job_handler('regenerate_outlines', lambda client, job: run_regenerate_job(client, job))
+    register_job_handler('export_batch', lambda client, job: export_batch(
+        client, job['channel_id'], job['batch_id'], job['destination'], job['user_id']
+    ))
+    
     @app.command("/process_keywords")
     def handle_process_keywords(ack, body, client):
         ack()
@@ -22,7 +29,11 @@ def register(app):
         if text:
             # Process immediately
             parser = KeywordParser()
-            keywords = parser.parse_text(text)
+            try:
+                keywords = parser.parse_text(text)
+            except ValueError as e:
+                client.chat_postMessage(channel=channel_id, text=f"⚠️ {str(e)}")
+                return
             
             client.chat_postMessage(
                 channel=channel_id,
@@ -62,14 +73,20 @@ def register(app):
         slack_user_id = body['user_id']
         channel_id = body['channel_id']
 
+        from app.services.data.cache import CacheService
         from app.services.data.database import DatabaseService
         db = DatabaseService()
+        cache = CacheService()
 
         # Get or create user to ensure we have the UUID
-        user = db.get_or_create_user(slack_user_id)
-        user_id = user['id']
+        user_id = db.get_user_id(slack_user_id)
 
-        history = db.get_user_history(user_id, limit=5)
+        # Batches with cluster counts and report flags in one query
+        history = cache.get_cached_history(user_id)
+        if history is None:
+            history = db.get_user_batch_history(user_id, limit=5)
+            if history and Config.HISTORY_CACHE_TTL > 0:
+                cache.cache_history(user_id, history, ttl=Config.HISTORY_CACHE_TTL)
         
         if not history:
             client.chat_postMessage(
@@ -85,16 +102,8 @@ def register(app):
         ]
         
         for batch in history:
-            # Get cluster count for this batch
-            clusters = db.get_clusters_by_batch(batch['id'])
-            cluster_count = len(clusters) if clusters else 0
-            
-            # Get report info
-            try:
-                report_info = db.client.table('reports').select('*').eq('batch_id', batch['id']).execute()
-                has_report = bool(report_info.data)
-            except:
-                has_report = False
+            cluster_count = batch.get('cluster_count') or 0
+            has_report = bool(batch.get('has_report'))
             
             status_emoji = {
                 'completed': '✅',
@@ -164,8 +173,7 @@ def register(app):
         db = DatabaseService()
 
         # Get or create user to ensure we have the UUID
-        user = db.get_or_create_user(slack_user_id)
-        user_id = user['id']
+        user_id = db.get_user_id(slack_user_id)
 
         # Verify batch exists and belongs to user
         batch = db.get_batch_by_id(batch_id, user_id)
@@ -199,13 +207,8 @@ def register(app):
             text=f"♻️ Regenerating all outlines for batch `{batch_id[:8]}`..."
         )
 
-        # Start regeneration in background
-        thread = threading.Thread(
-            target=regenerate_outlines,
-            args=(client, channel_id, user_id, batch['id'], clusters)
-        )
-        thread.daemon = True
-        thread.start()
+        # Queue regeneration
+        enqueue_job('regenerate_outlines', slack_user_id, channel_id, batch_id=batch['id'])
 
     @app.action(re.compile(r"details_.*"))
     def handle_details_action(ack, body, client):
@@ -223,8 +226,7 @@ def register(app):
         formatter = SlackFormatter()
 
         # Get or create user to ensure we have the UUID
-        user = db.get_or_create_user(slack_user_id)
-        user_id = user['id']
+        user_id = db.get_user_id(slack_user_id)
 
         # Verify batch exists and belongs to user
         batch = db.get_batch_by_id(batch_id, user_id)
@@ -235,8 +237,8 @@ def register(app):
             )
             return
 
-        # Get clusters for this batch
-        clusters = db.get_clusters_by_batch(batch['id'])
+        # Get clusters for this batch, with their outlines and post ideas
+        clusters = db.get_clusters_by_batch(batch['id'], full=True)
 
         if not clusters:
             client.chat_postMessage(
@@ -378,22 +380,27 @@ def register(app):
                 text=f"♻️ Regenerating all outlines for batch `{batch_id[:8]}`..."
             )
         
-        # Start regeneration in background
-        thread = threading.Thread(
-            target=regenerate_outlines,
-            args=(client, channel_id, user_id, batch['id'], clusters)
-        )
-        thread.daemon = True
-        thread.start()
+        # Queue regeneration
+        enqueue_job('regenerate_outlines', user_id, channel_id, batch_id=batch['id'], cluster_number=cluster_number)
+    
+    def run_regenerate_job(client, job):
+        """Job handler for 'regenerate_outlines': reloads the clusters and regenerates them"""
+        from app.services.data.database import DatabaseService
+        clusters = DatabaseService().get_clusters_by_batch(job['batch_id'])
+        if job.get('cluster_number'):
+            clusters = [c for c in clusters if c.get('cluster_number') == job['cluster_number']]
+        regenerate_outlines(client, job['channel_id'], job['user_id'], job['batch_id'], clusters)
     
     def regenerate_outlines(client, channel_id, user_id, batch_id, clusters):
         """Regenerate outlines for specified clusters"""
         try:
             from app.services.external.web_search import WebSearchService
             from app.services.processing.content_scraper import ContentScraper
+            from app.services.ai.llm_client import LLMClient
             from app.services.ai.outline_generator import OutlineGenerator
             from app.services.ai.idea_generator import IdeaGenerator
             from app.services.data.database import DatabaseService
+            from app.utils.progress_reporter import ProgressReporter
             from app.utils.slack_formatters import SlackFormatter
             
             db = DatabaseService()
@@ -401,32 +408,59 @@ def register(app):
             
             search_service = WebSearchService()
             scraper = ContentScraper()
-            outline_gen = OutlineGenerator()
-            idea_gen = IdeaGenerator()
+            # Bypass the response cache: regeneration must produce fresh output
+            llm = LLMClient(use_cache=False)
+            outline_gen = OutlineGenerator(llm)
+            idea_gen = IdeaGenerator(llm)
+            
+            # One status line per cluster, edited in place
+            progress = ProgressReporter(client, channel_id)
+            progress_lines = []
+            research = []
+            try:
+                for cluster in clusters:
+                    cluster_name = cluster.get('cluster_name', 'Unnamed Cluster')
+                    progress_lines.append(f"🔄 Regenerating outline for cluster: {cluster_name}")
+                    progress.update('\n'.join(progress_lines))
+                    
+                    # Re-search and scrape content
+                    keywords = cluster.get('keywords', [])
+                    main_keyword = keywords[0] if keywords else cluster_name.split()[0]
+                    search_results = search_service.search_single(main_keyword, count=5)
+                    
+                    urls = [r['url'] for r in search_results[:3]]
+                    scraped_data = scraper.scrape_urls(urls)
+                    research.append((cluster, scraped_data))
+            finally:
+                scraper.close()
+            
+            progress.flush()
             
-            for cluster in clusters:
+            # Generate all outlines together; one failure doesn't stop the others
+            results = outline_gen.generate_outlines(research, with_ideas=Config.FUSED_GENERATION)
+            
+            failed = 0
+            updated = []
+            for (cluster, _), result in zip(research, results):
                 cluster_name = cluster.get('cluster_name', 'Unnamed Cluster')
-                client.chat_postMessage(
-                    channel=channel_id,
-                    text=f"🔄 Regenerating outline for cluster: {cluster_name}"
-                )
-                
-                # Re-search and scrape content
                 keywords = cluster.get('keywords', [])
-                main_keyword = keywords[0] if keywords else cluster_name.split()[0]
-                search_results = search_service.search_single(main_keyword, count=5)
-                
-                urls = [r['url'] for r in search_results[:3]]
-                scraped_data = scraper.scrape_urls(urls)
                 
-                # Generate new outline
-                new_outline = outline_gen.generate_outline(cluster, scraped_data)
-                
-                # Generate new post idea
-                new_idea = idea_gen.generate_idea(cluster, new_outline)
+                try:
+                    if result['error']:
+                        raise Exception(result['error'])
+                    new_outline = result['outline']
+                    
+                    # Generate new post idea (already done in fused mode)
+                    new_idea = result.get('post_idea') or idea_gen.generate_idea(cluster, new_outline)
+                except Exception as e:
+                    failed += 1
+                    client.chat_postMessage(
+                        channel=channel_id,
+                        text=f"⚠️ Could not regenerate cluster {cluster_name}: {str(e)}"
+                    )
+                    continue
                 
-                # Update database
-                db.update_cluster_outline(batch_id, cluster['id'], new_outline, new_idea)
+                updated.append((cluster, new_idea, new_outline))
                 
                 # Send updated results
                 detail_blocks = formatter.format_cluster_detail(
@@ -446,6 +480,17 @@ def register(app):
                     blocks=detail_blocks
                 )
             
+            # Update database: one bulk upsert instead of a write per cluster
+            if updated:
+                db.save_clusters(batch_id, updated)
+            
+            if failed:
+                client.chat_postMessage(
+                    channel=channel_id,
+                    text=f"⚠️ Outline regeneration finished with {failed} of {len(research)} clusters failed."
+                )
+                return
+            
             client.chat_postMessage(
                 channel=channel_id,
                 text="✅ Outline regeneration complete!"
@@ -457,6 +502,50 @@ def register(app):
                 text=f"❌ Error during regeneration: {str(e)}"
             )
     
+    @app.command("/resume")
+    def handle_resume(ack, body, client):
+        ack()
+        
+        user_id = body['user_id']
+        channel_id = body['channel_id']
+        batch_id = body.get('text', '').strip()
+        
+        if not batch_id:
+            client.chat_postMessage(
+                channel=channel_id,
+                text="⚠️ Please provide the ID of a failed batch.\n\n"
+                     "Usage: `/resume <batch_id>`\n\n"
+                     "Example: `/resume abc12345`"
+            )
+            return
+        
+        from app.services.data.database import DatabaseService
+        db = DatabaseService()
+        
+        # Verify batch exists and belongs to user
+        batch = db.get_batch_by_id(batch_id, user_id)
+        if not batch:
+            client.chat_postMessage(
+                channel=channel_id,
+                text="❌ Batch not found or access denied."
+            )
+            return
+        
+        if batch.get('status') != 'failed':
+            client.chat_postMessage(
+                channel=channel_id,
+                text=f"⚠️ Only failed batches can be resumed (batch `{batch_id[:8]}` is {batch.get('status')})."
+            )
+            return
+        
+        client.chat_postMessage(
+            channel=channel_id,
+            text=f"🔁 Resuming batch `{batch_id[:8]}`...\n\nCompleted steps are reused, I'll update you when complete!"
+        )
+        
+        pipeline = ProcessingPipeline(client, channel_id, user_id)
+        pipeline.resume_batch(batch)
+    
     @app.command("/set_email")
     def handle_set_email(ack, body, client):
         ack()
@@ -485,10 +574,10 @@ def register(app):
         
         try:
             # Get or create user
-            user = db.get_or_create_user(user_id)
+            user_uuid = db.get_user_id(user_id)
             
             # Update email
-            db.client.table('users').update({'email': email}).eq('id', user['id']).execute()
+            db.client.table('users').update({'email': email}).eq('id', user_uuid).execute()
             
             client.chat_postMessage(
                 channel=channel_id,
@@ -555,13 +644,8 @@ def register(app):
             )
             return
         
-        # Start export in background
-        thread = threading.Thread(
-            target=export_batch,
-            args=(client, channel_id, batch_id, destination, user_id)
-        )
-        thread.daemon = True
-        thread.start()
+        # Queue export
+        enqueue_job('export_batch', user_id, channel_id, batch_id=batch['id'], destination=destination)
         
         client.chat_postMessage(
             channel=channel_id,
@@ -576,7 +660,7 @@ def register(app):
 
             db = DatabaseService()
             batch = db.get_batch_by_id(batch_id, user_id)
-            clusters = db.get_clusters_by_batch(batch_id)
+            clusters = db.get_clusters_by_batch(batch_id, full=True)
 
             if not batch or not clusters:
                 client.chat_postMessage(
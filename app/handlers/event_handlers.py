@@ -44,8 +44,8 @@ def register(app):
                       f"📊 Found {len(keywords)} keywords\n"
                       f"🔄 Processing started...")
 
-            # Start processing
-            pipeline = ProcessingPipeline(say, channel_id, user_id)
+            # Queue processing; the worker pool posts progress with its own client
+            pipeline = ProcessingPipeline(client, channel_id, user_id)
             pipeline.start_from_keywords(keywords, source='csv')
 
         except Exception as e:
@@ -73,7 +73,11 @@ def register(app):
                 if state.get('status') == 'awaiting_input':
                     # Parse keywords from message
                     parser = KeywordParser()
-                    keywords = parser.parse_text(text)
+                    try:
+                        keywords = parser.parse_text(text)
+                    except ValueError as e:
+                        say(f"⚠️ {str(e)}")
+                        return
 
                     if len(keywords) < 1:
                         say("⚠️ No keywords detected. Please provide at least one keyword.")
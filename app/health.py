@@ -11,8 +11,11 @@ health_status = {
     'services': {
         'slack': 'unknown',
         'database': 'unknown',
-        'redis': 'unknown'
-    }
+        'redis': 'unknown',
+        'embedding_model': 'unknown'
+    },
+    'models': {},
+    'jobs': {}
 }
 
 @app.route('/health', methods=['GET'])
@@ -51,6 +54,14 @@ def update_health_status(service: str, status: str):
     else:
         health_status['status'] = 'unhealthy'
 
+def update_model_status(model_name: str, stats: dict):
+    """Update load time and memory statistics for a shared model"""
+    health_status['models'][model_name] = stats
+
+def update_job_metrics(metrics: dict):
+    """Update job queue depth, wait time and worker statistics"""
+    health_status['jobs'] = metrics
+
 def start_health_server():
     """Start health check server"""
     app.run(host='0.0.0.0', port=Config.HEALTH_CHECK_PORT, debug=False)
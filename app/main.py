@@ -59,6 +59,23 @@ def main():
         logger.error(f"Redis connection failed: {e}")
         update_health_status('redis', 'unavailable')
 
+    # Load the shared embedding model once, before the first batch needs it
+    try:
+        from app.services.ai.model_registry import warm_up
+        warm_up()
+        logger.info("Embedding model loaded and warmed up")
+    except Exception as e:
+        logger.error(f"Embedding model warm-up failed: {e}")
+        update_health_status('embedding_model', 'unhealthy')
+
+    # Start the job workers; jobs left running by a stopped process are queued again
+    try:
+        from app.services.data.job_queue import start_workers
+        start_workers(app.client)
+    except Exception as e:
+        logger.error(f"Job worker pool failed to start: {e}")
+        update_health_status('job_workers', 'unhealthy')
+
     # Start Slack bot
     handler = SocketModeHandler(app, Config.SLACK_APP_TOKEN)
     handler.start()
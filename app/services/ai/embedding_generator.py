@@ -1,17 +1,21 @@
-from sentence_transformers import SentenceTransformer
 import numpy as np
 import logging
-from typing import List
+from typing import List, Optional, Tuple
 import hashlib
-import json
 import redis
 from app.config import Config
+from app.services.ai.model_registry import get_model
+
+CACHE_TTL = 86400  # 24 hours
+CACHE_CHUNK_SIZE = 500  # keys per MGET / pipeline round trip
+EMBED_CHUNK_SIZE = 4096  # keywords looked up and encoded at a time
 
 class EmbeddingGenerator:
     """Generate embeddings for keywords"""
     
     def __init__(self):
         self.model = None
+        self.model_name = Config.EMBEDDING_MODEL
         self.redis_client = None
         self.logger = logging.getLogger(__name__)
 
@@ -25,17 +29,20 @@ class EmbeddingGenerator:
             self.logger.warning(f" Redis connection failed: {e}")
     
     def load_model(self):
-        """Load sentence transformer model"""
+        """Get the process-wide sentence transformer model (loaded once per process)"""
         if self.model is None:
-            self.logger.info(" Loading SentenceTransformer model (all-MiniLM-L6-v2)")
-            # Use lightweight model
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-            self.logger.info(" Model loaded successfully")
+            self.model = get_model(self.model_name)
     
     def generate_embeddings(self, keywords: List[str]) -> np.ndarray:
         """
         Generate embeddings for keywords
 
+        Each keyword is cached under its own content-addressed key, so only
+        keywords that have not been seen before are encoded. Keywords are
+        looked up, encoded and cached EMBED_CHUNK_SIZE at a time and written
+        into one preallocated matrix, so memory beyond the result is bounded
+        by a chunk.
+
         Args:
             keywords: List of cleaned keywords
 
@@ -43,54 +50,82 @@ class EmbeddingGenerator:
             Numpy array of shape (n_keywords, embedding_dim)
         """
         self.logger.info(f" Generating embeddings for {len(keywords)} keywords")
+        if not keywords:
+            return np.empty((0, 384), dtype=np.float32)
 
-        # Check cache first
-        cache_key = self._get_cache_key(keywords)
-        cached = self._get_from_cache(cache_key)
-        if cached is not None:
-            self.logger.info(" Using cached embeddings")
-            return cached
-
-        # Load model
-        self.load_model()
+        embeddings = None
+        misses = 0
+        for start in range(0, len(keywords), EMBED_CHUNK_SIZE):
+            vectors, chunk_misses = self._embed_chunk(keywords[start:start + EMBED_CHUNK_SIZE])
+            if embeddings is None:
+                embeddings = np.empty((len(keywords), vectors.shape[1]), dtype=np.float32)
+            embeddings[start:start + len(vectors)] = vectors
+            misses += chunk_misses
 
-        # Generate embeddings
-        self.logger.info(" Computing embeddings with SentenceTransformer...")
-        embeddings = self.model.encode(keywords, show_progress_bar=True)
+        self.logger.info(f" Embedding cache: {len(keywords) - misses} hits, {misses} misses")
         self.logger.info(f" Generated embeddings with shape: {embeddings.shape}")
 
-        # Cache results
-        self._save_to_cache(cache_key, embeddings)
-
         return embeddings
-    
-    def _get_cache_key(self, keywords: List[str]) -> str:
-        """Generate cache key from keywords"""
-        content = json.dumps(sorted(keywords))
-        return f"embeddings:{hashlib.md5(content.encode()).hexdigest()}"
-    
-    def _get_from_cache(self, key: str):
-        """Get embeddings from Redis cache"""
-        if not self.redis_client:
-            return None
-        
+
+    def _embed_chunk(self, keywords: List[str]) -> Tuple[np.ndarray, int]:
+        """Embeddings for a chunk of keywords from the cache or the model; returns (vectors, cache misses)"""
+        cache_keys = [self._get_cache_key(keyword) for keyword in keywords]
+        cached = self._get_many_from_cache(cache_keys)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+
+        if missing:
+            # Load model
+            self.load_model()
+
+            # Generate embeddings for uncached keywords only
+            self.logger.debug(f" Computing {len(missing)} embeddings with SentenceTransformer...")
+            computed = self.model.encode(
+                [keywords[i] for i in missing],
+                show_progress_bar=len(missing) > 100
+            ).astype(np.float32)
+
+            for row, i in enumerate(missing):
+                cached[i] = computed[row]
+
+            # Cache results
+            self._save_many_to_cache([cache_keys[i] for i in missing], computed)
+
+        return np.vstack(cached).astype(np.float32), len(missing)
+
+    def _get_cache_key(self, keyword: str) -> str:
+        """Generate content-addressed cache key for a single keyword"""
+        digest = hashlib.sha1(f"{self.model_name}:{keyword}".encode()).hexdigest()
+        return f"embedding:{digest}"
+
+    def _get_many_from_cache(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Get embeddings for many keys from Redis with one MGET per chunk"""
+        results = [None] * len(keys)
+        if not self.redis_client or not keys:
+            return results
+
         try:
-            cached = self.redis_client.get(key)
-            if cached:
-                return np.frombuffer(cached, dtype=np.float32).reshape(-1, 384)
-        except:
-            return None
-    
-    def _save_to_cache(self, key: str, embeddings: np.ndarray):
-        """Save embeddings to Redis cache (24 hour TTL)"""
+            for start in range(0, len(keys), CACHE_CHUNK_SIZE):
+                chunk = keys[start:start + CACHE_CHUNK_SIZE]
+                for offset, value in enumerate(self.redis_client.mget(chunk)):
+                    if value:
+                        results[start + offset] = np.frombuffer(value, dtype=np.float32)
+        except Exception as e:
+            self.logger.warning(f" Embedding cache read failed: {e}")
+            return [None] * len(keys)
+
+        return results
+
+    def _save_many_to_cache(self, keys: List[str], embeddings: np.ndarray):
+        """Save embeddings to Redis cache (24 hour TTL) using a pipeline"""
         if not self.redis_client:
             return
-        
+
         try:
-            self.redis_client.setex(
-                key,
-                86400,  # 24 hours
-                embeddings.astype(np.float32).tobytes()
-            )
-        except:
-            pass
\ No newline at end of file
+            for start in range(0, len(keys), CACHE_CHUNK_SIZE):
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, vector in zip(keys[start:start + CACHE_CHUNK_SIZE],
+                                       embeddings[start:start + CACHE_CHUNK_SIZE]):
+                    pipe.setex(key, CACHE_TTL, vector.tobytes())
+                pipe.execute()
+        except Exception as e:
+            self.logger.warning(f" Embedding cache write failed: {e}")
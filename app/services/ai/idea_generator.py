@@ -1,14 +1,53 @@
 # app/services/idea_generator.py
 import logging
 from typing import Dict, List
-from groq import Groq
 from app.config import Config
+from app.services.ai.llm_client import LLMClient, compact_schema
+from app.utils.json_repair import JSONRepairError, parse_llm_json
+
+IDEA_SYSTEM_PROMPT = "You are a senior content marketing strategist with expertise in viral content creation, SEO, and audience psychology. Generate highly engaging, conversion-focused post ideas that combine creativity with strategic marketing principles."
+
+IDEA_REQUIREMENTS = """- Create a catchy, click-worthy title that sparks curiosity
+- Propose a unique angle that stands out from typical content
+- Define the target audience clearly with demographics and pain points
+- Make it actionable and valuable with specific benefits
+- Include content format suggestions (listicle, how-to, case study, etc.)
+- Add estimated reading time and difficulty level
+- Suggest social media hooks and sharing angles
+- Include monetization potential (affiliate, lead gen, etc.)"""
+
+IDEA_SCHEMA = """{
+  "title": "Catchy post title",
+  "angle": "Unique perspective or approach",
+  "target_audience": "Who this is for (demographics, pain points, interests)",
+  "value_proposition": "What readers will gain (specific benefits)",
+  "content_format": "Suggested format (how-to guide, listicle, case study, etc.)",
+  "estimated_reading_time": "5-7 minutes",
+  "difficulty_level": "Beginner/Intermediate/Advanced",
+  "social_hooks": ["Hook 1", "Hook 2", "Hook 3"],
+  "monetization_potential": "Affiliate products, lead generation, etc.",
+  "seo_optimization": {
+    "primary_keyword": "main keyword",
+    "search_intent": "informational/commercial/transactional",
+    "competitor_analysis": "What makes this different"
+  }
+}"""
+
+# Compact prompt (LLM_COMPACT_PROMPTS): fixed instructions and a minified schema
+# in the system message, only the keywords and outline in the user message
+IDEA_COMPACT_SYSTEM_PROMPT = f"""{IDEA_SYSTEM_PROMPT}
+
+For the given keywords, generate ONE blog post idea that follows these requirements:
+{IDEA_REQUIREMENTS}
+
+Respond ONLY with valid JSON in this format:
+{compact_schema(IDEA_SCHEMA)}"""
 
 class IdeaGenerator:
     """Generate creative post ideas"""
 
-    def __init__(self):
-        self.groq_client = Groq(api_key=Config.GROQ_API_KEY)
+    def __init__(self, llm: LLMClient = None):
+        self.llm = llm or LLMClient()
         self.logger = logging.getLogger(__name__)
 
     def generate_idea(
@@ -50,85 +89,69 @@ class IdeaGenerator:
     ) -> Dict:
         """Generate idea using Groq LLM"""
 
-        outline_context = ""
-        if outline:
-            sections = [s.get('heading', '') for s in outline.get('sections', [])]
-            outline_context = f"\n\nOutline sections: {', '.join(sections)}"
-
-        prompt = f"""Generate ONE unique, compelling, and user-friendly blog post idea that drives engagement and conversions.
-
-Keywords: {', '.join(keywords[:5])}{outline_context}
-
-Requirements:
-- Create a catchy, click-worthy title that sparks curiosity
-- Propose a unique angle that stands out from typical content
-- Define the target audience clearly with demographics and pain points
-- Make it actionable and valuable with specific benefits
-- Include content format suggestions (listicle, how-to, case study, etc.)
-- Add estimated reading time and difficulty level
-- Suggest social media hooks and sharing angles
-- Include monetization potential (affiliate, lead gen, etc.)
-
-Format as JSON:
-{{
-  "title": "Catchy post title",
-  "angle": "Unique perspective or approach",
-  "target_audience": "Who this is for (demographics, pain points, interests)",
-  "value_proposition": "What readers will gain (specific benefits)",
-  "content_format": "Suggested format (how-to guide, listicle, case study, etc.)",
-  "estimated_reading_time": "5-7 minutes",
-  "difficulty_level": "Beginner/Intermediate/Advanced",
-  "social_hooks": ["Hook 1", "Hook 2", "Hook 3"],
-  "monetization_potential": "Affiliate products, lead generation, etc.",
-  "seo_optimization": {{
-    "primary_keyword": "main keyword",
-    "search_intent": "informational/commercial/transactional",
-    "competitor_analysis": "What makes this different"
-  }}
-}}
-
-Respond ONLY with valid JSON."""
+        messages = self._idea_messages(keywords, outline)
 
         self.logger.info(f"Sending request to Groq API with keywords: {keywords}")
-        self.logger.debug(f"Full prompt: {prompt}")
+        self.logger.debug(f"Full prompt: {messages[-1]['content']}")
 
         try:
-            response = self.groq_client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a senior content marketing strategist with expertise in viral content creation, SEO, and audience psychology. Generate highly engaging, conversion-focused post ideas that combine creativity with strategic marketing principles."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="llama-3.1-8b-instant",
+            idea = self.llm.chat(
+                messages=messages,
                 temperature=0.8,
-                max_tokens=1000
+                max_tokens=1000,
+                parse=self._parse_json,
+                json_mode=True,
+                label='idea'
             )
 
-            self.logger.info("Received response from Groq API")
-            self.logger.debug(f"Raw response: {response}")
+            self.logger.info(f"Successfully parsed idea: {idea}")
 
-            import json
-            idea_text = response.choices[0].message.content
+            return idea
 
-            self.logger.debug(f"Response content: {idea_text}")
+        except Exception as e:
+            self.logger.error(f"Failed to generate idea with Groq API: {str(e)}")
+            raise e
 
-            # Extract JSON
-            if '```json' in idea_text:
-                idea_text = idea_text.split('```json')[1].split('```')[0]
-            elif '```' in idea_text:
-                idea_text = idea_text.split('```')[1].split('```')[0]
+    def _idea_messages(self, keywords: List[str], outline: Dict = None) -> List[Dict]:
+        """Chat messages for a post idea, compact when LLM_COMPACT_PROMPTS is on"""
+        outline_context = ""
+        if outline:
+            sections = [s.get('heading', '') for s in outline.get('sections', [])]
+            outline_context = f"\n\nOutline sections: {', '.join(sections)}"
 
-            idea = json.loads(idea_text.strip())
+        if Config.LLM_COMPACT_PROMPTS:
+            system_prompt = IDEA_COMPACT_SYSTEM_PROMPT
+            prompt = f"Keywords: {', '.join(keywords[:5])}{outline_context}"
+        else:
+            system_prompt = IDEA_SYSTEM_PROMPT
+            prompt = f"""Generate ONE unique, compelling, and user-friendly blog post idea that drives engagement and conversions.
 
-            self.logger.info(f"Successfully parsed idea: {idea}")
+Keywords: {', '.join(keywords[:5])}{outline_context}
 
-            return idea
+Requirements:
+{IDEA_REQUIREMENTS}
 
-        except Exception as e:
-            self.logger.error(f"Failed to generate idea with Groq API: {str(e)}")
-            raise e
\ No newline at end of file
+Format as JSON:
+{IDEA_SCHEMA}
+
+Respond ONLY with valid JSON."""
+
+        return [
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    def _parse_json(self, idea_text: str) -> Dict:
+        """Parse the idea JSON from LLM output, repairing fences, stray text and truncation"""
+        self.logger.debug(f"Response content: {idea_text}")
+
+        idea = parse_llm_json(idea_text)
+        if not idea.get('title'):
+            raise JSONRepairError("Post idea has no title")
+        return idea
@@ -0,0 +1,334 @@
+# app/services/ai/llm_client.py
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+from groq import Groq
+from app.config import Config
+from app.services.data.cache import CacheService
+from app.services.data.rate_limiter import TokenBucketLimiter
+from app.utils.profiler import Profiler
+
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+CHARS_PER_TOKEN = 4  # rough prompt size estimate used before the call
+
+# Process-local LRU in front of Redis: identity -> (expires_at, text)
+_memory_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def estimate_tokens(messages: List[Dict]) -> int:
+    """Approximate prompt tokens for a list of chat messages"""
+    return sum(len(m.get('content') or '') for m in messages) // CHARS_PER_TOKEN + 1
+
+
+def compact_schema(schema: str) -> str:
+    """
+    Shorter form of a JSON example schema for prompts
+
+    Keeps the placeholder text but only the first of repeated objects in a
+    list (the instructions already give the counts), and drops the indentation.
+    """
+    def first_items(value):
+        if isinstance(value, list):
+            if value and isinstance(value[0], dict):
+                value = value[:1]
+            return [first_items(v) for v in value]
+        if isinstance(value, dict):
+            return {k: first_items(v) for k, v in value.items()}
+        return value
+
+    return json.dumps(first_items(json.loads(schema)), separators=(',', ':'))
+
+
+class TokenUsage:
+    """Thread-safe token and latency totals for a unit of work, e.g. one batch"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._labels: Dict[str, Dict] = {}
+
+    def record(
+        self,
+        label: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        seconds: float,
+        cached: bool = False
+    ):
+        """Add one LLM call (cache hits count as calls without tokens)"""
+        with self._lock:
+            entry = self._labels.setdefault(label, {
+                'calls': 0, 'cached_calls': 0, 'prompt_tokens': 0,
+                'completion_tokens': 0, 'seconds': 0.0
+            })
+            entry['calls'] += 1
+            entry['cached_calls'] += int(cached)
+            entry['prompt_tokens'] += prompt_tokens
+            entry['completion_tokens'] += completion_tokens
+            entry['seconds'] += seconds
+
+    def summary(self) -> Dict:
+        """Totals overall and per label, JSON serializable"""
+        with self._lock:
+            by_label = {label: dict(entry, seconds=round(entry['seconds'], 2))
+                        for label, entry in self._labels.items()}
+
+        totals = {key: sum(entry[key] for entry in by_label.values())
+                  for key in ('calls', 'cached_calls', 'prompt_tokens', 'completion_tokens')}
+        totals['total_tokens'] = totals['prompt_tokens'] + totals['completion_tokens']
+        totals['seconds'] = round(sum(entry['seconds'] for entry in by_label.values()), 2)
+        totals['by_label'] = by_label
+        return totals
+
+
+class LLMClient:
+    """Groq chat completions under a request and token budget shared by all callers"""
+
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        use_cache: bool = True,
+        usage: TokenUsage = None,
+        profiler: Profiler = None
+    ):
+        """
+        Args:
+            model: Groq model name
+            use_cache: Reuse responses to identical requests; False always
+                calls the model (fresh responses are still cached)
+            usage: Optional accumulator for the tokens of every call
+            profiler: Optional profiler that gets an 'llm.<label>' span per call
+        """
+        self.groq_client = Groq(api_key=Config.GROQ_API_KEY)
+        self.model = model
+        self.use_cache = use_cache
+        self.usage = usage
+        self.profiler = profiler
+        self.cache = CacheService()
+        self.cache_ttl = Config.LLM_CACHE_TTL
+        self.logger = logging.getLogger(__name__)
+
+        self.request_limiter = None
+        if Config.LLM_REQUESTS_PER_MINUTE > 0:
+            self.request_limiter = TokenBucketLimiter(
+                'groq:requests',
+                rate=Config.LLM_REQUESTS_PER_MINUTE / 60,
+                burst=Config.LLM_REQUEST_BURST
+            )
+
+        self.token_limiter = None
+        if Config.LLM_TOKENS_PER_MINUTE > 0:
+            self.token_limiter = TokenBucketLimiter(
+                'groq:tokens',
+                rate=Config.LLM_TOKENS_PER_MINUTE / 60,
+                burst=Config.LLM_TOKENS_PER_MINUTE
+            )
+
+    def chat(
+        self,
+        messages: List[Dict],
+        temperature: float,
+        max_tokens: int,
+        parse: Callable[[str], Any] = None,
+        on_text: Callable[[str], None] = None,
+        json_mode: bool = False,
+        label: str = 'chat'
+    ) -> Any:
+        """
+        Run one chat completion once the shared budget allows it
+
+        Responses are cached by model, messages, temperature and max_tokens.
+        When parse is given, its result is returned and a response is only
+        cached if it parsed, so a malformed completion is never replayed.
+        When on_text is given the completion is streamed, and on_text receives
+        each new piece of text as it arrives (not called on cache hits).
+        json_mode asks the model for a strict JSON object when LLM_JSON_MODE
+        is on; Groq does not support it while streaming, so it is skipped then
+        (which is why STREAM_OUTLINES is off by default).
+
+        Args:
+            messages: Chat messages
+            temperature: Sampling temperature
+            max_tokens: Completion token limit
+            parse: Optional function applied to the response text
+            on_text: Optional callback for streamed text deltas
+            json_mode: Request a JSON object response
+            label: Name the call is accounted under in TokenUsage
+
+        Returns:
+            Message content of the first choice, or parse(content)
+        """
+        json_mode = json_mode and Config.LLM_JSON_MODE and on_text is None
+        identity = self.request_identity(self.model, messages, temperature, max_tokens, json_mode)
+
+        if self.use_cache:
+            cached = self._get_cached(identity)
+            if cached is not None:
+                try:
+                    result = parse(cached) if parse else cached
+                    self.logger.info(" Using cached LLM response")
+                    if self.usage:
+                        self.usage.record(label, 0, 0, 0.0, cached=True)
+                    if self.profiler:
+                        self.profiler.record(f"llm.{label}", 0.0, cached=True)
+                    return result
+                except Exception as e:
+                    self.logger.warning(f" Cached LLM response unusable, calling model: {e}")
+
+        start = time.time()
+        try:
+            text, prompt_tokens, completion_tokens = self._complete(
+                messages, temperature, max_tokens, on_text, json_mode
+            )
+        except Exception as e:
+            if self.profiler:
+                self.profiler.record(f"llm.{label}", time.time() - start, error=type(e).__name__)
+            raise
+        seconds = time.time() - start
+        if self.usage:
+            self.usage.record(label, prompt_tokens, completion_tokens, seconds)
+        if self.profiler:
+            self.profiler.record(
+                f"llm.{label}", seconds,
+                prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, stream=on_text is not None
+            )
+        self.logger.debug(f" LLM call '{label}': {prompt_tokens} prompt + {completion_tokens} completion tokens")
+
+        result = parse(text) if parse else text
+        self._save_to_cache(identity, text)
+        return result
+
+    @staticmethod
+    def request_identity(
+        model: str,
+        messages: List[Dict],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False
+    ) -> str:
+        """Canonical form of a request; identical requests share a cache entry"""
+        request = {'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens}
+        if json_mode:
+            request['response_format'] = 'json_object'
+        return json.dumps(request, sort_keys=True, separators=(',', ':'))
+
+    def _complete(
+        self,
+        messages: List[Dict],
+        temperature: float,
+        max_tokens: int,
+        on_text: Callable[[str], None] = None,
+        json_mode: bool = False
+    ) -> Tuple[str, int, int]:
+        """
+        Call Groq, reserving the prompt tokens up front and charging the completion after
+
+        Returns:
+            (text, prompt tokens, completion tokens); estimated if Groq reports no usage
+        """
+        estimated_prompt = estimate_tokens(messages)
+        if self.request_limiter:
+            self.request_limiter.acquire()
+        if self.token_limiter:
+            self.token_limiter.acquire(estimated_prompt)
+
+        request = {
+            'messages': messages,
+            'model': self.model,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+            'stream': on_text is not None
+        }
+        if json_mode:
+            request['response_format'] = {"type": "json_object"}
+
+        try:
+            response = self.groq_client.chat.completions.create(**request)
+        except Exception as e:
+            # JSON mode rejects output that isn't valid JSON; hand the rejected
+            # text to the caller's parser, which can usually repair it
+            failed_generation = self._failed_generation(e) if json_mode else None
+            if failed_generation is None:
+                raise
+            self.logger.warning(" Groq rejected JSON mode output, repairing it locally")
+            text, usage = failed_generation, None
+        else:
+            if on_text is None:
+                text = response.choices[0].message.content
+                usage = getattr(response, 'usage', None)
+            else:
+                text, usage = self._read_stream(response, on_text)
+
+        if usage:
+            prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+        else:
+            prompt_tokens, completion_tokens = estimated_prompt, len(text) // CHARS_PER_TOKEN + 1
+
+        if self.token_limiter:
+            used = prompt_tokens + completion_tokens - estimated_prompt
+            if used > 0:
+                self.token_limiter.consume(used)
+
+        return text, prompt_tokens, completion_tokens
+
+    @staticmethod
+    def _failed_generation(error: Exception):
+        """Text of a generation Groq rejected in JSON mode (None for other errors)"""
+        body = getattr(error, 'body', None)
+        if isinstance(body, dict):
+            details = body.get('error', body)
+            if isinstance(details, dict) and details.get('code') == 'json_validate_failed':
+                return details.get('failed_generation')
+        return None
+
+    def _read_stream(self, stream, on_text: Callable[[str], None]):
+        """Accumulate streamed deltas, reporting progress; returns (text, usage)"""
+        parts = []
+        usage = None
+        for chunk in stream:
+            # Groq reports usage on the final chunk
+            x_groq = getattr(chunk, 'x_groq', None)
+            if x_groq is not None and getattr(x_groq, 'usage', None):
+                usage = x_groq.usage
+
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                on_text(delta)
+        return ''.join(parts), usage
+
+    def _get_cached(self, identity: str):
+        """Look up the in-process LRU, then Redis"""
+        with _memory_lock:
+            entry = _memory_cache.get(identity)
+            if entry:
+                if entry[0] > time.time():
+                    _memory_cache.move_to_end(identity)
+                    return entry[1]
+                del _memory_cache[identity]
+
+        text = self.cache.get_cached_llm_response(identity)
+        if text is not None:
+            self._remember(identity, text)
+        return text
+
+    def _save_to_cache(self, identity: str, text: str):
+        if self.cache_ttl <= 0:
+            return
+        self._remember(identity, text)
+        self.cache.cache_llm_response(identity, text, ttl=self.cache_ttl)
+
+    def _remember(self, identity: str, text: str):
+        """Store in the in-process LRU, evicting the least recently used entries"""
+        if Config.LLM_CACHE_SIZE <= 0:
+            return
+        with _memory_lock:
+            _memory_cache[identity] = (time.time() + self.cache_ttl, text)
+            _memory_cache.move_to_end(identity)
+            while len(_memory_cache) > Config.LLM_CACHE_SIZE:
+                _memory_cache.popitem(last=False)
@@ -1,20 +1,93 @@
 # app/services/outline_generator.py
-from typing import List, Dict
-from groq import Groq
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional, Tuple
 from app.config import Config
+from app.services.ai.llm_client import LLMClient, compact_schema
+from app.utils.json_repair import JSONRepairError, parse_llm_json
+from app.utils.partial_json import PartialJSONParser
+from app.services.ai.idea_generator import IDEA_REQUIREMENTS, IDEA_SCHEMA, IDEA_SYSTEM_PROMPT
 import logging
 
+OUTLINE_SYSTEM_PROMPT = "You are a senior content strategist and SEO expert. Generate detailed, actionable content outlines that drive engagement and conversions. Focus on comprehensive structure, SEO optimization, and practical value."
+
+OUTLINE_INSTRUCTIONS = """1. An engaging introduction section with multiple hooks
+2. 6-8 main body sections (H2 level) with detailed descriptions
+3. 3-4 subsections under each main section (H3 level) with specific content ideas
+4. A strong conclusion section with actionable takeaways
+5. Include estimated word count for each section
+6. Add SEO optimization notes"""
+
+OUTLINE_SCHEMA = """{
+  "title": "Suggested compelling title",
+  "introduction": {
+    "hooks": ["Hook 1", "Hook 2", "Hook 3"],
+    "overview": "What this post covers",
+    "target_audience": "Who this is for"
+  },
+  "sections": [
+    {
+      "heading": "Main section heading",
+      "description": "Detailed explanation of what this section covers",
+      "word_count_estimate": 300,
+      "seo_keywords": ["keyword1", "keyword2"],
+      "subsections": [
+        {
+          "heading": "Subsection 1",
+          "content_ideas": ["Idea 1", "Idea 2"]
+        },
+        {
+          "heading": "Subsection 2",
+          "content_ideas": ["Idea 1", "Idea 2"]
+        }
+      ]
+    }
+  ],
+  "conclusion": {
+    "summary": "Key takeaways",
+    "actionable_insights": ["Insight 1", "Insight 2"],
+    "cta": "Call to action"
+  },
+  "seo_notes": {
+    "primary_keyword": "main keyword",
+    "secondary_keywords": ["keyword1", "keyword2"],
+    "meta_description": "Suggested meta description"
+  }
+}"""
+
+# Compact prompts (LLM_COMPACT_PROMPTS): the fixed instructions and a minified
+# schema go in the system message, the user message only carries the inputs
+OUTLINE_COMPACT_SYSTEM_PROMPT = f"""{OUTLINE_SYSTEM_PROMPT}
+
+For the given keywords and topics, create a blog post outline with:
+{OUTLINE_INSTRUCTIONS}
+
+Respond ONLY with valid JSON in this format:
+{compact_schema(OUTLINE_SCHEMA)}"""
+
+FUSED_COMPACT_SYSTEM_PROMPT = f"""{OUTLINE_SYSTEM_PROMPT} {IDEA_SYSTEM_PROMPT}
+
+For the given keywords and topics, create a blog post outline with:
+{OUTLINE_INSTRUCTIONS}
+
+and ONE post idea for that outline that follows these requirements:
+{IDEA_REQUIREMENTS}
+
+Respond ONLY with valid JSON in this format:
+{{"outline":{compact_schema(OUTLINE_SCHEMA)},"post_idea":{compact_schema(IDEA_SCHEMA)}}}"""
+
 class OutlineGenerator:
     """Generate content outlines based on research"""
 
-    def __init__(self):
-        self.groq_client = Groq(api_key=Config.GROQ_API_KEY)
+    def __init__(self, llm: LLMClient = None):
+        self.llm = llm or LLMClient()
         self.logger = logging.getLogger(__name__)
 
     def generate_outline(
         self,
         cluster: Dict,
-        scraped_data: List[Dict]
+        scraped_data: List[Dict],
+        on_partial: Callable[[Dict], None] = None
     ) -> Dict:
         """
         Generate content outline for a keyword cluster
@@ -22,6 +95,8 @@ class OutlineGenerator:
         Args:
             cluster: Keyword cluster dictionary
             scraped_data: List of scraped content from top results
+            on_partial: Optional callback; streams the completion and receives
+                the outline parsed so far (throttled by STREAM_UPDATE_INTERVAL)
 
         Returns:
             Structured outline dictionary
@@ -39,7 +114,7 @@ class OutlineGenerator:
         # Only use LLM-based generation - no fallbacks
         try:
             self.logger.info(" Calling Groq API for outline generation")
-            outline = self._generate_with_llm(keywords, common_topics)
+            outline = self._generate_with_llm(keywords, common_topics, self._stream_handler(on_partial))
             self.logger.info(f" Outline generated: '{outline.get('title', 'N/A')}' with {len(outline.get('sections', []))} sections")
         except Exception as e:
             error_msg = f"LLM Outline Generation Failed: {str(e)}"
@@ -49,6 +124,89 @@ class OutlineGenerator:
 
         return outline
 
+    def generate_outline_with_idea(
+        self,
+        cluster: Dict,
+        scraped_data: List[Dict],
+        on_partial: Callable[[Dict], None] = None
+    ) -> Tuple[Dict, Dict]:
+        """
+        Generate the outline and post idea for a cluster in one LLM call
+
+        Same output as generate_outline followed by IdeaGenerator.generate_idea,
+        with half the round trips.
+
+        Args:
+            cluster: Keyword cluster dictionary
+            scraped_data: List of scraped content from top results
+            on_partial: Optional callback receiving the outline parsed so far
+
+        Returns:
+            (outline, post_idea) dictionaries
+        """
+        keywords = cluster['keywords']
+        cluster_name = cluster['cluster_name']
+
+        self.logger.info(f" Generating outline and post idea for cluster '{cluster_name}'")
+        common_topics = self._extract_topics(scraped_data)
+
+        try:
+            on_text = self._stream_handler(on_partial, select=lambda partial: partial.get('outline'))
+            outline, post_idea = self._generate_fused_with_llm(keywords, common_topics, on_text)
+            self.logger.info(f" Outline generated: '{outline.get('title', 'N/A')}' with {len(outline.get('sections', []))} sections")
+            self.logger.info(f" Post idea generated: '{post_idea.get('title', 'N/A')}'")
+        except Exception as e:
+            error_msg = f"LLM Outline Generation Failed: {str(e)}"
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
+
+        return outline, post_idea
+
+    def generate_outlines(
+        self,
+        items: List[Tuple[Dict, List[Dict]]],
+        max_workers: int = None,
+        with_ideas: bool = False
+    ) -> List[Dict]:
+        """
+        Generate outlines for several clusters concurrently
+
+        Requests share the LLM request/token budget, and a failure for one
+        cluster (e.g. malformed JSON) does not affect the others.
+
+        Args:
+            items: (cluster, scraped_data) pairs
+            max_workers: Concurrent completions (defaults to Config.LLM_WORKERS)
+            with_ideas: Also generate each post idea in the same completion
+
+        Returns:
+            One dict per item, in input order, with 'outline' (None on failure)
+            and 'error' (None on success), plus 'post_idea' if with_ideas
+        """
+        if not items:
+            return []
+
+        workers = max(1, min(max_workers or Config.LLM_WORKERS, len(items)))
+        self.logger.info(f" Generating {len(items)} outlines with {workers} workers")
+
+        def generate(item: Tuple[Dict, List[Dict]]) -> Dict:
+            cluster, scraped_data = item
+            try:
+                if with_ideas:
+                    outline, post_idea = self.generate_outline_with_idea(cluster, scraped_data)
+                    return {'outline': outline, 'post_idea': post_idea, 'error': None}
+                return {'outline': self.generate_outline(cluster, scraped_data), 'error': None}
+            except Exception as e:
+                return {'outline': None, 'post_idea': None, 'error': str(e)}
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='outline') as executor:
+            results = list(executor.map(generate, items))
+
+        failed = sum(1 for r in results if r['error'])
+        if failed:
+            self.logger.warning(f" {failed}/{len(items)} outlines failed")
+        return results
+
     def _extract_topics(self, scraped_data: List[Dict]) -> List[str]:
         """Extract common topics from scraped content"""
         from collections import Counter
@@ -78,9 +236,51 @@ class OutlineGenerator:
     def _generate_with_llm(
         self,
         keywords: List[str],
-        topics: List[str]
+        topics: List[str],
+        on_text: Callable[[str], None] = None
     ) -> Dict:
         """Generate outline using Groq LLM"""
+        return self.llm.chat(
+            messages=self._outline_messages(keywords, topics),
+            temperature=0.7,
+            max_tokens=3000,
+            parse=self._parse_outline,
+            on_text=on_text,
+            json_mode=True,
+            label='outline'
+        )
+
+    def _generate_fused_with_llm(
+        self,
+        keywords: List[str],
+        topics: List[str],
+        on_text: Callable[[str], None] = None
+    ) -> Tuple[Dict, Dict]:
+        """Generate outline and post idea in a single Groq completion"""
+
+        def parse(response_text: str) -> Tuple[Dict, Dict]:
+            result = self._parse_json(response_text)
+            outline = result.get('outline')
+            post_idea = result.get('post_idea')
+            if not isinstance(outline, dict) or not outline.get('sections') \
+                    or not isinstance(post_idea, dict) or not post_idea.get('title'):
+                raise JSONRepairError(f"Fused response is missing outline or post_idea (keys: {list(result)})")
+            return outline, post_idea
+
+        return self.llm.chat(
+            messages=self._fused_messages(keywords, topics),
+            temperature=0.7,
+            max_tokens=4000,
+            parse=parse,
+            on_text=on_text,
+            json_mode=True,
+            label='outline_with_idea'
+        )
+
+    def _outline_messages(self, keywords: List[str], topics: List[str]) -> List[Dict]:
+        """Chat messages for an outline, compact when LLM_COMPACT_PROMPTS is on"""
+        if Config.LLM_COMPACT_PROMPTS:
+            return self._compact_messages(OUTLINE_COMPACT_SYSTEM_PROMPT, keywords, topics)
 
         prompt = f"""Create a comprehensive, detailed content outline for a high-quality blog post.
 
@@ -88,102 +288,131 @@ Target Keywords: {', '.join(keywords[:5])}
 Common Topics in Top-Ranking Content: {', '.join(topics[:10])}
 
 Generate a structured outline with:
-1. An engaging introduction section with multiple hooks
-2. 6-8 main body sections (H2 level) with detailed descriptions
-3. 3-4 subsections under each main section (H3 level) with specific content ideas
-4. A strong conclusion section with actionable takeaways
-5. Include estimated word count for each section
-6. Add SEO optimization notes
+{OUTLINE_INSTRUCTIONS}
 
 Format as JSON:
+{OUTLINE_SCHEMA}
+
+Respond ONLY with valid JSON, no additional text."""
+
+        return [
+            {
+                "role": "system",
+                "content": OUTLINE_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    def _fused_messages(self, keywords: List[str], topics: List[str]) -> List[Dict]:
+        """Chat messages for an outline plus post idea, compact when LLM_COMPACT_PROMPTS is on"""
+        if Config.LLM_COMPACT_PROMPTS:
+            return self._compact_messages(FUSED_COMPACT_SYSTEM_PROMPT, keywords, topics)
+
+        prompt = f"""Create a comprehensive, detailed content outline for a high-quality blog post, and ONE unique, compelling post idea for that outline.
+
+Target Keywords: {', '.join(keywords[:5])}
+Common Topics in Top-Ranking Content: {', '.join(topics[:10])}
+
+Generate a structured outline with:
+{OUTLINE_INSTRUCTIONS}
+
+The post idea must follow these requirements:
+{IDEA_REQUIREMENTS}
+
+Format as JSON with exactly two keys, "outline" and "post_idea":
 {{
-  "title": "Suggested compelling title",
-  "introduction": {{
-    "hooks": ["Hook 1", "Hook 2", "Hook 3"],
-    "overview": "What this post covers",
-    "target_audience": "Who this is for"
-  }},
-  "sections": [
-    {{
-      "heading": "Main section heading",
-      "description": "Detailed explanation of what this section covers",
-      "word_count_estimate": 300,
-      "seo_keywords": ["keyword1", "keyword2"],
-      "subsections": [
-        {{
-          "heading": "Subsection 1",
-          "content_ideas": ["Idea 1", "Idea 2"]
-        }},
-        {{
-          "heading": "Subsection 2",
-          "content_ideas": ["Idea 1", "Idea 2"]
-        }}
-      ]
-    }}
-  ],
-  "conclusion": {{
-    "summary": "Key takeaways",
-    "actionable_insights": ["Insight 1", "Insight 2"],
-    "cta": "Call to action"
-  }},
-  "seo_notes": {{
-    "primary_keyword": "main keyword",
-    "secondary_keywords": ["keyword1", "keyword2"],
-    "meta_description": "Suggested meta description"
-  }}
+  "outline": {OUTLINE_SCHEMA},
+  "post_idea": {IDEA_SCHEMA}
 }}
 
 Respond ONLY with valid JSON, no additional text."""
 
-        response = self.groq_client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a senior content strategist and SEO expert. Generate detailed, actionable content outlines that drive engagement and conversions. Focus on comprehensive structure, SEO optimization, and practical value."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            model="llama-3.1-8b-instant",
-            temperature=0.7,
-            max_tokens=3000
-        )
+        return [
+            {
+                "role": "system",
+                "content": f"{OUTLINE_SYSTEM_PROMPT} {IDEA_SYSTEM_PROMPT}"
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    @staticmethod
+    def _compact_messages(system_prompt: str, keywords: List[str], topics: List[str]) -> List[Dict]:
+        """System prompt plus a user message holding only the cluster inputs"""
+        return [
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user",
+                "content": f"Target Keywords: {', '.join(keywords[:5])}\n"
+                           f"Common Topics: {', '.join(topics[:10])}"
+            }
+        ]
 
-        # Parse JSON response
-        import json
-        outline_text = response.choices[0].message.content
+    def _stream_handler(
+        self,
+        on_partial: Callable[[Dict], None],
+        select: Callable[[Dict], Dict] = None
+    ) -> Optional[Callable[[str], None]]:
+        """
+        Turn streamed text into throttled partial-outline callbacks
 
-        # Log the raw response for debugging
-        self.logger.debug(f"Raw LLM response: {outline_text[:500]}...")
+        Args:
+            on_partial: Callback receiving the outline parsed so far (None disables streaming)
+            select: Picks the outline out of the parsed document
+
+        Returns:
+            on_text callback for LLMClient.chat, or None
+        """
+        if on_partial is None:
+            return None
+
+        parser = PartialJSONParser()
+        state = {'last_emit': 0.0, 'last': None}
+
+        def on_text(delta: str):
+            parser.feed(delta)
+            now = time.monotonic()
+            if now - state['last_emit'] < Config.STREAM_UPDATE_INTERVAL:
+                return
+            state['last_emit'] = now
+
+            partial = parser.snapshot()
+            if isinstance(partial, dict) and select:
+                partial = select(partial)
+            if isinstance(partial, dict) and partial and partial != state['last']:
+                state['last'] = partial
+                try:
+                    on_partial(partial)
+                except Exception as e:
+                    self.logger.warning(f" Partial outline callback failed: {e}")
 
-        # Extract JSON if wrapped in markdown
-        if '```json' in outline_text:
-            outline_text = outline_text.split('```json')[1].split('```')[0]
-        elif '```' in outline_text:
-            outline_text = outline_text.split('```')[1].split('```')[0]
+        return on_text
 
-        outline_text = outline_text.strip()
+    def _parse_json(self, outline_text: str) -> Dict:
+        """Parse a JSON object from LLM output, repairing fences, stray text and truncation"""
+        # Log the raw response for debugging
+        self.logger.debug(f"Raw LLM response: {outline_text[:500]}...")
 
-        # Try to parse JSON with better error handling
         try:
-            outline = json.loads(outline_text)
-        except json.JSONDecodeError as e:
+            return parse_llm_json(outline_text)
+        except JSONRepairError as e:
             self.logger.error(f"JSON parsing failed: {str(e)}")
             self.logger.error(f"Failed JSON content: {outline_text[:1000]}")
-            # Try to extract JSON from the text if it contains extra content
-            import re
-            json_match = re.search(r'\{.*\}', outline_text, re.DOTALL)
-            if json_match:
-                try:
-                    outline = json.loads(json_match.group())
-                    self.logger.info("Successfully extracted JSON using regex")
-                except json.JSONDecodeError:
-                    raise Exception(f"JSON parsing failed even after regex extraction: {str(e)}")
-            else:
-                raise Exception(f"No valid JSON found in response: {str(e)}")
+            raise
 
+    def _parse_outline(self, outline_text: str) -> Dict:
+        """Parse an outline; a truncated one must still have sections"""
+        outline = self._parse_json(outline_text)
+        if not outline.get('sections'):
+            raise JSONRepairError("Outline has no sections")
         return outline
 
     def _generate_rule_based(
@@ -69,14 +69,71 @@ class CacheService:
         """Clear user session state"""
         self.delete(f"user:{user_id}:state")
 
-    def cache_search_results(self, query: str, results: list):
-        """Cache search results for 1 hour"""
-        cache_key = self._generate_cache_key("search", query)
-        self.set(cache_key, results, ttl=3600)
+    def cache_user_id(self, slack_user_id: str, user_id: str, ttl: int = 604800):
+        """Cache the database UUID of a Slack user (default 7 days)"""
+        self.set(f"user:{slack_user_id}:uuid", user_id, ttl)
+
+    def get_cached_user_id(self, slack_user_id: str) -> Optional[str]:
+        """Get the cached database UUID of a Slack user"""
+        return self.get(f"user:{slack_user_id}:uuid")
+
+    def mark_user_active(self, slack_user_id: str, ttl: int) -> bool:
+        """
+        Note that a user was active
+
+        Returns False if any process already noted it in the last ttl
+        seconds, so last_active_at is written once per window. Without
+        Redis every call returns True.
+        """
+        if not self.client or ttl <= 0:
+            return True
+
+        try:
+            return bool(self.client.set(f"user:{slack_user_id}:active", 1, nx=True, ex=ttl))
+        except Exception as e:
+            print(f"Cache set error: {e}")
+            return True
+
+    def cache_history(self, user_id: str, history: list, ttl: int = 30):
+        """Cache a user's batch history (default 30 seconds)"""
+        self.set(f"user:{user_id}:history", history, ttl)
+
+    def get_cached_history(self, user_id: str) -> Optional[list]:
+        """Get a user's cached batch history"""
+        return self.get(f"user:{user_id}:history")
+
+    def clear_history(self, user_id: str):
+        """Drop a user's cached batch history after one of their batches changed"""
+        self.delete(f"user:{user_id}:history")
 
-    def get_cached_search(self, query: str) -> Optional[list]:
+    def cache_search_results(self, query: str, results: list, count: int = None, ttl: int = 3600):
+        """Cache search results (default 1 hour)"""
+        cache_key = self._generate_cache_key("search", self.search_identity(query, count))
+        self.set(cache_key, results, ttl=ttl)
+
+    def get_cached_search(self, query: str, count: int = None) -> Optional[list]:
         """Get cached search results"""
-        cache_key = self._generate_cache_key("search", query)
+        cache_key = self._generate_cache_key("search", self.search_identity(query, count))
+        return self.get(cache_key)
+
+    def cache_scrape_result(self, url: str, entry: Dict, ttl: int = 604800):
+        """Cache extracted page structure and validators for a URL (default 7 days)"""
+        cache_key = self._generate_cache_key("scrape", url)
+        self.set(cache_key, entry, ttl=ttl)
+
+    def get_cached_scrape(self, url: str) -> Optional[Dict]:
+        """Get cached page structure for a URL"""
+        cache_key = self._generate_cache_key("scrape", url)
+        return self.get(cache_key)
+
+    def cache_llm_response(self, identity: str, text: str, ttl: int = 86400):
+        """Cache an LLM completion by its request identity (default 24 hours)"""
+        cache_key = self._generate_cache_key("llm", identity)
+        self.set(cache_key, text, ttl=ttl)
+
+    def get_cached_llm_response(self, identity: str) -> Optional[str]:
+        """Get a cached LLM completion"""
+        cache_key = self._generate_cache_key("llm", identity)
         return self.get(cache_key)
 
     def cache_embeddings(self, keywords: list, embeddings: Any):
@@ -126,6 +183,12 @@ class CacheService:
         count = self.increment_rate_limit(user_id, action)
         return count <= max_requests
 
+    @staticmethod
+    def search_identity(query: str, count: int = None) -> str:
+        """Normalize a search query (case and whitespace) and append the result count"""
+        normalized = ' '.join(query.lower().split())
+        return normalized if count is None else f"{normalized}|{count}"
+
     def _generate_cache_key(self, prefix: str, data: str) -> str:
         """Generate cache key from data"""
         hash_value = hashlib.md5(data.encode()).hexdigest()
@@ -1,8 +1,26 @@
 # app/services/database.py
 from supabase import create_client, Client
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
+import threading
+import time
+import uuid
 from datetime import datetime
 from app.config import Config
+from app.services.data.cache import CacheService
+
+CLUSTER_UPSERT_CHUNK = 100  # cluster rows per upsert request
+SHORT_ID_LENGTH = 8  # batch ID prefix shown to users and stored in short_id
+
+# Light projections leave out the large columns: keyword arrays on batches,
+# outline and post idea JSON on clusters. Reads ask for full=True to get them.
+BATCH_LIGHT_COLUMNS = 'id, user_id, batch_name, status, keyword_count, cluster_count, source_type, created_at, completed_at, error_message'
+CLUSTER_LIGHT_COLUMNS = 'id, batch_id, cluster_number, cluster_name, keywords, keyword_count, post_idea, created_at'
+FULL_COLUMNS = '*'
+
+# Process-local Slack user ID -> UUID, and when each user's last_active_at was last written
+_user_ids: Dict[str, str] = {}
+_last_active: Dict[str, float] = {}
+_users_lock = threading.Lock()
 
 class DatabaseService:
     """Handle all database operations"""
@@ -51,6 +69,14 @@ class DatabaseService:
 
         self.client.table('keyword_batches').update(data).eq('id', batch_id).execute()
 
+    def update_batch_token_usage(self, batch_id: str, usage: Dict):
+        """Store LLM token and latency totals for a batch (see TokenUsage.summary)"""
+        self.client.table('keyword_batches').update({'token_usage': usage}).eq('id', batch_id).execute()
+
+    def update_batch_performance_profile(self, batch_id: str, profile: Dict):
+        """Store stage timings and spans for a batch (see Profiler.summary)"""
+        self.client.table('keyword_batches').update({'performance_profile': profile}).eq('id', batch_id).execute()
+
     def save_cluster(
         self,
         batch_id: str,
@@ -59,18 +85,63 @@ class DatabaseService:
         outline: Dict
     ):
         """Save a keyword cluster with its analysis"""
-        data = {
+        self.save_clusters(batch_id, [(cluster, post_idea, outline)])
+
+    def save_clusters(self, batch_id: str, clusters: List[Tuple[Dict, Dict, Dict]]):
+        """
+        Save many clusters with their analysis in one request
+
+        Rows are upserted on (batch_id, cluster_number), so saving a cluster
+        again replaces its outline and post idea instead of adding a row.
+
+        Args:
+            batch_id: Batch the clusters belong to
+            clusters: (cluster, post_idea, outline) for each cluster
+        """
+        rows = [
+            {
+                'batch_id': batch_id,
+                'cluster_number': cluster['cluster_number'],
+                'cluster_name': cluster['cluster_name'],
+                'keywords': cluster['keywords'],
+                'keyword_count': cluster['keyword_count'],
+                'post_idea': post_idea.get('title', ''),
+                'post_idea_metadata': post_idea,
+                'outline_json': outline
+            }
+            for cluster, post_idea, outline in clusters
+        ]
+
+        for start in range(0, len(rows), CLUSTER_UPSERT_CHUNK):
+            self.client.table('keyword_clusters')\
+                .upsert(rows[start:start + CLUSTER_UPSERT_CHUNK], on_conflict='batch_id,cluster_number')\
+                .execute()
+
+    def save_checkpoint(self, batch_id: str, step: str, data: Any):
+        """Save the result of a pipeline step so a failed batch can resume after it"""
+        self.client.table('batch_checkpoints').upsert({
             'batch_id': batch_id,
-            'cluster_number': cluster['cluster_number'],
-            'cluster_name': cluster['cluster_name'],
-            'keywords': cluster['keywords'],
-            'keyword_count': cluster['keyword_count'],
-            'post_idea': post_idea.get('title', ''),
-            'post_idea_metadata': post_idea,
-            'outline_json': outline
-        }
+            'step': step,
+            'data': data,
+            'updated_at': datetime.now().isoformat()
+        }, on_conflict='batch_id,step').execute()
+
+    def get_checkpoints(self, batch_id: str) -> Dict[str, Any]:
+        """Get the saved step results of a batch, keyed by step"""
+        try:
+            response = self.client.table('batch_checkpoints')\
+                .select('step, data')\
+                .eq('batch_id', batch_id)\
+                .execute()
+
+            return {row['step']: row['data'] for row in response.data or []}
+        except Exception as e:
+            print(f"Error fetching checkpoints for batch {batch_id}: {str(e)}")
+            return {}
 
-        self.client.table('keyword_clusters').insert(data).execute()
+    def delete_checkpoints(self, batch_id: str):
+        """Remove the step results of a batch once it has completed"""
+        self.client.table('batch_checkpoints').delete().eq('batch_id', batch_id).execute()
 
     def save_report(self, batch_id: str, pdf_path: str, pdf_url: str = None):
         """Save report information"""
@@ -85,11 +156,11 @@ class DatabaseService:
 
         self.client.table('reports').insert(data).execute()
 
-    def get_user_history(self, user_id: str, limit: int = 10) -> List[Dict]:
-        """Get user's processing history"""
+    def get_user_history(self, user_id: str, limit: int = 10, full: bool = False) -> List[Dict]:
+        """Get user's processing history (with keyword arrays when full)"""
         try:
             response = self.client.table('keyword_batches')\
-                .select('*')\
+                .select(FULL_COLUMNS if full else BATCH_LIGHT_COLUMNS)\
                 .eq('user_id', user_id)\
                 .order('created_at', desc=True)\
                 .limit(limit)\
@@ -100,11 +171,31 @@ class DatabaseService:
             print(f"Error fetching user history for {user_id}: {str(e)}")
             return []
 
-    def get_batch(self, batch_id: str) -> Optional[Dict]:
-        """Get batch by ID"""
+    def get_user_batch_history(self, user_id: str, limit: int = 5) -> List[Dict]:
+        """
+        Get a user's latest batches with their cluster count and report flag
+
+        Reads the batch_history view, so the counts come back with the
+        batches in one query instead of a clusters and reports query per batch.
+        """
+        try:
+            response = self.client.table('batch_history')\
+                .select('id, status, keyword_count, created_at, completed_at, cluster_count, has_report')\
+                .eq('user_id', user_id)\
+                .order('created_at', desc=True)\
+                .limit(limit)\
+                .execute()
+
+            return response.data if response.data else []
+        except Exception as e:
+            print(f"Error fetching batch history for {user_id}: {str(e)}")
+            return []
+
+    def get_batch(self, batch_id: str, full: bool = False) -> Optional[Dict]:
+        """Get batch by ID (with raw and cleaned keywords when full)"""
         try:
             response = self.client.table('keyword_batches')\
-                .select('*')\
+                .select(FULL_COLUMNS if full else BATCH_LIGHT_COLUMNS)\
                 .eq('id', batch_id)\
                 .execute()
 
@@ -113,11 +204,11 @@ class DatabaseService:
             print(f"Error fetching batch: {str(e)}")
             return None
 
-    def get_batch_clusters(self, batch_id: str) -> List[Dict]:
-        """Get all clusters for a batch"""
+    def get_batch_clusters(self, batch_id: str, full: bool = False) -> List[Dict]:
+        """Get all clusters for a batch (with outline and post idea JSON when full)"""
         try:
             response = self.client.table('keyword_clusters')\
-                .select('*')\
+                .select(FULL_COLUMNS if full else CLUSTER_LIGHT_COLUMNS)\
                 .eq('batch_id', batch_id)\
                 .order('cluster_number')\
                 .execute()
@@ -128,29 +219,50 @@ class DatabaseService:
             return []
 
     def get_or_create_user(self, slack_user_id: str, display_name: str = None) -> Dict:
-        """Get or create user record"""
-        # Try to find existing user
-        response = self.client.table('users')\
-            .select('*')\
-            .eq('slack_user_id', slack_user_id)\
-            .execute()
-
-        if response.data:
-            # Update last active
-            user = response.data[0]
-            self.client.table('users').update({
-                'last_active_at': datetime.now().isoformat()
-            }).eq('id', user['id']).execute()
-            return user
-
-        # Create new user
-        data = {
-            'slack_user_id': slack_user_id,
-            'display_name': display_name
-        }
-
-        response = self.client.table('users').insert(data).execute()
-        return response.data[0] if response.data else None
+        """Get or create user record, updating last_active_at (one upsert_user RPC call)"""
+        response = self.client.rpc('upsert_user', {
+            'p_slack_user_id': slack_user_id,
+            'p_display_name': display_name
+        }).execute()
+
+        user = response.data[0] if response.data else None
+        if user:
+            with _users_lock:
+                _user_ids[slack_user_id] = user['id']
+                _last_active[slack_user_id] = time.time()
+            cache = CacheService()
+            cache.cache_user_id(slack_user_id, user['id'])
+            cache.mark_user_active(slack_user_id, Config.USER_ACTIVITY_INTERVAL)
+        return user
+
+    def get_user_id(self, slack_user_id: str, display_name: str = None) -> Optional[str]:
+        """
+        Get the UUID of a Slack user, creating the user on first use
+
+        The ID is resolved from memory, then Redis. The database is only
+        called when neither has it or when last_active_at is due for an
+        update (once per USER_ACTIVITY_INTERVAL per user, across processes).
+        """
+        now = time.time()
+        with _users_lock:
+            user_id = _user_ids.get(slack_user_id)
+            recently_active = now - _last_active.get(slack_user_id, 0) < Config.USER_ACTIVITY_INTERVAL
+        if user_id and recently_active:
+            return user_id
+
+        cache = CacheService()
+        if not user_id:
+            user_id = cache.get_cached_user_id(slack_user_id)
+
+        if user_id and not cache.mark_user_active(slack_user_id, Config.USER_ACTIVITY_INTERVAL):
+            # Another process wrote last_active_at within the interval
+            with _users_lock:
+                _user_ids[slack_user_id] = user_id
+                _last_active[slack_user_id] = now
+            return user_id
+
+        user = self.get_or_create_user(slack_user_id, display_name)
+        return user['id'] if user else None
 
     def get_user_email(self, user_id: str) -> Optional[str]:
         """Get user's email address"""
@@ -173,69 +285,59 @@ class DatabaseService:
             .eq('batch_id', batch_id)\
             .execute()
 
-    def get_batch_by_id(self, batch_id: str, user_id: str = None) -> Optional[Dict]:
-        """Get batch by ID with fuzzy matching for partial IDs"""
+    def get_batch_by_id(self, batch_id: str, user_id: str = None, full: bool = False) -> Optional[Dict]:
+        """Get batch by ID with fuzzy matching for partial IDs (with keywords when full)"""
+        columns = FULL_COLUMNS if full else BATCH_LIGHT_COLUMNS
         # If user_id is provided and looks like a Slack ID (starts with 'U'), convert it first
         if user_id and user_id.startswith('U'):
             try:
-                user = self.get_or_create_user(user_id)
-                if user:
-                    user_id = user['id']
-                else:
+                user_id = self.get_user_id(user_id)
+                if not user_id:
                     return None
             except Exception as e:
                 print(f"Error converting Slack user ID to UUID: {str(e)}")
                 return None
 
+        batch_id = batch_id.strip().lower()
         try:
-            # Try exact match first
-            batch = self.get_batch(batch_id)
-            if batch:
+            if self._is_uuid(batch_id):
+                batch = self.get_batch(batch_id, full)
                 # If user_id provided, verify ownership
-                if user_id and str(batch.get('user_id', '')) != str(user_id):
+                if batch and user_id and str(batch.get('user_id', '')) != str(user_id):
                     return None
                 return batch
 
-            # Try partial match (first 8 chars) - filter by user if provided
-            query = self.client.table('keyword_batches').select('*').order('created_at', desc=True)
+            # Partial ID: the indexed short_id column holds the first 8 characters
+            if not batch_id or len(batch_id) > 36:
+                return None
+            query = self.client.table('keyword_batches').select(columns)
+            if len(batch_id) >= SHORT_ID_LENGTH:
+                query = query.eq('short_id', batch_id[:SHORT_ID_LENGTH])
+            else:
+                query = query.like('short_id', f'{batch_id}%')
 
             if user_id:
                 query = query.eq('user_id', user_id)
 
-            query = query.limit(50)
-            user_batches = query.execute()
-
-            if user_batches.data:
-                for batch in user_batches.data:
-                    if str(batch['id']).startswith(batch_id):
-                        return batch
-
-            return None
+            response = query.order('created_at', desc=True).limit(10).execute()
+            matches = [b for b in response.data or [] if str(b['id']).startswith(batch_id)]
+            return matches[0] if matches else None
         except Exception as e:
             print(f"Error fetching batch: {str(e)}")
-            # If it's a UUID validation error, try to find by partial match using text casting
-            if 'invalid input syntax for type uuid' in str(e):
-                try:
-                    # Try partial match without exact UUID validation - cast id to text for ilike
-                    query = self.client.table('keyword_batches').select('*').order('created_at', desc=True)
-
-                    if user_id:
-                        query = query.eq('user_id', user_id)
-
-                    # Use text casting for partial matching
-                    query = query.ilike('id::text', f'{batch_id}%').limit(50)
-                    user_batches = query.execute()
-
-                    if user_batches.data:
-                        return user_batches.data[0]  # Return first match
-                except Exception as e2:
-                    print(f"Error in fallback batch search: {str(e2)}")
-
             return None
 
-    def get_clusters_by_batch(self, batch_id: str) -> List[Dict]:
+    @staticmethod
+    def _is_uuid(value: str) -> bool:
+        """Whether value is a complete UUID (partial IDs can't be compared with the id column)"""
+        try:
+            uuid.UUID(value)
+            return len(value) == 36
+        except ValueError:
+            return False
+
+    def get_clusters_by_batch(self, batch_id: str, full: bool = False) -> List[Dict]:
         """Get all clusters for a batch (alias for get_batch_clusters)"""
-        return self.get_batch_clusters(batch_id)
+        return self.get_batch_clusters(batch_id, full)
 
     def update_cluster_outline(self, batch_id: str, cluster_id: int, new_outline: Dict, new_idea: Dict):
         """Update cluster outline and idea after regeneration"""
@@ -0,0 +1,492 @@
+# app/services/data/job_queue.py
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, List, Optional
+import redis
+from app.config import Config
+from app.health import update_job_metrics
+
+logger = logging.getLogger(__name__)
+
+USERS_KEY = "jobs:users"  # round-robin list of users with queued jobs
+QUEUE_PREFIX = "jobs:queue:"  # per-user list of queued job ids
+DATA_KEY = "jobs:data"  # job id -> job JSON, until the job finishes
+INFLIGHT_KEY = "jobs:inflight"  # job id -> owning worker process
+WORKER_PREFIX = "jobs:worker:"  # heartbeat per worker process
+
+# A user is in the ring exactly while their queue is non-empty. Returns the
+# number of jobs dequeued before the new one (see jobs_ahead).
+ENQUEUE_SCRIPT = """
+local queued = redis.call('LLEN', KEYS[2])
+local ahead = queued
+local before = true
+for _, user in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+  if user == ARGV[2] then
+    before = false
+  else
+    local turns = queued
+    if before then
+      turns = queued + 1
+    end
+    ahead = ahead + math.min(redis.call('LLEN', ARGV[4] .. user), turns)
+  end
+end
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[3])
+if redis.call('RPUSH', KEYS[2], ARGV[1]) == 1 then
+  redis.call('RPUSH', KEYS[1], ARGV[2])
+end
+return ahead
+"""
+
+# Take the next job of the user at the head of the ring, then move that user
+# to the back if they have more queued, so users take turns
+DEQUEUE_SCRIPT = """
+local users = redis.call('LLEN', KEYS[1])
+for i = 1, users do
+  local user = redis.call('LPOP', KEYS[1])
+  if not user then
+    return false
+  end
+  local queue = ARGV[1] .. user
+  local job_id = redis.call('LPOP', queue)
+  if redis.call('LLEN', queue) > 0 then
+    redis.call('RPUSH', KEYS[1], user)
+  end
+  if job_id then
+    redis.call('HSET', KEYS[2], job_id, ARGV[2])
+    return job_id
+  end
+end
+return false
+"""
+
+# Put a job whose worker died back at the front of its user's queue. HDEL
+# makes sure only one process requeues it.
+REQUEUE_SCRIPT = """
+if redis.call('HDEL', KEYS[2], ARGV[1]) == 0 then
+  return 0
+end
+if redis.call('LPUSH', KEYS[3], ARGV[1]) == 1 then
+  redis.call('LPUSH', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+# Job type -> handler(client, job)
+_handlers: Dict[str, Callable[[object, Dict], None]] = {}
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def jobs_ahead(ring: List[str], user_id: str, lengths: Dict[str, int]) -> int:
+    """
+    Jobs dequeued before a job the user is about to queue
+
+    Users take one job per turn in ring order. The new job is the user's
+    (queued + 1)th, so each user before them in the ring (or every user,
+    if they are not in it yet) gets up to queued + 1 turns first and each
+    user after them up to queued turns, capped by their queue length.
+
+    Args:
+        ring: Users with queued jobs, next to be served first
+        user_id: User queueing the job
+        lengths: Queued jobs per user
+    """
+    queued = lengths.get(user_id, 0)
+    ahead = queued
+    before = True
+    for user in ring:
+        if user == user_id:
+            before = False
+            continue
+        ahead += min(lengths.get(user, 0), queued + 1 if before else queued)
+    return ahead
+
+
+class JobQueue:
+    """
+    Queue of background jobs shared by every process through Redis
+
+    Jobs are queued per user and handed out round-robin between users, so one
+    user's large upload doesn't hold everyone else's jobs back. Jobs being
+    run are tracked with their worker process, so the jobs of a process that
+    stopped can be queued again. Without Redis the queue is process-local
+    and does not survive a restart.
+    """
+
+    def __init__(self, redis_client=None):
+        self.redis_client = redis_client
+        self._scripts = None
+        if redis_client:
+            self._scripts = {
+                'enqueue': redis_client.register_script(ENQUEUE_SCRIPT),
+                'dequeue': redis_client.register_script(DEQUEUE_SCRIPT),
+                'requeue': redis_client.register_script(REQUEUE_SCRIPT)
+            }
+
+        # Process-local fallback
+        self._lock = threading.Lock()
+        self._users = deque()
+        self._queues: Dict[str, deque] = {}
+        self._jobs: Dict[str, Dict] = {}
+        self._inflight: Dict[str, str] = {}
+
+    def enqueue(self, job_type: str, user_id: str, channel_id: str, **params) -> Dict:
+        """
+        Queue a job
+
+        Args:
+            job_type: Name of a registered handler
+            user_id: Slack user the job is for (jobs are fair between users)
+            channel_id: Slack channel to report to
+            **params: JSON-serializable job arguments
+
+        Returns:
+            The job, with 'ahead' set to the number of jobs that will run before it
+        """
+        job = dict(params)
+        job.update({
+            'id': uuid.uuid4().hex,
+            'type': job_type,
+            'user_id': user_id,
+            'channel_id': channel_id,
+            'enqueued_at': time.time(),
+            'attempts': 0
+        })
+        if self.redis_client:
+            ahead = self._scripts['enqueue'](
+                keys=[USERS_KEY, QUEUE_PREFIX + user_id, DATA_KEY],
+                args=[job['id'], user_id, json.dumps(job), QUEUE_PREFIX]
+            )
+        else:
+            with self._lock:
+                lengths = {user: len(queue) for user, queue in self._queues.items()}
+                ahead = jobs_ahead(list(self._users), user_id, lengths)
+                self._jobs[job['id']] = job
+                queue = self._queues.setdefault(user_id, deque())
+                queue.append(job['id'])
+                if len(queue) == 1:
+                    self._users.append(user_id)
+
+        logger.info(f" Queued {job_type} job {job['id'][:8]} for {user_id} ({ahead} ahead)")
+        return dict(job, ahead=ahead)
+
+    def dequeue(self, owner: str) -> Optional[Dict]:
+        """Take the next job, fair between users, and mark it as run by owner"""
+        if self.redis_client:
+            job_id = self._scripts['dequeue'](
+                keys=[USERS_KEY, INFLIGHT_KEY],
+                args=[QUEUE_PREFIX, owner]
+            )
+            if not job_id:
+                return None
+            job_id = job_id.decode() if isinstance(job_id, bytes) else job_id
+            data = self.redis_client.hget(DATA_KEY, job_id)
+            if data is None:
+                self.redis_client.hdel(INFLIGHT_KEY, job_id)
+                return None
+            return json.loads(data)
+
+        with self._lock:
+            while self._users:
+                user_id = self._users.popleft()
+                queue = self._queues.get(user_id)
+                job_id = queue.popleft() if queue else None
+                if queue:
+                    self._users.append(user_id)
+                if job_id:
+                    self._inflight[job_id] = owner
+                    return dict(self._jobs[job_id])
+            return None
+
+    def update(self, job: Dict, **fields):
+        """Store progress on a running job (e.g. its batch id) so a recovered run can use it"""
+        job.update(fields)
+        if self.redis_client:
+            self.redis_client.hset(DATA_KEY, job['id'], json.dumps(job))
+        else:
+            with self._lock:
+                self._jobs[job['id']] = dict(job)
+
+    def finish(self, job: Dict):
+        """Forget a job that has run (successfully or not)"""
+        if self.redis_client:
+            pipe = self.redis_client.pipeline()
+            pipe.hdel(INFLIGHT_KEY, job['id'])
+            pipe.hdel(DATA_KEY, job['id'])
+            pipe.execute()
+        else:
+            with self._lock:
+                self._inflight.pop(job['id'], None)
+                self._jobs.pop(job['id'], None)
+
+    def recover(self, is_alive: Callable[[str], bool]) -> List[Dict]:
+        """
+        Queue again the jobs of worker processes that are no longer alive
+
+        A job that has already been started JOB_MAX_ATTEMPTS times is dropped
+        instead, so a job that crashes its process can't do so forever.
+
+        Args:
+            is_alive: Whether the worker process with this id is still running
+
+        Returns:
+            The jobs that were queued again
+        """
+        if not self.redis_client:
+            return []  # process-local jobs die with their process
+
+        recovered = []
+        for job_id, owner in self.redis_client.hgetall(INFLIGHT_KEY).items():
+            job_id, owner = job_id.decode(), owner.decode()
+            if is_alive(owner):
+                continue
+
+            data = self.redis_client.hget(DATA_KEY, job_id)
+            if data is None:
+                self.redis_client.hdel(INFLIGHT_KEY, job_id)
+                continue
+            job = json.loads(data)
+
+            if job.get('attempts', 0) >= Config.JOB_MAX_ATTEMPTS:
+                logger.error(f" Dropping {job['type']} job {job_id[:8]} after {job['attempts']} attempts")
+                self.finish(job)
+                continue
+
+            if self._scripts['requeue'](
+                keys=[USERS_KEY, INFLIGHT_KEY, QUEUE_PREFIX + job['user_id']],
+                args=[job_id, job['user_id']]
+            ):
+                logger.warning(f" Recovered {job['type']} job {job_id[:8]} from stopped worker {owner}")
+                recovered.append(job)
+        return recovered
+
+    def depth(self) -> int:
+        """Number of queued jobs"""
+        if self.redis_client:
+            users = set(self.redis_client.lrange(USERS_KEY, 0, -1))
+            if not users:
+                return 0
+            pipe = self.redis_client.pipeline()
+            for user_id in users:
+                pipe.llen(QUEUE_PREFIX.encode() + user_id)
+            return sum(pipe.execute())
+
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> Dict:
+        """Queue depth, users waiting and jobs running across all processes"""
+        if self.redis_client:
+            return {
+                'queued': self.depth(),
+                'queued_users': self.redis_client.llen(USERS_KEY),
+                'running': self.redis_client.hlen(INFLIGHT_KEY)
+            }
+
+        with self._lock:
+            queued = sum(len(queue) for queue in self._queues.values())
+            return {'queued': queued, 'queued_users': len(self._users), 'running': len(self._inflight)}
+
+
+class WorkerPool:
+    """A fixed number of threads running queued jobs, reporting to /health"""
+
+    def __init__(self, queue: JobQueue, client, workers: int = None):
+        """
+        Args:
+            queue: Queue to take jobs from
+            client: Slack client handed to job handlers
+            workers: Number of jobs run at once (default Config.JOB_WORKERS)
+        """
+        self.queue = queue
+        self.client = client
+        self.workers = max(1, workers or Config.JOB_WORKERS)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'busy_workers': 0, 'started': 0, 'completed': 0, 'failed': 0, 'recovered': 0,
+            'wait_seconds_total': 0.0, 'wait_seconds_max': 0.0, 'wait_seconds_last': 0.0
+        }
+
+    def start(self):
+        """Recover jobs left by stopped processes and start the workers"""
+        self._heartbeat()
+        self._recover()
+
+        threads = [threading.Thread(target=self._heartbeat_loop, name='job-heartbeat', daemon=True)]
+        threads += [
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        logger.info(f" Job worker pool {self.worker_id} started with {self.workers} workers")
+        self._publish_metrics()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def notify(self):
+        """Wake an idle worker (jobs queued by this process are picked up at once)"""
+        self._wakeup.set()
+
+    def metrics(self) -> Dict:
+        """Queue and worker metrics as shown on /health"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        started = stats.pop('started')
+        total_wait = stats.pop('wait_seconds_total')
+        metrics = self.queue.stats()
+        metrics.update(stats)
+        metrics.update({
+            'workers': self.workers,
+            'started': started,
+            'wait_seconds_avg': round(total_wait / started, 2) if started else 0.0,
+            'wait_seconds_max': round(stats['wait_seconds_max'], 2),
+            'wait_seconds_last': round(stats['wait_seconds_last'], 2)
+        })
+        return metrics
+
+    def _work(self):
+        while not self._stopped.is_set():
+            try:
+                job = self.queue.dequeue(self.worker_id)
+            except Exception as e:
+                logger.error(f" Could not take a job from the queue: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(Config.JOB_POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+
+            self._run(job)
+
+    def _run(self, job: Dict):
+        wait = max(0.0, time.time() - job['enqueued_at'])
+        with self._stats_lock:
+            self._stats['busy_workers'] += 1
+            self._stats['started'] += 1
+            self._stats['wait_seconds_total'] += wait
+            self._stats['wait_seconds_max'] = max(self._stats['wait_seconds_max'], wait)
+            self._stats['wait_seconds_last'] = wait
+        self._publish_metrics()
+
+        logger.info(f" Running {job['type']} job {job['id'][:8]} after {wait:.1f}s in queue")
+        outcome = 'failed'
+        try:
+            self.queue.update(job, attempts=job.get('attempts', 0) + 1)
+            handler = _handlers.get(job['type'])
+            if handler is None:
+                raise ValueError(f"No handler registered for job type '{job['type']}'")
+            handler(self.client, job)
+            outcome = 'completed'
+        except Exception as e:
+            # Handlers report their own errors to the user; this only keeps the worker alive
+            logger.error(f" {job['type']} job {job['id'][:8]} failed: {e}")
+        finally:
+            try:
+                self.queue.finish(job)
+            except Exception as e:
+                logger.error(f" Could not mark job {job['id'][:8]} finished: {e}")
+            with self._stats_lock:
+                self._stats['busy_workers'] -= 1
+                self._stats[outcome] += 1
+            self._publish_metrics()
+
+    def _heartbeat_loop(self):
+        """Keep this process marked alive, and pick up jobs of processes that stopped"""
+        interval = max(1.0, Config.JOB_HEARTBEAT_TTL / 3)
+        while not self._stopped.wait(interval):
+            self._heartbeat()
+            self._recover()
+            self._publish_metrics()
+
+    def _heartbeat(self):
+        if not self.queue.redis_client:
+            return
+        try:
+            self.queue.redis_client.setex(WORKER_PREFIX + self.worker_id, Config.JOB_HEARTBEAT_TTL, 1)
+        except Exception as e:
+            logger.warning(f" Job worker heartbeat failed: {e}")
+
+    def _recover(self):
+        try:
+            recovered = self.queue.recover(self._is_alive)
+        except Exception as e:
+            logger.error(f" Job recovery failed: {e}")
+            return
+        if recovered:
+            with self._stats_lock:
+                self._stats['recovered'] += len(recovered)
+            self._wakeup.set()
+
+    def _is_alive(self, worker_id: str) -> bool:
+        if worker_id == self.worker_id:
+            return True
+        return bool(self.queue.redis_client.exists(WORKER_PREFIX + worker_id))
+
+    def _publish_metrics(self):
+        try:
+            update_job_metrics(self.metrics())
+        except Exception as e:
+            logger.debug(f" Could not update job metrics: {e}")
+
+
+_pool: Optional[WorkerPool] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue (Redis-backed when Redis is reachable)"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            redis_client = None
+            try:
+                if Config.REDIS_URL:
+                    redis_client = redis.from_url(Config.REDIS_URL)
+                    redis_client.ping()
+            except Exception as e:
+                logger.warning(f" Redis unavailable, jobs are queued in memory and lost on restart: {e}")
+                redis_client = None
+            _queue = JobQueue(redis_client)
+        return _queue
+
+
+def register_job_handler(job_type: str, handler: Callable[[object, Dict], None]):
+    """Register the function that runs jobs of a type; it is called as handler(client, job)"""
+    _handlers[job_type] = handler
+
+
+def enqueue_job(job_type: str, user_id: str, channel_id: str, **params) -> Dict:
+    """Queue a job for the worker pool (see JobQueue.enqueue)"""
+    job = get_job_queue().enqueue(job_type, user_id, channel_id, **params)
+    if _pool:
+        _pool.notify()
+    return job
+
+
+def update_job(job: Dict, **fields):
+    """Record progress on a running job (see JobQueue.update)"""
+    get_job_queue().update(job, **fields)
+
+
+def start_workers(client, workers: int = None) -> WorkerPool:
+    """Start this process's worker pool; call once at startup"""
+    global _pool
+    if _pool is None:
+        _pool = WorkerPool(get_job_queue(), client, workers)
+        _pool.start()
+    return _pool
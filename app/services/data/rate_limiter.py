@@ -0,0 +1,146 @@
+# app/services/data/rate_limiter.py
+import threading
+import time
+import logging
+from typing import Dict, Optional
+import redis
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Atomically refill the bucket and reserve tokens. Returns the number of
+# milliseconds the caller must wait before using them, or -1 if that is longer
+# than the caller is willing to wait (nothing is reserved in that case).
+# Redis server time is used so every process shares one clock.
+TOKEN_BUCKET_SCRIPT = """
+if redis.replicate_commands then
+  redis.replicate_commands()
+end
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local max_wait_ms = tonumber(ARGV[4])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate / 1000)
+
+local wait_ms = 0
+if tokens < requested then
+  wait_ms = math.ceil((requested - tokens) * 1000 / rate)
+end
+if wait_ms > max_wait_ms then
+  return -1
+end
+
+tokens = tokens - requested
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + wait_ms + 1000)
+return wait_ms
+"""
+
+# Process-local buckets, used when Redis is not configured or unreachable
+_local_buckets: Dict[str, Dict] = {}
+_local_lock = threading.Lock()
+
+_redis_client = None
+_redis_checked = False
+
+
+def _get_redis():
+    """Shared Redis client for all limiters (None if Redis is unavailable)"""
+    global _redis_client, _redis_checked
+    if not _redis_checked:
+        _redis_checked = True
+        try:
+            if Config.REDIS_URL:
+                _redis_client = redis.from_url(Config.REDIS_URL)
+                _redis_client.ping()
+        except Exception as e:
+            logger.warning(f" Redis unavailable, rate limits apply per process only: {e}")
+            _redis_client = None
+    return _redis_client
+
+
+class TokenBucketLimiter:
+    """Token bucket rate limiter shared by every thread and process using the same name"""
+
+    def __init__(self, name: str, rate: float, burst: int = 1):
+        """
+        Args:
+            name: Bucket name; limiters with the same name share tokens
+            rate: Tokens added per second
+            burst: Maximum tokens that can accumulate
+        """
+        self.name = name
+        self.key = f"ratelimit:bucket:{name}"
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.redis_client = _get_redis()
+        self._script = self.redis_client.register_script(TOKEN_BUCKET_SCRIPT) if self.redis_client else None
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, sleeping only until they have accrued
+
+        Tokens are reserved up front, so concurrent callers queue behind each
+        other instead of polling.
+
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait (None waits as long as needed)
+
+        Returns:
+            True if the tokens were taken, False if that would exceed timeout
+        """
+        max_wait_ms = int(timeout * 1000) if timeout is not None else 2 ** 31
+        wait_ms = self._reserve(tokens, max_wait_ms)
+
+        if wait_ms < 0:
+            return False
+        if wait_ms > 0:
+            logger.debug(f" Rate limiter '{self.name}': waiting {wait_ms}ms")
+            time.sleep(wait_ms / 1000)
+        return True
+
+    def consume(self, tokens: int):
+        """
+        Charge tokens without waiting, e.g. usage only known after a call
+
+        The bucket may go negative; later acquire() calls wait off the debt.
+        """
+        self._reserve(tokens, 2 ** 31)
+
+    def _reserve(self, tokens: int, max_wait_ms: int) -> int:
+        """Reserve tokens and return the required wait in milliseconds (-1 if refused)"""
+        if self._script:
+            try:
+                return int(self._script(
+                    keys=[self.key],
+                    args=[self.rate, self.burst, tokens, max_wait_ms]
+                ))
+            except Exception as e:
+                logger.warning(f" Redis rate limiter failed, using local bucket: {e}")
+
+        return self._reserve_local(tokens, max_wait_ms)
+
+    def _reserve_local(self, tokens: int, max_wait_ms: int) -> int:
+        """Same algorithm as the Lua script, against a process-local bucket"""
+        with _local_lock:
+            now = time.time() * 1000
+            bucket = _local_buckets.setdefault(self.key, {'tokens': self.burst, 'ts': now})
+            available = min(self.burst, bucket['tokens'] + (now - bucket['ts']) * self.rate / 1000)
+
+            wait_ms = 0
+            if available < tokens:
+                wait_ms = int(-(-(tokens - available) * 1000 // self.rate))
+            if wait_ms > max_wait_ms:
+                return -1
+
+            bucket['tokens'] = available - tokens
+            bucket['ts'] = now
+            return wait_ms
@@ -4,6 +4,12 @@ import time
 import logging
 from typing import List, Dict
 from app.config import Config
+from app.services.data.cache import CacheService
+from app.services.data.rate_limiter import TokenBucketLimiter
+from app.utils.single_flight import SingleFlight
+
+# Shared by every instance so concurrent pipelines make one upstream call per query
+_search_flights = SingleFlight()
 
 class WebSearchService:
     """Search the web for top-ranking content"""
@@ -11,8 +17,14 @@ class WebSearchService:
     def __init__(self):
         self.api_key = Config.SERP_API_KEY
         self.base_url = "https://serpapi.com/search.json"
-        self.rate_limit_delay = 1  # seconds between requests
-        self.last_request_time = 0
+        # Shared by every instance, worker and process (via Redis when configured)
+        self.rate_limiter = TokenBucketLimiter(
+            'serpapi',
+            rate=Config.SEARCH_RATE_PER_SECOND,
+            burst=Config.SEARCH_RATE_BURST
+        )
+        self.cache = CacheService()
+        self.cache_ttl = Config.SEARCH_CACHE_TTL
         self.logger = logging.getLogger(__name__)
 
         if not self.api_key or self.api_key == 'your_serpapi_api_key_here':
@@ -36,7 +48,6 @@ class WebSearchService:
         for keyword in keywords:
             try:
                 results[keyword] = self.search_single(keyword, count)
-                time.sleep(self.rate_limit_delay)
             except Exception as e:
                 print(f"Error searching '{keyword}': {str(e)}")
                 results[keyword] = []
@@ -61,9 +72,30 @@ class WebSearchService:
             self.logger.info(" Using mock data for testing (API key not configured)")
             return self._get_mock_results(query, count)
 
-        # Rate limiting
-        self._wait_for_rate_limit()
+        # Read-through cache
+        cached = self.cache.get_cached_search(query, count)
+        if cached is not None:
+            self.logger.info(f" Using cached search results for '{query}'")
+            return cached
+
+        # Identical concurrent searches wait for a single upstream call
+        flight_key = self.cache.search_identity(query, count)
+        return _search_flights.do(flight_key, lambda: self._search_and_cache(query, count))
+
+    def _search_and_cache(self, query: str, count: int) -> List[Dict]:
+        """Call the search API and cache non-empty results"""
+        # A flight that just finished may already have filled the cache
+        cached = self.cache.get_cached_search(query, count)
+        if cached is not None:
+            return cached
+
+        results = self._fetch_results(query, count)
+        if results:
+            self.cache.cache_search_results(query, results, count, ttl=self.cache_ttl)
+        return results
 
+    def _fetch_results(self, query: str, count: int) -> List[Dict]:
+        """Call SerpAPI with rate limiting and retries"""
         params = {
             'api_key': self.api_key,
             'q': query,
@@ -78,6 +110,9 @@ class WebSearchService:
         # Retry logic
         max_retries = 3
         for attempt in range(max_retries):
+            # Rate limiting (every attempt, including retries, takes a token)
+            self._wait_for_rate_limit()
+
             try:
                 self.logger.debug(f" Making API request to SerpAPI (attempt {attempt + 1})")
                 response = requests.get(
@@ -129,14 +164,8 @@ class WebSearchService:
         return results
 
     def _wait_for_rate_limit(self):
-        """Ensure rate limit delay between requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
-
-        self.last_request_time = time.time()
+        """Take a token from the shared SerpAPI bucket, waiting only as long as needed"""
+        self.rate_limiter.acquire()
 
     def _get_mock_results(self, query: str, count: int) -> List[Dict]:
         """Return mock search results for testing"""
@@ -1,39 +1,89 @@
 # app/services/content_scraper.py
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait
+from itertools import chain
+from typing import List, Dict, Optional
+from urllib.parse import urlparse
+import codecs
+import threading
 import time
 import logging
+from app.config import Config
+from app.services.data.cache import CacheService
+from app.services.processing.html_extractor import SNIFF_BYTES, extract_page_structure, sniff_encoding
+from app.utils.profiler import Profiler
+
+STREAM_CHUNK_SIZE = 16384  # bytes read from the socket per step
 
 class ContentScraper:
     """Scrape and extract content structure from web pages"""
 
-    def __init__(self):
+    def __init__(self, profiler: Profiler = None):
+        """
+        Args:
+            profiler: Optional profiler that gets a 'scrape.fetch' span per URL
+        """
+        self.profiler = profiler
         self.timeout = 10
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.max_workers = Config.SCRAPE_WORKERS
+        self.deadline = Config.SCRAPE_DEADLINE
+        self.host_delay = Config.SCRAPE_HOST_DELAY
+        self.max_bytes = Config.SCRAPE_MAX_BYTES
+        self.cache_ttl = Config.SCRAPE_CACHE_TTL
+        self.cache_max_age = Config.SCRAPE_CACHE_MAX_AGE
+        self.cache = CacheService()
         self.logger = logging.getLogger(__name__)
 
+        # Pooled session so repeated hosts reuse TCP/TLS connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Per-host politeness: one request in flight per host, spaced by host_delay
+        self._hosts_lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._host_last_request: Dict[str, float] = {}
+
+        # One pool for the scraper's lifetime, so fetches abandoned at a
+        # deadline share the worker limit with later calls
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scrape')
+
     def scrape_urls(self, urls: List[str]) -> List[Dict]:
         """
-        Scrape multiple URLs
+        Scrape multiple URLs concurrently within an overall deadline
 
         Args:
             urls: List of URLs to scrape
 
         Returns:
-            List of scraping results
+            List of scraping results, in the same order as urls
         """
         self.logger.info(f" Starting to scrape {len(urls)} URLs")
+        if not urls:
+            return []
+
+        deadline = time.time() + self.deadline
+        futures = [self._executor.submit(self._scrape_politely, url, deadline) for url in urls]
+        done, pending = wait(futures, timeout=self.deadline)
+        # Don't wait for stragglers; their results are dropped
+        for future in pending:
+            future.cancel()
+
         results = []
+        for url, future in zip(urls, futures):
+            if future not in done:
+                self.logger.warning(f" Scraping {url} exceeded the {self.deadline}s deadline")
+                results.append(self._deadline_exceeded(url))
+                continue
 
-        for i, url in enumerate(urls, 1):
             try:
-                self.logger.debug(f" Scraping {i}/{len(urls)}: {url}")
-                result = self.scrape_single(url)
-                results.append(result)
-                time.sleep(0.5)  # Be polite
+                results.append(future.result())
             except Exception as e:
                 self.logger.error(f" Error scraping {url}: {str(e)}")
                 results.append({
@@ -46,6 +96,68 @@ class ContentScraper:
         self.logger.info(f" Scraping complete: {successful}/{len(urls)} URLs successful")
         return results
 
+    def close(self):
+        """Stop the worker threads and close pooled connections; fetches past their deadline are abandoned"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def _scrape_politely(self, url: str, deadline: float) -> Dict:
+        """
+        Scrape a URL while holding its host's politeness slot
+
+        Gives up without fetching once the caller's deadline has passed, so
+        an abandoned request doesn't hold the host slot for other callers.
+        """
+        # Fresh cache hits skip both the politeness wait and the network
+        cached = self.cache.get_cached_scrape(url)
+        if self._is_fresh(cached):
+            self.logger.debug(f" Scrape cache hit: {url}")
+            if self.profiler:
+                self.profiler.record('scrape.fetch', 0.0, url=url, cached=True)
+            return dict(cached['result'], cached=True)
+
+        host = urlparse(url).netloc.lower()
+
+        with self._hosts_lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+
+        waited = time.time()
+        if not host_lock.acquire(timeout=max(deadline - waited, 0)):
+            return self._deadline_exceeded(url)
+        try:
+            delay = self.host_delay - (time.time() - self._host_last_request.get(host, 0))
+            if time.time() + max(delay, 0) >= deadline:
+                return self._deadline_exceeded(url)
+            if delay > 0:
+                time.sleep(delay)
+            self._host_last_request[host] = time.time()
+            waited = time.time() - waited
+
+            self.logger.debug(f" Scraping {url}")
+            start = time.time()
+            result = self._fetch(url, cached, timeout=min(self.timeout, deadline - start))
+            if self.profiler:
+                attrs = {'url': url, 'host_wait': round(waited, 3)}
+                if result.get('cached'):
+                    attrs['cached'] = True
+                else:
+                    attrs['bytes'] = result.get('bytes_read', 0)
+                if not result.get('success'):
+                    attrs['error'] = result.get('error')
+                self.profiler.record('scrape.fetch', time.time() - start, **attrs)
+            return result
+        finally:
+            host_lock.release()
+
+    @staticmethod
+    def _deadline_exceeded(url: str) -> Dict:
+        """Result for a URL that wasn't scraped before the deadline"""
+        return {
+            'url': url,
+            'success': False,
+            'error': 'Deadline exceeded'
+        }
+
     def scrape_single(self, url: str) -> Dict:
         """
         Scrape a single URL
@@ -56,36 +168,69 @@ class ContentScraper:
         Returns:
             Dictionary with headings and metadata
         """
-        try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=self.timeout,
-                allow_redirects=True
-            )
-            response.raise_for_status()
+        cached = self.cache.get_cached_scrape(url)
+        if self._is_fresh(cached):
+            self.logger.debug(f" Scrape cache hit: {url}")
+            return dict(cached['result'], cached=True)
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+        return self._fetch(url, cached)
+
+    def _fetch(self, url: str, cached: Optional[Dict] = None, timeout: float = None) -> Dict:
+        """
+        Fetch and parse a URL, revalidating a stale cache entry if there is one
 
-            # Extract headings
-            headings = self._extract_headings(soup)
+        Results served from the cache (after a 304) have cached set, their
+        bytes_read is from the original fetch.
+        """
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
 
-            # Extract title
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else ''
+        try:
+            # Stream the body and stop after max_bytes; headings, title and
+            # meta description are collected in a single parsing pass
+            with self.session.get(
+                url,
+                headers=headers,
+                timeout=timeout or self.timeout,
+                allow_redirects=True,
+                stream=True
+            ) as response:
+                if cached and response.status_code == 304:
+                    self.logger.debug(f" Scrape cache revalidated: {url}")
+                    self._save_to_cache(url, cached['result'], cached.get('etag'), cached.get('last_modified'))
+                    return dict(cached['result'], cached=True)
 
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            description = meta_desc.get('content', '') if meta_desc else ''
+                response.raise_for_status()
+                # Read enough of the body to find a <meta> charset first
+                chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+                head = []
+                for chunk in chunks:
+                    head.append(chunk)
+                    if sum(len(c) for c in head) >= SNIFF_BYTES:
+                        break
+                page = extract_page_structure(
+                    chain(head, chunks),
+                    self._response_encoding(response, b''.join(head)),
+                    self.max_bytes
+                )
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
 
-            return {
+            result = {
                 'url': url,
                 'success': True,
-                'title': title_text,
-                'description': description,
-                'headings': headings,
-                'heading_count': len(headings)
+                'title': page['title'],
+                'description': page['description'],
+                'headings': page['headings'],
+                'heading_count': len(page['headings']),
+                'bytes_read': page['bytes_read']
             }
+            self._save_to_cache(url, result, etag, last_modified)
+            return result
 
         except requests.exceptions.Timeout:
             return {
@@ -100,25 +245,41 @@ class ContentScraper:
                 'error': str(e)
             }
 
-    def _extract_headings(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extract all headings from HTML"""
-        headings = []
+    def _is_fresh(self, cached: Optional[Dict]) -> bool:
+        """Check whether a cache entry can be used without revalidation"""
+        return bool(cached) and time.time() - cached.get('fetched_at', 0) < self.cache_ttl
 
-        for tag in ['h1', 'h2', 'h3']:
-            for heading in soup.find_all(tag):
-                text = heading.get_text().strip()
+    def _save_to_cache(self, url: str, result: Dict, etag: str = None, last_modified: str = None):
+        """Cache a successful result with its validators for later revalidation"""
+        self.cache.cache_scrape_result(url, {
+            'result': result,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time()
+        }, ttl=self.cache_max_age)
 
-                # Clean text
-                text = ' '.join(text.split())
+    @staticmethod
+    def _response_encoding(response: requests.Response, head: bytes) -> str:
+        """
+        Encoding of a streamed body from its first bytes
+
+        The Content-Type charset wins, then a BOM or <meta charset> in the
+        page. Otherwise the page is UTF-8 if its start is valid UTF-8, and
+        Windows-1252 (the browser default for legacy pages) if not.
+        """
+        if 'charset=' in response.headers.get('Content-Type', '').lower():
+            return response.encoding
 
-                if text and len(text) > 3:  # Filter very short headings
-                    headings.append({
-                        'level': tag,
-                        'text': text,
-                        'position': len(headings) + 1
-                    })
+        declared = sniff_encoding(head)
+        if declared:
+            return declared
 
-        return headings
+        try:
+            # Not final: a multi-byte character may continue in the next chunk
+            codecs.getincrementaldecoder('utf-8')().decode(head)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'cp1252'
 
     def extract_common_topics(self, scraped_results: List[Dict]) -> List[str]:
         """
@@ -0,0 +1,149 @@
+# app/services/processing/html_extractor.py
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional
+
+HEADING_TAGS = ('h1', 'h2', 'h3')
+SKIP_TAGS = ('script', 'style')
+SNIFF_BYTES = 4096  # start of the body searched for a <meta> charset
+META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([a-z0-9_.:-]+)', re.IGNORECASE)
+
+
+class PageStructureParser(HTMLParser):
+    """Incrementally collect title, meta description and h1-h3 headings in one pass"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ''
+        self.description = ''
+        self.headings: List[Dict] = []
+
+        self._in_title = False
+        self._title_parts: List[str] = []
+        self._heading_tag: Optional[str] = None
+        self._heading_parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == 'title' and not self.title and not self._in_title:
+            self._in_title = True
+        elif tag == 'meta' and not self.description:
+            attributes = dict(attrs)
+            if (attributes.get('name') or '').lower() == 'description':
+                self.description = attributes.get('content') or ''
+        elif tag in HEADING_TAGS and self._heading_tag is None:
+            self._heading_tag = tag
+            self._heading_parts = []
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == 'title' and self._in_title:
+            self._in_title = False
+            self.title = ''.join(self._title_parts).strip()
+        elif tag == self._heading_tag:
+            text = ' '.join(''.join(self._heading_parts).split())
+            if len(text) > 3:  # Filter very short headings
+                self.headings.append({'level': tag, 'text': text})
+            self._heading_tag = None
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self._title_parts.append(data)
+        if self._heading_tag:
+            self._heading_parts.append(data)
+
+
+def extract_page_structure(
+    chunks: Iterable[bytes],
+    encoding: str = 'utf-8',
+    max_bytes: int = None
+) -> Dict:
+    """
+    Parse streamed HTML into title, meta description and headings
+
+    Reading stops once max_bytes have been consumed, so large pages are never
+    fully downloaded or held in memory.
+
+    Args:
+        chunks: Iterable of raw response body chunks
+        encoding: Character encoding of the body
+        max_bytes: Byte budget (None for no limit)
+
+    Returns:
+        Dict with title, description, headings (grouped h1, h2, h3 as before),
+        bytes_read and truncated
+    """
+    parser = PageStructureParser()
+    decoder = codecs.getincrementaldecoder(_codec_name(encoding))(errors='replace')
+    bytes_read = 0
+    truncated = False
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if max_bytes is not None and bytes_read + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - bytes_read]
+            truncated = True
+        bytes_read += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if truncated:
+            break
+
+    if not truncated:
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+
+    if parser._in_title and not parser.title:
+        parser.title = ''.join(parser._title_parts).strip()
+
+    # Keep the previous ordering: all h1, then h2, then h3 (document order within a level)
+    headings = sorted(parser.headings, key=lambda h: HEADING_TAGS.index(h['level']))
+    for position, heading in enumerate(headings, 1):
+        heading['position'] = position
+
+    return {
+        'title': parser.title,
+        'description': parser.description,
+        'headings': headings,
+        'bytes_read': bytes_read,
+        'truncated': truncated
+    }
+
+
+def sniff_encoding(head: bytes) -> Optional[str]:
+    """
+    Encoding declared by a byte order mark or <meta charset> at the start of a page
+
+    Args:
+        head: First bytes of the body
+
+    Returns:
+        A known codec name, or None if the page declares none
+    """
+    for bom, encoding in ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16')):
+        if head.startswith(bom):
+            return encoding
+
+    match = META_CHARSET.search(head[:SNIFF_BYTES])
+    if not match:
+        return None
+    try:
+        name = codecs.lookup(match.group(1).decode('ascii')).name
+    except LookupError:
+        return None
+    # Browsers decode pages labelled Latin-1 or ASCII as Windows-1252
+    return 'cp1252' if name in ('latin-1', 'iso8859-1', 'ascii') else name
+
+
+def _codec_name(encoding: str) -> str:
+    """Fall back to UTF-8 for missing or unknown encodings"""
+    try:
+        return codecs.lookup(encoding or 'utf-8').name
+    except LookupError:
+        return 'utf-8'
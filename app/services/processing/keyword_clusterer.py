@@ -1,14 +1,26 @@
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.metrics import silhouette_score
 import numpy as np
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from collections import Counter
+from app.config import Config
+
+SILHOUETTE_SAMPLE_SIZE = 2000  # keywords scored per candidate k
+INITIAL_N_INIT = 3  # restarts for the first k; later k are warm-started
+LARGE_SELECTION_SAMPLE = 10000  # keywords used to pick k in large-batch mode
+STREAMING_CHUNK_SIZE = 4096  # embeddings per mini-batch step
+STREAMING_EPOCHS = 3  # passes over the data in large-batch mode
 
 class KeywordClusterer:
     """Cluster keywords by semantic similarity"""
 
-    def __init__(self):
+    def __init__(self, llm=None):
+        """
+        Args:
+            llm: Optional LLMClient for cluster names (one is created when needed)
+        """
+        self.llm = llm
         self.logger = logging.getLogger(__name__)
 
     def cluster_keywords(
@@ -38,28 +50,27 @@ class KeywordClusterer:
             self.logger.info(" Few keywords detected, creating single cluster")
             return [self._create_single_cluster(keywords, 0)]
 
-        # Determine optimal clusters
-        self.logger.debug(" Finding optimal number of clusters using silhouette score")
-        optimal_k = self._find_optimal_clusters(
-            embeddings,
-            min_k=min(min_clusters, n_keywords),
-            max_k=min(max_clusters, n_keywords)
-        )
-        self.logger.info(f" Optimal cluster count: {optimal_k}")
+        min_k = min(min_clusters, n_keywords)
+        max_k = min(max_clusters, n_keywords)
 
-        # Perform clustering
-        self.logger.debug(f" Running K-means clustering with k={optimal_k}")
-        kmeans = KMeans(n_clusters=optimal_k, random_state=42, n_init=10)
-        labels = kmeans.fit_predict(embeddings)
+        if n_keywords > Config.LARGE_BATCH_THRESHOLD:
+            # Mini-batch mode keeps memory bounded for very large keyword sets
+            self.logger.info(f" Large batch ({n_keywords} keywords), using mini-batch clustering")
+            optimal_k, labels = self._cluster_streaming(embeddings, min_k, max_k)
+        else:
+            # Select the number of clusters; the winning fit is reused for labels
+            self.logger.debug(" Selecting cluster count using sampled silhouette score")
+            kmeans = self._select_model(embeddings, min_k=min_k, max_k=max_k)
+            optimal_k, labels = kmeans.n_clusters, kmeans.labels_
+        self.logger.info(f" Optimal cluster count: {optimal_k}")
 
         # Group keywords by cluster
-        clusters = []
-        for cluster_id in range(optimal_k):
-            cluster_keywords = [
-                keywords[i] for i, label in enumerate(labels)
-                if label == cluster_id
-            ]
+        grouped = [[] for _ in range(optimal_k)]
+        for keyword, label in zip(keywords, labels):
+            grouped[label].append(keyword)
 
+        clusters = []
+        for cluster_id, cluster_keywords in enumerate(grouped):
             if cluster_keywords:
                 cluster = {
                     'cluster_id': cluster_id,
@@ -82,41 +93,135 @@ class KeywordClusterer:
         self.logger.info(f" Clustering complete: {len(clusters)} clusters created")
         return clusters
     
-    def _find_optimal_clusters(
-        self, 
-        embeddings: np.ndarray, 
-        min_k: int = 3, 
+    def _select_model(
+        self,
+        embeddings: np.ndarray,
+        min_k: int = 3,
         max_k: int = 10
-    ) -> int:
+    ) -> KMeans:
         """
-        Find optimal number of clusters using silhouette score
+        Sweep k and return the fitted KMeans model with the best silhouette score
+
+        Each k after the first is warm-started from the previous fit with its
+        worst cluster split in two, and every candidate is scored on the same
+        fixed sample, so the sweep costs a few cheap fits instead of full refits.
         """
-        if len(embeddings) <= min_k:
-            return max(2, len(embeddings) - 1)
-        
-        scores = []
-        k_range = range(min_k, min(max_k + 1, len(embeddings)))
-        
-        for k in k_range:
-            kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-            labels = kmeans.fit_predict(embeddings)
-            score = silhouette_score(embeddings, labels)
-            scores.append((k, score))
-        
-        # Return k with best silhouette score
-        optimal_k = max(scores, key=lambda x: x[1])[0]
-        return optimal_k
-    
+        n_samples = len(embeddings)
+        if n_samples <= min_k:
+            k = max(2, n_samples - 1)
+            return KMeans(n_clusters=k, random_state=42, n_init=10).fit(embeddings)
+
+        rng = np.random.RandomState(42)
+        if n_samples > SILHOUETTE_SAMPLE_SIZE:
+            sample_idx = rng.choice(n_samples, SILHOUETTE_SAMPLE_SIZE, replace=False)
+        else:
+            sample_idx = np.arange(n_samples)
+        sample = embeddings[sample_idx]
+
+        best_model, best_score = None, -1.0
+        model = None
+
+        for k in range(min_k, min(max_k + 1, n_samples)):
+            if model is None:
+                model = KMeans(n_clusters=k, random_state=42, n_init=INITIAL_N_INIT)
+            else:
+                init = self._grow_centers(embeddings, model)
+                if init is None:
+                    # Only duplicate points left to split: plain k-means++ for this k
+                    model = KMeans(n_clusters=k, random_state=42, n_init=INITIAL_N_INIT)
+                else:
+                    model = KMeans(n_clusters=k, init=init, n_init=1, random_state=42)
+            model.fit(embeddings)
+
+            sample_labels = model.labels_[sample_idx]
+            if len(np.unique(sample_labels)) < 2:
+                continue
+
+            score = silhouette_score(sample, sample_labels)
+            self.logger.debug(f" k={k}: silhouette={score:.4f}")
+            if score > best_score:
+                best_model, best_score = model, score
+
+        return best_model if best_model is not None else model
+
+    def _cluster_streaming(
+        self,
+        embeddings: np.ndarray,
+        min_k: int,
+        max_k: int
+    ) -> Tuple[int, np.ndarray]:
+        """
+        Cluster a very large keyword set with mini-batch k-means
+
+        k is selected on a random sample, then MiniBatchKMeans is seeded with
+        the sample's centers and trained over shuffled chunks, so no step
+        touches more than one chunk of embeddings at a time.
+
+        Returns:
+            Tuple of (number of clusters, label per keyword)
+        """
+        n_samples = len(embeddings)
+        rng = np.random.RandomState(42)
+
+        sample_idx = rng.choice(n_samples, min(n_samples, LARGE_SELECTION_SAMPLE), replace=False)
+        seed_model = self._select_model(embeddings[sample_idx], min_k=min_k, max_k=max_k)
+        k = seed_model.n_clusters
+        self.logger.debug(f" Selected k={k} on a {len(sample_idx)} keyword sample")
+
+        model = MiniBatchKMeans(
+            n_clusters=k,
+            init=seed_model.cluster_centers_,
+            n_init=1,
+            batch_size=STREAMING_CHUNK_SIZE,
+            random_state=42
+        )
+        for _ in range(STREAMING_EPOCHS):
+            order = rng.permutation(n_samples)
+            for start in range(0, n_samples, STREAMING_CHUNK_SIZE):
+                model.partial_fit(embeddings[order[start:start + STREAMING_CHUNK_SIZE]])
+
+        labels = np.empty(n_samples, dtype=np.int32)
+        for start in range(0, n_samples, STREAMING_CHUNK_SIZE):
+            labels[start:start + STREAMING_CHUNK_SIZE] = model.predict(
+                embeddings[start:start + STREAMING_CHUNK_SIZE]
+            )
+
+        return k, labels
+
+    @staticmethod
+    def _grow_centers(embeddings: np.ndarray, model: KMeans) -> Optional[np.ndarray]:
+        """
+        Previous centers with the highest-SSE cluster split in two
+
+        Only clusters with at least two distinct points can be split; returns
+        None when there is none (e.g. every cluster holds duplicates of one
+        keyword embedding).
+        """
+        labels = model.labels_
+        distances = model.transform(embeddings)[np.arange(len(embeddings)), labels]
+        sse = np.bincount(labels, weights=distances ** 2, minlength=model.n_clusters)
+
+        for worst in np.argsort(-sse, kind='stable'):
+            members = embeddings[labels == worst]
+            if len(np.unique(members, axis=0)) >= 2:
+                break
+        else:
+            return None
+
+        split = KMeans(n_clusters=2, random_state=42, n_init=1).fit(members)
+        return np.vstack([
+            np.delete(model.cluster_centers_, worst, axis=0),
+            split.cluster_centers_
+        ]).astype(embeddings.dtype)
+
     def _generate_cluster_names_batch(self, clusters: List[Dict]) -> List[str]:
         """
         Generate names for all clusters in one batch LLM call
         """
         try:
-            # Use Groq directly to avoid circular imports
-            from groq import Groq
-            from app.config import Config
-
-            groq_client = Groq(api_key=Config.GROQ_API_KEY)
+            # Imported here to avoid circular imports
+            from app.services.ai.llm_client import LLMClient
+            from app.utils.json_repair import parse_llm_json
 
             # Build the prompt with all cluster information
             cluster_info = []
@@ -137,8 +242,15 @@ Return your response as a JSON array of strings, like this:
 
 Make sure each name is specific and reflects the unique aspect of that cluster."""
 
+            def parse(response_text: str) -> List[str]:
+                cluster_names = parse_llm_json(response_text, expect=list)
+                if len(cluster_names) != len(clusters):
+                    raise ValueError(f"Expected {len(clusters)} cluster names, got {len(cluster_names)}")
+                return cluster_names
+
             # Use the LLM to generate cluster names
-            response = groq_client.chat.completions.create(
+            llm = self.llm or LLMClient()
+            return llm.chat(
                 messages=[
                     {
                         "role": "system",
@@ -149,37 +261,15 @@ Make sure each name is specific and reflects the unique aspect of that cluster."
                         "content": prompt
                     }
                 ],
-                model="llama-3.1-8b-instant",
                 temperature=0.3,
-                max_tokens=200  # Enough for array of names
+                max_tokens=200,  # Enough for array of names
+                parse=parse,
+                label='cluster_names'
             )
 
-            import json
-            response_text = response.choices[0].message.content.strip()
-
-            # Try to parse as JSON array
-            try:
-                cluster_names = json.loads(response_text)
-                if isinstance(cluster_names, list) and len(cluster_names) == len(clusters):
-                    return cluster_names
-            except json.JSONDecodeError:
-                # Try to extract array from text if JSON parsing fails
-                import re
-                array_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-                if array_match:
-                    try:
-                        cluster_names = json.loads(array_match.group())
-                        if isinstance(cluster_names, list) and len(cluster_names) == len(clusters):
-                            return cluster_names
-                    except:
-                        pass
-
-            # If parsing fails, generate fallback names
-            self.logger.warning("Failed to parse LLM response for cluster names, using fallbacks")
-            return self._generate_fallback_cluster_names(clusters)
-
         except Exception as e:
-            self.logger.warning(f"Failed to generate batch cluster names: {e}")
+            # If the call or parsing fails, generate fallback names
+            self.logger.warning(f"Failed to generate batch cluster names, using fallbacks: {e}")
             return self._generate_fallback_cluster_names(clusters)
 
     def _generate_fallback_cluster_names(self, clusters: List[Dict]) -> List[str]:
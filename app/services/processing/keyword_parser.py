@@ -1,6 +1,7 @@
 import pandas as pd
 from typing import List
 import io
+from app.config import Config
 
 class KeywordParser:
     """Parse keywords from various input formats"""
@@ -34,10 +35,10 @@ class KeywordParser:
             # Remove NaN values
             keywords = [str(k) for k in keywords if pd.notna(k)]
             
-            return keywords
-            
         except Exception as e:
             raise ValueError(f"Failed to parse CSV: {str(e)}")
+        
+        return KeywordParser.check_limit(keywords)
     
     @staticmethod
     def parse_text(text: str) -> List[str]:
@@ -60,7 +61,7 @@ class KeywordParser:
         # Clean up
         keywords = [k.strip() for k in keywords if k.strip()]
         
-        return keywords
+        return KeywordParser.check_limit(keywords)
     
     @staticmethod
     def parse_csv_from_url(url: str, token: str) -> List[str]:
@@ -91,4 +92,19 @@ class KeywordParser:
         
         keywords = [str(k) for k in keywords if pd.notna(k)]
         
+        return KeywordParser.check_limit(keywords)
+    
+    @staticmethod
+    def check_limit(keywords: List[str]) -> List[str]:
+        """
+        Reject a keyword list longer than MAX_KEYWORDS
+        
+        Raises:
+            ValueError: If there are too many keywords for one batch
+        """
+        if len(keywords) > Config.MAX_KEYWORDS:
+            raise ValueError(
+                f"Found {len(keywords):,} keywords, but a batch can have at most {Config.MAX_KEYWORDS:,}. "
+                f"Please split the list into smaller batches."
+            )
         return keywords
\ No newline at end of file
@@ -1,20 +1,29 @@
 # app/services/pipeline.py
-import threading
 import os
 import logging
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
+from app.config import Config
 from app.services.processing.keyword_cleaner import KeywordCleaner
 from app.services.ai.embedding_generator import EmbeddingGenerator
 from app.services.processing.keyword_clusterer import KeywordClusterer
 from app.services.external.web_search import WebSearchService
 from app.services.processing.content_scraper import ContentScraper
+from app.services.ai.llm_client import LLMClient, TokenUsage
 from app.services.ai.outline_generator import OutlineGenerator
 from app.services.ai.idea_generator import IdeaGenerator
+from app.services.data.cache import CacheService
 from app.services.data.database import DatabaseService
+from app.services.data.job_queue import enqueue_job, update_job
 from app.services.processing.report_generator import ReportGenerator
 from app.services.external.email_service import EmailService
+from app.utils.profiler import Profiler
+from app.utils.progress_reporter import ProgressReporter
 from app.utils.slack_formatters import SlackFormatter
 
+MAX_PROGRESS_LINES = 20  # steps shown in the status message
+
 class ProcessingPipeline:
     """Orchestrate the complete keyword processing workflow"""
 
@@ -25,10 +34,23 @@ class ProcessingPipeline:
         self.db = DatabaseService()
         self.formatter = SlackFormatter()
         # Ensure user exists in database and get UUID
-        user = self.db.get_or_create_user(user_id)
-        self.user_id = user['id']
+        self.user_id = self.db.get_user_id(user_id)
         # Initialize clusters count for error handling
         self.clusters_count = 0
+        # Every LLM call of the run shares one client and usage tally
+        self.token_usage = TokenUsage()
+        self.llm = None
+        # Stage timings of the run, stored with the batch as its performance profile
+        self.profiler = Profiler()
+        # Queue job being run, when started by the worker pool
+        self.job = None
+        # Step and cluster updates go to one status message, edited in place
+        self.progress = ProgressReporter(slack_client, channel_id)
+        self.progress_lines: List[str] = []
+        self.cluster_progress: Dict[int, str] = {}  # running cluster -> its status line
+        self.clusters_done = 0
+        self.clusters_total = 0
+        self._progress_lock = threading.Lock()
 
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -40,56 +62,75 @@ class ProcessingPipeline:
         self.logger.addHandler(console_handler)
 
     def start_from_keywords(self, keywords: List[str], source: str = 'text'):
-        """Start processing in background thread"""
-        thread = threading.Thread(
-            target=self._process_keywords,
-            args=(keywords, source)
-        )
-        thread.daemon = True
-        thread.start()
-
-    def _process_keywords(self, raw_keywords: List[str], source: str):
-        """Main processing pipeline"""
-        batch_id = None
-
-        try:
-            self.logger.info(" STARTING CONTENT CREATION PIPELINE")
-            self.logger.info(f" Received {len(raw_keywords)} raw keywords from {source}")
-
-            # Step 1: Clean keywords
-            self.logger.info(" STEP 1: Keyword Cleaning")
-            self._send_progress(" Cleaning keywords...")
-            cleaner = KeywordCleaner()
-            result = cleaner.clean_keywords(raw_keywords)
-            cleaned_keywords = result['keywords']
-
-            self.logger.info(f" Keyword cleaning complete: {result['original_count']} → {result['cleaned_count']} unique keywords")
-            self.logger.info(f" Cleaned keywords: {cleaned_keywords[:5]}{'...' if len(cleaned_keywords) > 5 else ''}")
-            self._send_progress(
-                f"✓ Cleaned: {result['original_count']} → {result['cleaned_count']} unique keywords"
+        """Queue the keywords for processing by the job worker pool"""
+        job = enqueue_job('process_keywords', self.slack_user_id, self.channel_id, keywords=keywords, source=source)
+        self._notify_queued(job)
+
+    def resume_batch(self, batch: Dict):
+        """Queue a failed batch to continue from its checkpoints"""
+        job = enqueue_job('process_keywords', self.slack_user_id, self.channel_id, batch_id=batch['id'])
+        self._notify_queued(job)
+
+    @staticmethod
+    def run_job(client, job: Dict):
+        """
+        Job handler for 'process_keywords': runs the pipeline in the worker thread
+
+        Once the batch exists its id is stored on the job, so a job recovered
+        after a restart resumes that batch instead of starting a new one.
+        """
+        pipeline = ProcessingPipeline(client, job['channel_id'], job['user_id'])
+        pipeline.job = job
+
+        if not job.get('batch_id'):
+            pipeline._process_keywords(job['keywords'], job.get('source', 'text'))
+            return
+
+        batch = pipeline.db.get_batch(job['batch_id'], full=True)
+        if not batch:
+            raise ValueError(f"Batch {job['batch_id']} not found")
+        if batch.get('status') != 'completed':
+            pipeline._process_keywords(batch.get('raw_keywords') or [], batch.get('source_type') or 'text', batch)
+
+    def _notify_queued(self, job: Dict):
+        """Tell the user when their job has to wait behind others"""
+        if job.get('ahead'):
+            self.client.chat_postMessage(
+                channel=self.channel_id,
+                text=f"⏳ {job['ahead']} job(s) are ahead of yours in the queue. I'll start as soon as a worker is free."
             )
 
-            # Save batch to database
-            batch_data = self.db.save_batch(
-                self.user_id,
-                raw_keywords,
-                cleaned_keywords,
-                source
-            )
-            batch_id = batch_data['id']
+    def _process_keywords(self, raw_keywords: List[str], source: str, resume_from: Dict = None):
+        """
+        Main processing pipeline
 
-            # Step 2: Generate embeddings
-            self.logger.info(" STEP 2: Embedding Generation")
-            self._send_progress(" Analyzing keyword relationships...")
-            embedding_gen = EmbeddingGenerator()
-            embeddings = embedding_gen.generate_embeddings(cleaned_keywords)
-            self.logger.info(f" Generated embeddings for {len(cleaned_keywords)} keywords (shape: {embeddings.shape})")
+        Each completed step is checkpointed; with resume_from (a batch row)
+        the steps that already have a checkpoint are skipped.
+        """
+        batch_id = None
+        checkpoints = {}
 
-            # Step 3: Cluster keywords
-            self.logger.info(" STEP 3: Keyword Clustering")
-            self._send_progress(" Grouping keywords into clusters...")
-            clusterer = KeywordClusterer()
-            clusters = clusterer.cluster_keywords(cleaned_keywords, embeddings)
+        try:
+            if resume_from:
+                batch_data = resume_from
+                batch_id = batch_data['id']
+                cleaned_keywords = batch_data.get('cleaned_keywords') or []
+                checkpoints = self.db.get_checkpoints(batch_id)
+                self._update_status(batch_id, 'processing')
+                self.logger.info(f" RESUMING BATCH {batch_id} ({len(checkpoints)} checkpoints)")
+                self._send_progress(f" Resuming batch `{batch_id[:8]}` from its last completed step...")
+            else:
+                batch_data, cleaned_keywords = self._clean_and_save(raw_keywords, source)
+                batch_id = batch_data['id']
+                if self.job:
+                    update_job(self.job, batch_id=batch_id)
+
+            clusters = checkpoints.get('clusters')
+            if clusters:
+                self.logger.info(f" STEPS 2-3: Reusing {len(clusters)} checkpointed clusters")
+            else:
+                clusters = self._cluster(cleaned_keywords)
+                self._save_checkpoint(batch_id, 'clusters', clusters)
             self.clusters_count = len(clusters)  # Store count for error handling
             self.logger.info(f" Created {len(clusters)} keyword clusters")
             for i, cluster in enumerate(clusters, 1):
@@ -104,56 +145,9 @@ class ProcessingPipeline:
                 blocks=cluster_blocks
             )
 
-            # Step 4: Process each cluster
-            search_service = WebSearchService()
-            scraper = ContentScraper()
-            outline_gen = OutlineGenerator()
-            idea_gen = IdeaGenerator()
-
             # Step 4: Process each cluster
             self.logger.info(" STEP 4: Web Research & Content Generation")
-            for idx, cluster in enumerate(clusters, 1):
-                cluster_name = cluster['cluster_name']
-                self.logger.info(f" Processing cluster {idx}/{len(clusters)}: '{cluster_name}'")
-                self._send_progress(f" Processing cluster {idx}/{len(clusters)}: {cluster_name}")
-
-                # Search top results
-                main_keyword = cluster['keywords'][0] if cluster['keywords'] else cluster_name.split()[0]
-                self.logger.info(f" Searching for '{main_keyword}' using SerpAPI")
-                search_results = search_service.search_single(main_keyword, count=5)
-                self.logger.info(f" Found {len(search_results)} search results")
-
-                # Scrape content
-                urls = [r['url'] for r in search_results[:3]]
-                self.logger.info(f" Scraping {len(urls)} top URLs: {urls}")
-                scraped_data = scraper.scrape_urls(urls)
-                successful_scrapes = sum(1 for r in scraped_data if r.get('success'))
-                self.logger.info(f" Successfully scraped {successful_scrapes}/{len(urls)} pages")
-
-                # Generate outline
-                self.logger.info("  Generating content outline using LLM")
-                outline = outline_gen.generate_outline(cluster, scraped_data)
-                cluster['outline'] = outline
-                self.logger.info(f"   Generated outline with {len(outline.get('sections', []))} sections")
-
-                # Generate post idea
-                self.logger.info("   Generating post idea using LLM")
-                post_idea = idea_gen.generate_idea(cluster, outline)
-                cluster['post_idea'] = post_idea
-                self.logger.info(f"   Generated post idea: '{post_idea.get('title', 'N/A')}'")
-
-                # Save cluster to database
-                self.db.save_cluster(batch_id, cluster, post_idea, outline)
-                self.logger.info("   Saved cluster data to database")
-
-                # Send detailed cluster info
-                detail_blocks = self.formatter.format_cluster_detail(
-                    cluster, post_idea, outline
-                )
-                self.client.chat_postMessage(
-                    channel=self.channel_id,
-                    blocks=detail_blocks
-                )
+            self._process_clusters(batch_id, clusters, checkpoints)
 
             # Step 5: Generate report
             self.logger.info(" STEP 5: Report Generation")
@@ -164,18 +158,21 @@ class ProcessingPipeline:
                 self.logger.info(f"DEBUG: Clusters length: {len(clusters)}")
             else:
                 self.logger.error("DEBUG: Clusters variable not found in locals")
-            report_gen = ReportGenerator()
-            pdf_path = report_gen.generate_report(
-                batch_data,
-                cleaned_keywords,
-                clusters
-            )
+            with self.profiler.span('report.pdf', items=len(clusters)) as span:
+                report_gen = ReportGenerator()
+                pdf_path = report_gen.generate_report(
+                    batch_data,
+                    cleaned_keywords,
+                    clusters
+                )
+                span['bytes'] = os.path.getsize(pdf_path)
             self.logger.info(f" Generated PDF report: {pdf_path}")
 
             # Upload report to Slack
             try:
                 # First upload the file
-                with open(pdf_path, 'rb') as f:
+                with open(pdf_path, 'rb') as f, \
+                        self.profiler.span('report.upload', bytes=os.path.getsize(pdf_path)):
                     upload_response = self.client.files_upload_v2(
                         channel=self.channel_id,
                         file=f,
@@ -235,7 +232,11 @@ class ProcessingPipeline:
             )
 
             # Update batch status
-            self.db.update_batch_status(batch_id, 'completed')
+            self._update_status(batch_id, 'completed')
+            self._save_token_usage(batch_id)
+            self._save_profile(batch_id)
+            self._delete_checkpoints(batch_id)
+            self._send_progress(" Processing complete", emoji="✅", final=True)
             self.logger.info(" Pipeline completed successfully")
 
             # Optional: Send email if user wants it (before file deletion)
@@ -266,11 +267,15 @@ class ProcessingPipeline:
             error_msg = str(e)
             self.logger.error(f" PIPELINE ERROR: {error_msg}")
             print(f"Pipeline error: {error_msg}")
+            self._send_progress(" Processing stopped", emoji="❌", final=True)
 
             # Send error to user
+            suggestion = "Please try again or contact support if the issue persists"
+            if batch_id:
+                suggestion = f"Run `/resume {batch_id[:8]}` to continue from the last completed step, or contact support if the issue persists"
             error_blocks = self.formatter.format_error(
                 "An error occurred during processing",
-                "Please try again or contact support if the issue persists",
+                suggestion,
                 batch_id
             )
             self.client.chat_postMessage(
@@ -280,12 +285,293 @@ class ProcessingPipeline:
 
             # Update batch status
             if batch_id:
-                self.db.update_batch_status(batch_id, 'failed', error_msg)
-
-    def _send_progress(self, message: str):
-        """Send progress update to Slack"""
-        formatted = self.formatter.format_progress(message)
-        self.client.chat_postMessage(
-            channel=self.channel_id,
-            text=formatted
-        )
\ No newline at end of file
+                self._update_status(batch_id, 'failed', error_msg)
+                self._save_token_usage(batch_id)
+                self._save_profile(batch_id)
+
+    def _clean_and_save(self, raw_keywords: List[str], source: str) -> Tuple[Dict, List[str]]:
+        """Step 1: clean keywords and create the batch; returns (batch row, cleaned keywords)"""
+        self.logger.info(" STARTING CONTENT CREATION PIPELINE")
+        self.logger.info(f" Received {len(raw_keywords)} raw keywords from {source}")
+
+        self.logger.info(" STEP 1: Keyword Cleaning")
+        self._send_progress(" Cleaning keywords...")
+        with self.profiler.span('clean', items=len(raw_keywords)):
+            cleaner = KeywordCleaner()
+            result = cleaner.clean_keywords(raw_keywords)
+        cleaned_keywords = result['keywords']
+
+        self.logger.info(f" Keyword cleaning complete: {result['original_count']} → {result['cleaned_count']} unique keywords")
+        self.logger.info(f" Cleaned keywords: {cleaned_keywords[:5]}{'...' if len(cleaned_keywords) > 5 else ''}")
+        self._send_progress(
+            f"✓ Cleaned: {result['original_count']} → {result['cleaned_count']} unique keywords"
+        )
+
+        # Save batch to database; the batch row is the checkpoint for cleaned keywords
+        with self.profiler.span('db.save_batch'):
+            batch_data = self.db.save_batch(
+                self.user_id,
+                raw_keywords,
+                cleaned_keywords,
+                source
+            )
+        CacheService().clear_history(self.user_id)
+        return batch_data, cleaned_keywords
+
+    def _cluster(self, cleaned_keywords: List[str]) -> List[Dict]:
+        """Steps 2-3: embed and cluster keywords (embeddings are cached per keyword in Redis)"""
+        self.logger.info(" STEP 2: Embedding Generation")
+        self._send_progress(" Analyzing keyword relationships...")
+        with self.profiler.span('embed', items=len(cleaned_keywords)):
+            embedding_gen = EmbeddingGenerator()
+            embeddings = embedding_gen.generate_embeddings(cleaned_keywords)
+        self.logger.info(f" Generated embeddings for {len(cleaned_keywords)} keywords (shape: {embeddings.shape})")
+
+        self.logger.info(" STEP 3: Keyword Clustering")
+        self._send_progress(" Grouping keywords into clusters...")
+        self.llm = LLMClient(usage=self.token_usage, profiler=self.profiler)
+        clusterer = KeywordClusterer(self.llm)
+        with self.profiler.span('cluster', items=len(cleaned_keywords)):
+            return clusterer.cluster_keywords(cleaned_keywords, embeddings)
+
+    def _process_clusters(self, batch_id: str, clusters: List[Dict], checkpoints: Dict = None):
+        """
+        Research and generate content for all clusters with bounded concurrency
+
+        Each cluster's outline and idea are checkpointed as soon as they are
+        generated. Clusters with a checkpoint from an earlier run are not
+        generated again. The results are saved in one bulk upsert at the end
+        (or, when a cluster fails, the ones finished before it).
+        """
+        checkpoints = checkpoints or {}
+
+        search_service = WebSearchService()
+        scraper = ContentScraper(self.profiler)
+        # Outline and idea calls go through one Groq client and the shared budget
+        llm = self.llm or LLMClient(usage=self.token_usage, profiler=self.profiler)
+        outline_gen = OutlineGenerator(llm)
+        idea_gen = IdeaGenerator(llm)
+
+        total = len(clusters)
+        workers = max(1, min(Config.CLUSTER_WORKERS, total))
+        self.logger.info(f" Processing {total} clusters with {workers} workers")
+
+        # Cluster progress is shown in the status message; each cluster's
+        # details are posted once, when it is done
+        with self._progress_lock:
+            self.clusters_total = total
+            self.clusters_done = sum(1 for cluster in clusters if self._cluster_step(cluster) in checkpoints)
+
+        def generate(idx: int, cluster: Dict) -> Tuple[Dict, Dict]:
+            try:
+                with self.profiler.span('cluster.process', cluster=cluster['cluster_number']):
+                    outline, post_idea = self._process_single_cluster(
+                        idx, total, cluster,
+                        search_service, scraper, outline_gen, idea_gen
+                    )
+            except Exception:
+                self._set_cluster_progress(idx, f"❌ Cluster {idx}/{total} failed: {cluster['cluster_name']}")
+                raise
+            self._set_cluster_progress(idx, None)
+            # Checkpoint right away: a later cluster failing must not lose this one
+            self._save_checkpoint(
+                batch_id, self._cluster_step(cluster), {'outline': outline, 'post_idea': post_idea}
+            )
+            return outline, post_idea
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cluster') as executor:
+                futures = [
+                    None if self._cluster_step(cluster) in checkpoints
+                    else executor.submit(generate, idx, cluster)
+                    for idx, cluster in enumerate(clusters, 1)
+                ]
+                reused = futures.count(None)
+                if reused:
+                    self.logger.info(f" Reusing {reused} checkpointed clusters")
+
+                # Collect results in cluster order so Slack messages stay ordered
+                results = []
+                try:
+                    for cluster, future in zip(clusters, futures):
+                        if future is None:
+                            checkpoint = checkpoints[self._cluster_step(cluster)]
+                            outline, post_idea = checkpoint['outline'], checkpoint['post_idea']
+                        else:
+                            outline, post_idea = future.result()
+                        cluster['outline'] = outline
+                        cluster['post_idea'] = post_idea
+                        results.append((cluster, post_idea, outline))
+
+                        # Send detailed cluster info
+                        detail_blocks = self.formatter.format_cluster_detail(
+                            cluster, post_idea, outline
+                        )
+                        message = ProgressReporter(self.client, self.channel_id)
+                        message.update(f"📁 {cluster['cluster_name']}", detail_blocks)
+                        message.flush()
+                except Exception:
+                    # Don't start clusters that are still queued
+                    for future in futures:
+                        if future is not None:
+                            future.cancel()
+                    # Finished clusters still show in /history; resuming upserts them again
+                    if results:
+                        try:
+                            self.db.save_clusters(batch_id, results)
+                        except Exception as e:
+                            self.logger.warning(f" Could not save finished clusters: {e}")
+                    raise
+        finally:
+            scraper.close()
+
+        # Upserted, so clusters saved by an earlier run are replaced, not duplicated
+        with self.profiler.span('db.save_clusters', items=len(results)):
+            self.db.save_clusters(batch_id, results)
+        self.logger.info(f"   Saved {len(results)} clusters to database")
+
+    @staticmethod
+    def _cluster_step(cluster: Dict) -> str:
+        """Checkpoint step name for a cluster's outline and post idea"""
+        return f"cluster:{cluster['cluster_number']}"
+
+    def _process_single_cluster(
+        self,
+        idx: int,
+        total: int,
+        cluster: Dict,
+        search_service: WebSearchService,
+        scraper: ContentScraper,
+        outline_gen: OutlineGenerator,
+        idea_gen: IdeaGenerator
+    ) -> Tuple[Dict, Dict]:
+        """Search, scrape and generate outline and post idea for one cluster"""
+        cluster_name = cluster['cluster_name']
+        self.logger.info(f" Processing cluster {idx}/{total}: '{cluster_name}'")
+        self._set_cluster_progress(idx, f"🔍 Researching cluster {idx}/{total}: {cluster_name}")
+
+        # Count the outline's sections in the status message while it is generated
+        on_partial = None
+        if Config.STREAM_OUTLINES:
+            on_partial = lambda partial: self._set_cluster_progress(
+                idx, f"✍️ Writing cluster {idx}/{total}: {cluster_name} ({len(partial.get('sections') or [])} sections so far)"
+            )
+
+        # Search top results
+        main_keyword = cluster['keywords'][0] if cluster['keywords'] else cluster_name.split()[0]
+        self.logger.info(f" Searching for '{main_keyword}' using SerpAPI")
+        with self.profiler.span('search', query=main_keyword) as span:
+            search_results = search_service.search_single(main_keyword, count=5)
+            span['items'] = len(search_results)
+        self.logger.info(f" Found {len(search_results)} search results")
+
+        # Scrape content
+        urls = [r['url'] for r in search_results[:3]]
+        self.logger.info(f" Scraping {len(urls)} top URLs: {urls}")
+        with self.profiler.span('scrape', items=len(urls)) as span:
+            scraped_data = scraper.scrape_urls(urls)
+            # Cache hits and 304 revalidations did not download anything
+            span['bytes'] = sum(r.get('bytes_read', 0) for r in scraped_data if not r.get('cached'))
+        successful_scrapes = sum(1 for r in scraped_data if r.get('success'))
+        self.logger.info(f" Successfully scraped {successful_scrapes}/{len(urls)} pages")
+
+        self._set_cluster_progress(idx, f"✍️ Writing cluster {idx}/{total}: {cluster_name}")
+        if Config.FUSED_GENERATION:
+            # Outline and post idea from one completion
+            self.logger.info("  Generating content outline and post idea using LLM")
+            with self.profiler.span('outline_with_idea'):
+                outline, post_idea = outline_gen.generate_outline_with_idea(cluster, scraped_data, on_partial)
+            self.logger.info(f"   Generated outline with {len(outline.get('sections', []))} sections")
+            self.logger.info(f"   Generated post idea: '{post_idea.get('title', 'N/A')}'")
+            return outline, post_idea
+
+        # Generate outline
+        self.logger.info("  Generating content outline using LLM")
+        with self.profiler.span('outline'):
+            outline = outline_gen.generate_outline(cluster, scraped_data, on_partial)
+        self.logger.info(f"   Generated outline with {len(outline.get('sections', []))} sections")
+
+        # Generate post idea
+        self.logger.info("   Generating post idea using LLM")
+        with self.profiler.span('idea'):
+            post_idea = idea_gen.generate_idea(cluster, outline)
+        self.logger.info(f"   Generated post idea: '{post_idea.get('title', 'N/A')}'")
+
+        return outline, post_idea
+
+    def _update_status(self, batch_id: str, status: str, error_message: str = None):
+        """Update the batch status and drop the user's cached /history"""
+        self.db.update_batch_status(batch_id, status, error_message)
+        CacheService().clear_history(self.user_id)
+
+    def _save_checkpoint(self, batch_id: str, step: str, data):
+        """Checkpoint a completed step; a failed write only costs resumability"""
+        try:
+            self.db.save_checkpoint(batch_id, step, data)
+        except Exception as e:
+            self.logger.warning(f" Could not save checkpoint '{step}': {e}")
+
+    def _delete_checkpoints(self, batch_id: str):
+        """Drop a completed batch's checkpoints"""
+        try:
+            self.db.delete_checkpoints(batch_id)
+        except Exception as e:
+            self.logger.warning(f" Could not delete checkpoints: {e}")
+
+    def _save_token_usage(self, batch_id: str):
+        """Log and store the run's LLM token totals; never fails the pipeline"""
+        usage = self.token_usage.summary()
+        self.logger.info(
+            f" LLM usage: {usage['calls']} calls ({usage['cached_calls']} cached), "
+            f"{usage['prompt_tokens']} prompt + {usage['completion_tokens']} completion tokens, "
+            f"{usage['seconds']}s"
+        )
+        try:
+            self.db.update_batch_token_usage(batch_id, usage)
+        except Exception as e:
+            self.logger.warning(f" Could not save token usage: {e}")
+
+    def _save_profile(self, batch_id: str):
+        """Log the slowest stages and store the run's performance profile; never fails the pipeline"""
+        profile = self.profiler.summary()
+        slowest = ', '.join(f"{name} {seconds:.1f}s" for name, seconds in self.profiler.slowest())
+        self.logger.info(f" Profile: {profile['wall_seconds']}s wall time, slowest stages: {slowest}")
+        try:
+            self.db.update_batch_performance_profile(batch_id, profile)
+        except Exception as e:
+            self.logger.warning(f" Could not save performance profile: {e}")
+
+    def _send_progress(self, message: str, emoji: str = "⏳", final: bool = False):
+        """
+        Add a step to the run's status message
+
+        Updates within PROGRESS_UPDATE_INTERVAL are combined into one edit;
+        final sends the message now (at completion or failure).
+        """
+        with self._progress_lock:
+            self.progress_lines.append(self.formatter.format_progress(message, emoji))
+        self._update_progress()
+        if final:
+            self.progress.flush()
+
+    def _set_cluster_progress(self, idx: int, line: str = None):
+        """Show what a running cluster is doing in the status message; None marks it done"""
+        with self._progress_lock:
+            if line is None:
+                self.cluster_progress.pop(idx, None)
+                self.clusters_done += 1
+            else:
+                self.cluster_progress[idx] = line
+        self._update_progress()
+
+    def _update_progress(self):
+        """Queue an edit of the status message with the current steps and clusters"""
+        with self._progress_lock:
+            lines = self.progress_lines[-MAX_PROGRESS_LINES:]
+            if self.cluster_progress or self.clusters_done:
+                lines = lines + [self.formatter.format_progress(
+                    f" Clusters done: {self.clusters_done}/{self.clusters_total}", "📁"
+                )]
+                lines += [f"    {self.cluster_progress[idx]}" for idx in sorted(self.cluster_progress)]
+            # Under the lock, so a newer status can't be replaced by an older one
+            self.progress.update('\n'.join(lines))
\ No newline at end of file
@@ -0,0 +1,190 @@
+# app/utils/json_repair.py
+import json
+import logging
+from typing import Any, List, Tuple
+from app.utils.partial_json import PartialJSONParser
+
+logger = logging.getLogger(__name__)
+
+_decoder = json.JSONDecoder(strict=False)  # tolerate raw newlines/tabs inside strings
+MAX_START_CANDIDATES = 5  # opening brackets tried when stray text precedes the JSON
+
+
+class JSONRepairError(ValueError):
+    """LLM output could not be turned into the expected JSON value"""
+
+
+def parse_llm_json(text: str, expect: type = dict) -> Any:
+    """
+    Parse JSON from LLM output, repairing common defects
+
+    Args:
+        text: Raw completion text
+        expect: Required type of the top-level value (dict or list)
+
+    Returns:
+        The parsed value
+
+    Raises:
+        JSONRepairError: If no value of the expected type can be recovered
+    """
+    value, repairs = repair_json(text, expect)
+    if repairs:
+        logger.info(f" Repaired LLM JSON: {', '.join(repairs)}")
+    return value
+
+
+def repair_json(text: str, expect: type = dict) -> Tuple[Any, List[str]]:
+    """
+    Recover a JSON value from LLM output
+
+    Tries, in order: plain json.loads; the body of a markdown fence; the first
+    complete value after any stray text (ignoring anything after it), also
+    with trailing commas removed; and for truncated output, every member that
+    was complete before the text ended.
+
+    Args:
+        text: Raw completion text
+        expect: Required type of the top-level value (dict or list)
+
+    Returns:
+        (value, names of the repairs that were needed)
+
+    Raises:
+        JSONRepairError: If no value of the expected type can be recovered
+    """
+    if not text or not text.strip():
+        raise JSONRepairError("Empty response")
+
+    try:
+        value = json.loads(text)
+        if isinstance(value, expect):
+            return value, []
+    except json.JSONDecodeError:
+        pass
+
+    repairs = []
+    body = _strip_fences(text)
+    if body != text:
+        repairs.append('markdown fence')
+
+    opener = '[' if expect is list else '{'
+    starts = _find_all(body, opener, MAX_START_CANDIDATES)
+    if not starts:
+        raise JSONRepairError(f"No JSON {expect.__name__} found in response")
+
+    for start in starts:
+        leading = body[:start]
+
+        # First complete value; anything after it is ignored
+        value, end = _raw_decode(body, start)
+        if isinstance(value, expect):
+            return value, repairs + _stray_text(leading, body[end:])
+
+        tail = _strip_trailing_commas(body[start:])
+        fixed = ['trailing commas'] if len(tail) != len(body) - start else []
+        if fixed:
+            value, end = _raw_decode(tail, 0)
+            if isinstance(value, expect):
+                return value, repairs + fixed + _stray_text(leading, tail[end:])
+
+        # Truncated output: keep every member that was complete
+        parser = PartialJSONParser()
+        parser.feed(tail)
+        if not parser.complete:
+            value = parser.snapshot()
+            if isinstance(value, expect) and value:
+                _drop_unstarted_items(value)
+                return value, repairs + fixed + _stray_text(leading, '') + ['truncated']
+            break
+
+        # Closed but invalid (e.g. a brace in the leading text): try the next opener
+
+    raise JSONRepairError(f"Could not recover JSON {expect.__name__} from response")
+
+
+def _drop_unstarted_items(value: Any):
+    """Remove list items cut off before any of their content arrived (e.g. a bare {})"""
+    while True:
+        if isinstance(value, list):
+            if value and value[-1] in ({}, []):
+                value.pop()
+            if not value:
+                return
+            value = value[-1]
+        elif isinstance(value, dict) and value:
+            value = value[next(reversed(value))]
+        else:
+            return
+
+
+def _stray_text(leading: str, trailing: str) -> List[str]:
+    """Names of the repairs for text around the value"""
+    repairs = []
+    if leading.strip():
+        repairs.append('leading text')
+    if trailing.strip():
+        repairs.append('trailing text')
+    return repairs
+
+
+def _find_all(text: str, char: str, limit: int) -> List[int]:
+    """Offsets of the first limit occurrences of char"""
+    offsets = []
+    index = text.find(char)
+    while index >= 0 and len(offsets) < limit:
+        offsets.append(index)
+        index = text.find(char, index + 1)
+    return offsets
+
+
+def _raw_decode(text: str, start: int) -> Tuple[Any, int]:
+    """Decode the value starting at start; (None, start) if it is invalid"""
+    try:
+        return _decoder.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None, start
+
+
+def _strip_fences(text: str) -> str:
+    """Body of the first ``` fenced block (also if the closing fence is missing)"""
+    fence = text.find('```')
+    if fence < 0:
+        return text
+    body_start = text.find('\n', fence)
+    if body_start < 0:
+        return text[fence + 3:]
+    closing = text.find('```', body_start)
+    return text[body_start + 1:closing if closing >= 0 else len(text)]
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Remove commas directly before a closing } or ] (outside strings)"""
+    out = []
+    in_string = False
+    escape = False
+    pending_comma = None  # index in out of a comma that may be trailing
+
+    for c in text:
+        if in_string:
+            out.append(c)
+            if escape:
+                escape = False
+            elif c == '\\':
+                escape = True
+            elif c == '"':
+                in_string = False
+            continue
+
+        if c in '}]' and pending_comma is not None:
+            del out[pending_comma]
+        if c not in ' \t\r\n':
+            pending_comma = None
+
+        if c == '"':
+            in_string = True
+        elif c == ',':
+            pending_comma = len(out)
+        out.append(c)
+
+    return ''.join(out)
@@ -0,0 +1,124 @@
+# app/utils/partial_json.py
+import json
+from typing import Any, List, Optional, Tuple
+
+LITERAL_END = ',}] \t\r\n'
+
+
+class PartialJSONParser:
+    """
+    Parse a JSON document while it is still being streamed
+
+    Text is scanned once as it arrives. The parser remembers the last point
+    where every open value was complete, so snapshot() can close the open
+    objects and arrays there and return what has been generated so far.
+    Strings and numbers only appear once they are complete.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._closers: List[str] = []  # '}' or ']' for each open container
+        self._key_next: List[bool] = []  # per container: next string is an object key
+        self._in_string = False
+        self._string_is_key = False
+        self._escape = False
+        self._literal = False
+        self._cut: Optional[Tuple[int, str]] = None  # (end offset, closing suffix)
+        self._complete_end: Optional[int] = None
+
+    @property
+    def complete(self) -> bool:
+        """True once the top-level value has been closed"""
+        return self._complete_end is not None
+
+    def feed(self, chunk: str):
+        """Add streamed text"""
+        self.text += chunk
+        text = self.text
+
+        while self._pos < len(text) and self._complete_end is None:
+            i = self._pos
+            c = text[i]
+            self._pos += 1
+
+            if self._start is None:
+                if c in '{[':
+                    self._start = i
+                    self._open(c, i)
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if not self._string_is_key:
+                        self._value_done(i + 1)
+                continue
+
+            if self._literal:
+                if c not in LITERAL_END:
+                    continue
+                self._literal = False
+                self._value_done(i)
+
+            if c == '"':
+                self._in_string = True
+                self._string_is_key = self._closers[-1] == '}' and self._key_next[-1]
+                if self._string_is_key:
+                    self._key_next[-1] = False
+            elif c in '{[':
+                self._open(c, i)
+            elif c in '}]':
+                self._closers.pop()
+                self._key_next.pop()
+                self._value_done(i + 1)
+            elif c == ',':
+                if self._closers[-1] == '}':
+                    self._key_next[-1] = True
+            elif c not in ': \t\r\n':
+                self._literal = True
+
+    def snapshot(self) -> Optional[Any]:
+        """
+        Value generated so far
+
+        Returns:
+            The complete value once closed, otherwise the largest prefix made
+            valid by closing its containers (None if nothing is usable yet)
+        """
+        if self._complete_end is not None:
+            return self._loads(self.text[self._start:self._complete_end])
+        if self._cut is None:
+            return None
+        end, suffix = self._cut
+        return self._loads(self.text[self._start:end] + suffix)
+
+    def _open(self, c: str, i: int):
+        self._closers.append('}' if c == '{' else ']')
+        self._key_next.append(c == '{')
+        self._cut = (i + 1, ''.join(reversed(self._closers)))
+
+    def _value_done(self, end: int):
+        if not self._closers:
+            self._complete_end = end
+        else:
+            self._cut = (end, ''.join(reversed(self._closers)))
+
+    @staticmethod
+    def _loads(text: str) -> Optional[Any]:
+        try:
+            return json.loads(text, strict=False)
+        except json.JSONDecodeError:
+            return None
+
+
+def parse_partial_json(text: str) -> Optional[Any]:
+    """Parse the usable prefix of a possibly truncated JSON document"""
+    parser = PartialJSONParser()
+    parser.feed(text)
+    return parser.snapshot()
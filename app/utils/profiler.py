@@ -0,0 +1,91 @@
+# app/utils/profiler.py
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+MAX_SPANS = 500  # individual spans kept in a profile; stage totals count all of them
+COUNTERS = ('bytes', 'prompt_tokens', 'completion_tokens', 'items')  # summed per stage
+
+
+class Profiler:
+    """
+    Thread-safe timing spans for a unit of work, e.g. one batch
+
+    A span is a named, timed section with optional attributes. The numeric
+    attributes in COUNTERS (bytes, tokens, items) are summed per span name,
+    so the summary shows where the time went and how much work it covered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._spans: List[Dict] = []
+        self._stages: Dict[str, Dict] = {}
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """
+        Time the enclosed block
+
+        Yields the attribute dict, so sizes known only at the end can be
+        added inside the block. A span that raises is recorded with error set.
+
+        Example:
+            with profiler.span('scrape', url=url) as span:
+                span['bytes'] = len(body)
+        """
+        start = time.time()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs['error'] = type(e).__name__
+            raise
+        finally:
+            self._add(name, start, time.time() - start, attrs)
+
+    def record(self, name: str, seconds: float, **attrs):
+        """Add a span that was timed elsewhere and just ended"""
+        now = time.time()
+        self._add(name, now - seconds, seconds, attrs)
+
+    def _add(self, name: str, start: float, seconds: float, attrs: Dict):
+        with self._lock:
+            stage = self._stages.setdefault(name, {'count': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            stage['count'] += 1
+            stage['errors'] += int('error' in attrs)
+            stage['seconds'] += seconds
+            stage['max_seconds'] = max(stage['max_seconds'], seconds)
+            for key in COUNTERS:
+                if isinstance(attrs.get(key), (int, float)):
+                    stage[key] = stage.get(key, 0) + attrs[key]
+
+            if len(self._spans) < MAX_SPANS:
+                self._spans.append(dict(
+                    attrs,
+                    name=name,
+                    start=round(start - self._started, 3),
+                    seconds=round(seconds, 3),
+                    thread=threading.current_thread().name
+                ))
+
+    def summary(self) -> Dict:
+        """Wall time, totals per span name and the spans themselves, JSON serializable"""
+        with self._lock:
+            stages = {name: dict(stage, seconds=round(stage['seconds'], 3), max_seconds=round(stage['max_seconds'], 3))
+                      for name, stage in self._stages.items()}
+            spans = list(self._spans)
+            dropped = sum(stage['count'] for stage in self._stages.values()) - len(spans)
+
+        return {
+            'wall_seconds': round(time.time() - self._started, 3),
+            'stages': stages,
+            'spans': spans,
+            'dropped_spans': dropped
+        }
+
+    def slowest(self, count: int = 5) -> List[tuple]:
+        """(name, total seconds) of the stages that took longest"""
+        with self._lock:
+            totals = [(name, stage['seconds']) for name, stage in self._stages.items()]
+        return sorted(totals, key=lambda item: item[1], reverse=True)[:count]
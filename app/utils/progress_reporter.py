@@ -0,0 +1,186 @@
+# app/utils/progress_reporter.py
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF = 60.0  # seconds, when Slack sends no Retry-After
+FLUSH_ATTEMPTS = 3  # rate-limited retries before a final update is dropped
+
+# Per-channel rate limit state shared by every message: channel -> (resume at, strikes)
+_backoff: Dict[str, tuple] = {}
+_backoff_lock = threading.Lock()
+
+
+def rate_limit_delay(error: Exception) -> Optional[float]:
+    """Seconds Slack asked to wait if error is a rate limit response, otherwise None"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    try:
+        code = response.get('error')
+    except Exception:
+        code = None
+    if getattr(response, 'status_code', None) != 429 and code != 'ratelimited':
+        return None
+
+    headers = getattr(response, 'headers', None) or {}
+    retry_after = headers.get('Retry-After') or headers.get('retry-after')
+    try:
+        return max(1.0, float(retry_after))
+    except (TypeError, ValueError):
+        return 0.0  # no hint: back off exponentially
+
+
+def note_rate_limited(channel_id: str, retry_after: float) -> float:
+    """Pause updates to a channel; returns the pause in seconds"""
+    with _backoff_lock:
+        _, strikes = _backoff.get(channel_id, (0.0, 0))
+        delay = retry_after or min(MAX_BACKOFF, 2.0 ** strikes)
+        _backoff[channel_id] = (time.time() + delay, strikes + 1)
+    logger.warning(f" Slack rate limited channel {channel_id}, pausing updates for {delay:.0f}s")
+    return delay
+
+
+def backoff_remaining(channel_id: str) -> float:
+    """Seconds until the channel may be updated again"""
+    with _backoff_lock:
+        until, _ = _backoff.get(channel_id, (0.0, 0))
+    return max(0.0, until - time.time())
+
+
+def _note_success(channel_id: str):
+    with _backoff_lock:
+        if channel_id in _backoff and _backoff[channel_id][0] <= time.time():
+            del _backoff[channel_id]
+
+
+class ProgressReporter:
+    """
+    A Slack message that is posted once and then edited in place
+
+    update() only records the latest content. It is sent right away if
+    nothing was sent for the last interval seconds, otherwise once the
+    interval has passed, so a burst of updates costs one chat_update. When
+    Slack answers ratelimited, every message in the channel waits for its
+    Retry-After (or an exponential backoff).
+    """
+
+    def __init__(self, client, channel_id: str, interval: float = None):
+        """
+        Args:
+            client: Slack client
+            channel_id: Channel to post in
+            interval: Minimum seconds between edits (default PROGRESS_UPDATE_INTERVAL)
+        """
+        self.client = client
+        self.channel_id = channel_id
+        self.interval = Config.PROGRESS_UPDATE_INTERVAL if interval is None else interval
+        self.ts = None
+        self.api_calls = 0
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._pending = None  # (text, blocks) not sent yet
+        self._last_sent = 0.0
+        self._timer = None
+
+    def update(self, text: str, blocks: List[Dict] = None):
+        """Replace the message content (sent now or coalesced with later updates)"""
+        with self._lock:
+            self._pending = (text, blocks)
+            if self._timer is not None:
+                return  # the scheduled send will pick this up
+            delay = self._delay()
+            if delay > 0:
+                self._timer = threading.Timer(delay, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        if not self._send():
+            self._schedule(backoff_remaining(self.channel_id))
+
+    def flush(self, wait: bool = True):
+        """
+        Send pending content now
+
+        Args:
+            wait: Sleep through a rate limit pause instead of leaving the
+                content for the timer (use for final results)
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        for _ in range(FLUSH_ATTEMPTS):
+            pause = backoff_remaining(self.channel_id)
+            if pause > 0:
+                if not wait:
+                    self._schedule(pause)
+                    return
+                time.sleep(pause)
+            if self._send():
+                return
+        logger.warning(f" Dropped a Slack update in {self.channel_id} after {FLUSH_ATTEMPTS} rate limited attempts")
+
+    def _delay(self) -> float:
+        since_last = time.time() - self._last_sent
+        return max(self.interval - since_last, backoff_remaining(self.channel_id), 0.0)
+
+    def _schedule(self, delay: float):
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(delay, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        if not self._send():
+            pause = backoff_remaining(self.channel_id)
+            if pause > 0:
+                self._schedule(pause)
+
+    def _send(self) -> bool:
+        """Post or edit the message with the pending content; False if rate limited"""
+        with self._send_lock:
+            with self._lock:
+                if self._pending is None:
+                    return True
+                text, blocks = self._pending
+                self._pending = None
+
+            kwargs = {'channel': self.channel_id, 'text': text}
+            if blocks is not None:
+                kwargs['blocks'] = blocks
+
+            for _ in range(2):
+                try:
+                    self.api_calls += 1
+                    if self.ts:
+                        self.client.chat_update(ts=self.ts, **kwargs)
+                    else:
+                        response = self.client.chat_postMessage(**kwargs)
+                        self.ts = response.get('ts') if response else None
+                    self._last_sent = time.time()
+                    _note_success(self.channel_id)
+                    return True
+                except Exception as e:
+                    retry_after = rate_limit_delay(e)
+                    if retry_after is not None:
+                        with self._lock:
+                            if self._pending is None:  # newer content wins
+                                self._pending = (text, blocks)
+                        note_rate_limited(self.channel_id, retry_after)
+                        return False
+                    if not self.ts:
+                        logger.warning(f" Could not post Slack message: {e}")
+                        return True
+                    # The message can't be edited (e.g. deleted): post a new one
+                    logger.warning(f" Could not update Slack message {self.ts}, posting a new one: {e}")
+                    self.ts = None
+            return True
@@ -0,0 +1,55 @@
+# app/utils/single_flight.py
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    """An in-flight call that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Run func for key, or wait for the identical call already in progress
+
+        Args:
+            key: Identity of the call
+            func: Zero-argument callable that produces the result
+
+        Returns:
+            The result of the single execution (exceptions are shared too)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
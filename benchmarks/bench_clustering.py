@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark KeywordClusterer model selection against the previous k-sweep
+
+Compares the old approach (full KMeans with n_init=10 for every k, full
+silhouette score per fit, then a final refit) with
+KeywordClusterer._select_model on synthetic 384-dimensional embeddings. The
+mini-batch mode used above LARGE_BATCH_THRESHOLD is timed alongside, with
+its peak traced memory.
+
+Usage:
+    python benchmarks/bench_clustering.py [--sizes 1000,10000,50000,200000] [--max-baseline 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.processing.keyword_clusterer import KeywordClusterer
+
+EMBEDDING_DIM = 384
+
+
+def make_embeddings(n_samples: int, n_topics: int = 8, seed: int = 0) -> np.ndarray:
+    """Unit-normalised blobs that look roughly like sentence embeddings"""
+    rng = np.random.RandomState(seed)
+    centers = rng.normal(size=(n_topics, EMBEDDING_DIM))
+    topics = rng.randint(n_topics, size=n_samples)
+    points = centers[topics] + rng.normal(scale=1.5, size=(n_samples, EMBEDDING_DIM))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    return points.astype(np.float32)
+
+
+def legacy_select(embeddings: np.ndarray, min_k: int = 3, max_k: int = 10) -> KMeans:
+    """The previous implementation: full sweep, full silhouette, then refit"""
+    scores = []
+    for k in range(min_k, min(max_k + 1, len(embeddings))):
+        labels = KMeans(n_clusters=k, random_state=42, n_init=10).fit_predict(embeddings)
+        scores.append((k, silhouette_score(embeddings, labels)))
+    optimal_k = max(scores, key=lambda x: x[1])[0]
+    return KMeans(n_clusters=optimal_k, random_state=42, n_init=10).fit(embeddings)
+
+
+def score(embeddings: np.ndarray, labels: np.ndarray) -> float:
+    """Silhouette on a fixed sample so both methods are judged the same way"""
+    return silhouette_score(embeddings, labels, sample_size=min(len(embeddings), 5000), random_state=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,50000,200000')
+    parser.add_argument('--max-baseline', type=int, default=10000,
+                        help='skip the legacy sweep above this many keywords (it is O(n^2))')
+    args = parser.parse_args()
+
+    clusterer = KeywordClusterer()
+
+    print(f"{'keywords':>9} {'legacy s':>10} {'new s':>8} {'speedup':>8} {'legacy k':>9} {'new k':>6} "
+          f"{'legacy sil':>11} {'new sil':>8} {'stream s':>9} {'stream MB':>10} {'stream sil':>11}")
+
+    for n_samples in [int(size) for size in args.sizes.split(',')]:
+        embeddings = make_embeddings(n_samples)
+
+        start = time.perf_counter()
+        model = clusterer._select_model(embeddings)
+        new_seconds = time.perf_counter() - start
+        new_sil = score(embeddings, model.labels_)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        _, stream_labels = clusterer._cluster_streaming(embeddings, 3, 10)
+        stream_seconds = time.perf_counter() - start
+        stream_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+        streaming = f"{stream_seconds:>9.2f} {stream_mb:>10.1f} {score(embeddings, stream_labels):>11.4f}"
+
+        if n_samples <= args.max_baseline:
+            start = time.perf_counter()
+            legacy = legacy_select(embeddings)
+            legacy_seconds = time.perf_counter() - start
+            legacy_sil = score(embeddings, legacy.labels_)
+            print(f"{n_samples:>9} {legacy_seconds:>10.2f} {new_seconds:>8.2f} "
+                  f"{legacy_seconds / new_seconds:>7.1f}x {legacy.n_clusters:>9} {model.n_clusters:>6} "
+                  f"{legacy_sil:>11.4f} {new_sil:>8.4f} {streaming}")
+        else:
+            print(f"{n_samples:>9} {'skipped':>10} {new_seconds:>8.2f} {'-':>8} {'-':>9} "
+                  f"{model.n_clusters:>6} {'-':>11} {new_sil:>8.4f} {streaming}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Benchmark DatabaseService read payloads: light vs full column projections
+
+Builds realistic keyword_batches and keyword_clusters rows (keyword
+arrays, outline and post idea JSON, token usage and performance profile)
+and prints the JSON size each read returns with the light projection and
+with select('*'). With --batch the reads are run against Supabase for that
+batch and the response sizes and latencies are printed instead.
+
+Usage:
+    python benchmarks/bench_db_payload.py [--keywords 5000] [--clusters 10] [--batches 50]
+    python benchmarks/bench_db_payload.py --batch <batch id> --slack-user <Slack user id>
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.data.database import BATCH_LIGHT_COLUMNS, CLUSTER_LIGHT_COLUMNS
+
+
+def columns(projection: str):
+    return [c.strip() for c in projection.split(',')]
+
+
+def sample_batch(keyword_count: int, cluster_count: int) -> dict:
+    topics = ['flat feet', 'trail', 'beginners', 'marathon', 'women']
+    raw = [f"best running shoes for {topics[i % len(topics)]} {i}" for i in range(keyword_count)]
+    spans = [{'name': 'scrape.fetch', 'start': i * 0.2, 'seconds': 0.8, 'thread': 'scrape_0',
+              'url': f"https://example.com/guides/running-shoes/{i}", 'bytes': 250000} for i in range(cluster_count * 3)]
+    spans += [{'name': 'llm.outline', 'start': i * 1.5, 'seconds': 2.1, 'thread': 'cluster_0',
+               'prompt_tokens': 1800, 'completion_tokens': 900} for i in range(cluster_count)]
+    return {
+        'id': str(uuid.uuid4()),
+        'user_id': str(uuid.uuid4()),
+        'batch_name': 'Batch_20261016_120000',
+        'status': 'completed',
+        'raw_keywords': raw,
+        'cleaned_keywords': raw[:int(keyword_count * 0.8)],
+        'keyword_count': int(keyword_count * 0.8),
+        'cluster_count': cluster_count,
+        'source_type': 'csv',
+        'created_at': '2026-10-16T12:00:00',
+        'completed_at': '2026-10-16T12:04:00',
+        'error_message': None,
+        'token_usage': {'calls': cluster_count * 2 + 1, 'prompt_tokens': 40000, 'completion_tokens': 18000,
+                        'by_label': {label: {'calls': cluster_count, 'prompt_tokens': 20000}
+                                     for label in ('outline', 'idea', 'cluster_names')}},
+        'performance_profile': {'wall_seconds': 240.0, 'stages': {}, 'spans': spans, 'dropped_spans': 0},
+    }
+
+
+def sample_cluster(batch_id: str, number: int, keyword_count: int) -> dict:
+    sections = [{
+        'heading': f"Section {s}: how to choose running shoes for your gait",
+        'subheadings': [f"Subsection {s}.{t}: cushioning, drop and fit" for t in range(4)],
+        'key_points': [f"Point {p}: what reviewers measured and why it matters" for p in range(5)],
+        'word_count': 350
+    } for s in range(8)]
+    return {
+        'id': str(uuid.uuid4()),
+        'batch_id': batch_id,
+        'cluster_number': number,
+        'cluster_name': f"Running shoes cluster {number}",
+        'keywords': [f"running shoes keyword {number}.{k}" for k in range(keyword_count)],
+        'keyword_count': keyword_count,
+        'post_idea': f"The complete guide to running shoes, part {number}",
+        'post_idea_metadata': {'title': f"The complete guide to running shoes, part {number}",
+                               'angle': 'Tested by runners of every level ' * 4,
+                               'hook': 'Most runners buy the wrong shoe. ' * 4,
+                               'target_audience': 'Beginner and intermediate runners'},
+        'outline_json': {'title': f"Running shoes guide {number}", 'meta_description': 'x' * 155,
+                         'sections': sections, 'faq': [{'question': f"Q{q}?", 'answer': 'A' * 200} for q in range(5)]},
+        'top_urls': [f"https://example.com/{number}/{u}" for u in range(3)],
+        'created_at': '2026-10-16T12:02:00',
+    }
+
+
+def size(rows) -> int:
+    return len(json.dumps(rows, separators=(',', ':')).encode())
+
+
+def project(rows, projection: str):
+    keep = columns(projection)
+    return [{k: row[k] for k in keep if k in row} for row in rows]
+
+
+def run_synthetic(args):
+    batches = [sample_batch(args.keywords, args.clusters) for _ in range(args.batches)]
+    clusters = [sample_cluster(batches[0]['id'], n, args.keywords // args.clusters) for n in range(1, args.clusters + 1)]
+
+    reads = [
+        ('get_batch', batches[:1], BATCH_LIGHT_COLUMNS),
+        ('get_user_history (10)', batches[:10], BATCH_LIGHT_COLUMNS),
+        ('get_batch_by_id scan (50)', batches[:50], BATCH_LIGHT_COLUMNS),
+        ('get_batch_clusters', clusters, CLUSTER_LIGHT_COLUMNS),
+    ]
+
+    print(f"Synthetic batches: {args.keywords} keywords, {args.clusters} clusters")
+    print(f"{'read':<28} {'full KB':>9} {'light KB':>9} {'saved':>7}")
+    for name, rows, projection in reads:
+        full, light = size(rows), size(project(rows, projection))
+        print(f"{name:<28} {full / 1024:>9.1f} {light / 1024:>9.1f} {1 - light / full:>7.0%}")
+
+
+def run_live(args):
+    from app.services.data.database import DatabaseService
+
+    db = DatabaseService()
+    user_id = db.get_user_id(args.slack_user)
+
+    reads = [
+        ('get_batch', lambda full: [db.get_batch(args.batch, full=full)]),
+        ('get_user_history (10)', lambda full: db.get_user_history(user_id, limit=10, full=full)),
+        ('get_batch_by_id (prefix)', lambda full: [db.get_batch_by_id(args.batch[:8], user_id, full=full)]),
+        ('get_batch_clusters', lambda full: db.get_batch_clusters(args.batch, full=full)),
+    ]
+
+    print(f"Supabase batch {args.batch}")
+    print(f"{'read':<28} {'full KB':>9} {'light KB':>9} {'full ms':>8} {'light ms':>9}")
+    for name, read in reads:
+        measured = {}
+        for full in (True, False):
+            start = time.time()
+            rows = read(full)
+            measured[full] = (size(rows), (time.time() - start) * 1000)
+        print(f"{name:<28} {measured[True][0] / 1024:>9.1f} {measured[False][0] / 1024:>9.1f} "
+              f"{measured[True][1]:>8.0f} {measured[False][1]:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keywords', type=int, default=5000)
+    parser.add_argument('--clusters', type=int, default=10)
+    parser.add_argument('--batches', type=int, default=50)
+    parser.add_argument('--batch', help='measure reads of this batch in Supabase')
+    parser.add_argument('--slack-user', help='Slack user id owning --batch')
+    args = parser.parse_args()
+
+    if args.batch:
+        if not args.slack_user:
+            parser.error('--batch needs --slack-user')
+        run_live(args)
+    else:
+        run_synthetic(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark streaming HTML extraction against the previous BeautifulSoup parse
+
+For each saved HTML page, compares CPU time and peak traced memory of the
+old ContentScraper parse (full BeautifulSoup tree with html.parser, then
+find_all for h1, h2 and h3, title and meta description) with
+extract_page_structure, both without a limit and with SCRAPE_MAX_BYTES.
+
+Usage:
+    python benchmarks/bench_html_extraction.py [page.html ...] [--repeat 5]
+
+Without arguments a synthetic 2 MB article page is generated.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import Config
+from app.services.processing.html_extractor import extract_page_structure
+
+CHUNK_SIZE = 16384
+
+
+def legacy_extract(content: bytes) -> dict:
+    """The previous ContentScraper.scrape_single parsing code"""
+    soup = BeautifulSoup(content, 'html.parser')
+    headings = []
+    for tag in ['h1', 'h2', 'h3']:
+        for heading in soup.find_all(tag):
+            text = ' '.join(heading.get_text().strip().split())
+            if text and len(text) > 3:
+                headings.append({'level': tag, 'text': text, 'position': len(headings) + 1})
+    title = soup.find('title')
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    return {
+        'title': title.get_text().strip() if title else '',
+        'description': meta_desc.get('content', '') if meta_desc else '',
+        'headings': headings
+    }
+
+
+def streaming_extract(content: bytes, max_bytes: int = None) -> dict:
+    chunks = (content[i:i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE))
+    return extract_page_structure(chunks, 'utf-8', max_bytes)
+
+
+def synthetic_page(target_bytes: int = 2 * 1024 * 1024) -> bytes:
+    """Article-like page: nav, inline scripts, headings and long paragraphs"""
+    parts = [
+        '<!DOCTYPE html><html><head><title>Complete Guide to Running Shoes</title>',
+        '<meta name="description" content="Everything about running shoes">',
+        '<script>' + 'var tracking = {};' * 200 + '</script></head><body>',
+        '<nav>' + ''.join(f'<a href="/c/{i}">Category {i}</a>' for i in range(300)) + '</nav>',
+        '<h1>Running Shoes Guide</h1>'
+    ]
+    section = 0
+    while sum(len(p) for p in parts) < target_bytes:
+        section += 1
+        parts.append(f'<h2>Section {section}: Choosing the right pair</h2>')
+        for sub in range(3):
+            parts.append(f'<h3>Detail {section}.{sub} about cushioning</h3>')
+            parts.append('<p>' + 'Runners should consider fit, drop and cushioning. ' * 40 + '</p>')
+            parts.append('<div class="ad"><span>Sponsored</span><img src="/ad.png"></div>')
+    parts.append('</body></html>')
+    return ''.join(parts).encode()
+
+
+def measure(func, content: bytes, repeat: int):
+    """Best CPU time over repeats and peak traced memory of one run"""
+    best_cpu = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        func(content)
+        best_cpu = min(best_cpu, time.process_time() - start)
+
+    tracemalloc.start()
+    result = func(content)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best_cpu, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('pages', nargs='*', help='saved HTML files')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [(os.path.basename(path), open(path, 'rb').read()) for path in args.pages]
+    else:
+        pages = [('synthetic', synthetic_page())]
+
+    variants = [
+        ('beautifulsoup', legacy_extract),
+        ('streaming', streaming_extract),
+        (f'streaming@{Config.SCRAPE_MAX_BYTES // 1024}KB',
+         lambda content: streaming_extract(content, Config.SCRAPE_MAX_BYTES))
+    ]
+
+    print(f"{'page':<24} {'KB':>7} {'parser':<22} {'cpu ms':>8} {'peak MB':>8} {'headings':>9} {'match':>5}")
+    for name, content in pages:
+        baseline = None
+        for label, func in variants:
+            cpu, peak, result = measure(func, content, args.repeat)
+            if baseline is None:
+                baseline = result
+            # Every heading found must also be found by BeautifulSoup
+            same = {(h['level'], h['text']) for h in result['headings']} <= \
+                   {(h['level'], h['text']) for h in baseline['headings']}
+            print(f"{name[:24]:<24} {len(content) // 1024:>7} {label:<22} {cpu * 1000:>8.1f} "
+                  f"{peak / (1024 * 1024):>8.1f} {len(result['headings']):>9} {'yes' if same else 'no':>5}")
+
+
+if __name__ == '__main__':
+    main()
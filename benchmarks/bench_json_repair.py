@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Benchmark LLM JSON extraction: success rate and parse time
+
+Compares the previous OutlineGenerator parsing (split on markdown fences,
+json.loads, then a greedy regex) with app.utils.json_repair over a corpus
+of responses, grouped by defect.
+
+Usage:
+    python benchmarks/bench_json_repair.py [--corpus responses.jsonl] [--repeat 200]
+
+A corpus file has one JSON object per line with the raw completion under
+"text" (and optionally a "kind" label). Without one, a synthetic corpus is
+built from outline-shaped documents with the defects seen in Groq output.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.json_repair import repair_json
+
+
+def legacy_parse(outline_text: str) -> dict:
+    """The previous OutlineGenerator._generate_with_llm parsing code"""
+    if '```json' in outline_text:
+        outline_text = outline_text.split('```json')[1].split('```')[0]
+    elif '```' in outline_text:
+        outline_text = outline_text.split('```')[1].split('```')[0]
+    outline_text = outline_text.strip()
+    try:
+        return json.loads(outline_text)
+    except json.JSONDecodeError:
+        json_match = re.search(r'\{.*\}', outline_text, re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group())
+        raise
+
+
+def outline_document(seed: int) -> dict:
+    return {
+        "title": f"The Complete Guide to Topic {seed}",
+        "introduction": {
+            "hooks": [f"Hook {i} for topic {seed}" for i in range(3)],
+            "overview": "What this post covers",
+            "target_audience": "Beginners and intermediate readers"
+        },
+        "sections": [
+            {
+                "heading": f"Section {s}: choosing well",
+                "description": "Detailed explanation of what this section covers. " * 3,
+                "word_count_estimate": 300 + s * 25,
+                "seo_keywords": [f"keyword {s}", f"topic {seed}"],
+                "subsections": [
+                    {"heading": f"Subsection {s}.{j}", "content_ideas": ["Idea 1", "Idea 2"]}
+                    for j in range(3)
+                ]
+            }
+            for s in range(7)
+        ],
+        "conclusion": {"summary": "Key takeaways", "actionable_insights": ["Insight 1"], "cta": "Start today"}
+    }
+
+
+def synthetic_corpus(size: int = 20):
+    """(kind, text) pairs covering the defects seen in model output"""
+    corpus = []
+    for seed in range(size):
+        doc = json.dumps(outline_document(seed), indent=2)
+        compact = json.dumps(outline_document(seed))
+        corpus += [
+            ('clean', doc),
+            ('fenced', f"```json\n{doc}\n```"),
+            ('preamble', f"Here is the outline you asked for:\n\n```json\n{doc}\n```\n\nLet me know if you need changes!"),
+            ('trailing text', f"{doc}\n\nNote: adjust {{word counts}} to your needs."),
+            ('brace in preamble', f"Outline for {{topic}}:\n{compact}"),
+            ('trailing commas', re.sub(r'(\]|\}|")(\s*\n\s*)(\]|\})', r'\1,\2\3', doc)),
+            ('raw newlines', compact.replace('covers. ', 'covers.\n', 1)),
+            ('truncated 90%', doc[:int(len(doc) * 0.9)]),
+            ('truncated 50%', doc[:int(len(doc) * 0.5)]),
+            ('truncated fenced', f"```json\n{doc[:int(len(doc) * 0.75)]}"),
+        ]
+    return corpus
+
+
+def load_corpus(path: str):
+    corpus = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                corpus.append((record.get('kind', 'recorded'), record['text']))
+    return corpus
+
+
+def measure(parse, text: str, repeat: int):
+    """(success, mean seconds per parse)"""
+    try:
+        value = parse(text)
+        ok = isinstance(value, dict) and bool(value.get('sections') or value.get('title'))
+    except Exception:
+        ok = False
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        try:
+            parse(text)
+        except Exception:
+            pass
+    return ok, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='JSONL file of recorded responses')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    parsers = [('legacy', legacy_parse), ('json_repair', lambda text: repair_json(text)[0])]
+
+    stats = defaultdict(lambda: defaultdict(lambda: [0, 0, 0.0]))  # kind -> parser -> [ok, n, seconds]
+    for kind, text in corpus:
+        for name, parse in parsers:
+            ok, seconds = measure(parse, text, args.repeat)
+            entry = stats[kind][name]
+            entry[0] += ok
+            entry[1] += 1
+            entry[2] += seconds
+
+    header = f"{'kind':<20} {'n':>4}"
+    for name, _ in parsers:
+        header += f" {name + ' ok':>16} {name + ' us':>16}"
+    print(header)
+
+    totals = defaultdict(lambda: [0, 0, 0.0])
+    for kind, by_parser in stats.items():
+        row = f"{kind:<20} {next(iter(by_parser.values()))[1]:>4}"
+        for name, _ in parsers:
+            ok, n, seconds = by_parser[name]
+            totals[name][0] += ok
+            totals[name][1] += n
+            totals[name][2] += seconds
+            row += f" {ok / n:>16.0%} {seconds / n * 1e6:>16.1f}"
+        print(row)
+
+    row = f"{'all':<20} {len(corpus):>4}"
+    for name, _ in parsers:
+        ok, n, seconds = totals[name]
+        row += f" {ok / n:>16.0%} {seconds / n * 1e6:>16.1f}"
+    print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark prompt size: full vs compact (LLM_COMPACT_PROMPTS) prompts
+
+Builds the outline, idea and fused outline+idea messages for a set of
+sample clusters in both modes and prints the estimated prompt tokens.
+With --live each request is also sent to Groq (cache bypassed) and the
+reported prompt/completion tokens and latency are printed per mode.
+
+Usage:
+    python benchmarks/bench_prompt_tokens.py [--clusters 5] [--live]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import Config
+from app.services.ai.llm_client import LLMClient, TokenUsage, estimate_tokens
+from app.services.ai.outline_generator import OutlineGenerator
+from app.services.ai.idea_generator import IdeaGenerator
+
+
+def sample_clusters(count: int):
+    """(keywords, topics, outline) for synthetic clusters"""
+    clusters = []
+    for seed in range(count):
+        keywords = [f"best running shoes {seed}", f"running shoes for beginners {seed}",
+                    f"trail running shoes {seed}", f"running shoe reviews {seed}",
+                    f"cheap running shoes {seed}", f"running shoes flat feet {seed}"]
+        topics = [f"Topic {seed}.{i}: cushioning, fit and durability" for i in range(12)]
+        outline = {'sections': [{'heading': f"Section {s}: choosing well"} for s in range(7)]}
+        clusters.append((keywords, topics, outline))
+    return clusters
+
+
+def build_messages(outline_gen, idea_gen, keywords, topics, outline):
+    return {
+        'outline': outline_gen._outline_messages(keywords, topics),
+        'idea': idea_gen._idea_messages(keywords, outline),
+        'outline_with_idea': outline_gen._fused_messages(keywords, topics),
+    }
+
+
+def run_live(llm, outline_gen, idea_gen, clusters):
+    """Send every request once and return the TokenUsage summary"""
+    for keywords, topics, outline in clusters:
+        calls = [
+            lambda: outline_gen._generate_with_llm(keywords, topics),
+            lambda: idea_gen._generate_with_llm(keywords, outline),
+            lambda: outline_gen._generate_fused_with_llm(keywords, topics),
+        ]
+        for call in calls:
+            try:
+                call()
+            except Exception as e:
+                # Usage is recorded before parsing, so the tokens still count
+                print(f"  call failed: {e}", file=sys.stderr)
+    return llm.usage.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clusters', type=int, default=5)
+    parser.add_argument('--live', action='store_true', help='also call Groq and report real usage')
+    args = parser.parse_args()
+
+    clusters = sample_clusters(args.clusters)
+    estimates = {}
+    live = {}
+
+    for compact in (False, True):
+        Config.LLM_COMPACT_PROMPTS = compact
+        mode = 'compact' if compact else 'full'
+        llm = LLMClient(use_cache=False, usage=TokenUsage())
+        outline_gen, idea_gen = OutlineGenerator(llm), IdeaGenerator(llm)
+
+        totals = {}
+        for keywords, topics, outline in clusters:
+            for label, messages in build_messages(outline_gen, idea_gen, keywords, topics, outline).items():
+                totals[label] = totals.get(label, 0) + estimate_tokens(messages)
+        estimates[mode] = {label: tokens / len(clusters) for label, tokens in totals.items()}
+
+        if args.live:
+            live[mode] = run_live(llm, outline_gen, idea_gen, clusters)
+
+    print(f"Estimated prompt tokens per call ({len(clusters)} clusters)")
+    print(f"{'call':<20} {'full':>8} {'compact':>8} {'saved':>7}")
+    for label in estimates['full']:
+        full, compact = estimates['full'][label], estimates['compact'][label]
+        print(f"{label:<20} {full:>8.0f} {compact:>8.0f} {1 - compact / full:>7.0%}")
+
+    if live:
+        print()
+        print("Groq usage per call")
+        print(f"{'mode':<8} {'call':<20} {'prompt':>8} {'completion':>11} {'seconds':>8}")
+        for mode, summary in live.items():
+            for label, entry in summary['by_label'].items():
+                calls = entry['calls']
+                print(f"{mode:<8} {label:<20} {entry['prompt_tokens'] / calls:>8.0f} "
+                      f"{entry['completion_tokens'] / calls:>11.0f} {entry['seconds'] / calls:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
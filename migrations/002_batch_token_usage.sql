@@ -0,0 +1,6 @@
+-- LLM token accounting per batch
+-- Run this script in Supabase SQL Editor after 001_initial_schema.sql
+
+-- Totals from TokenUsage.summary(): calls, cached_calls, prompt_tokens,
+-- completion_tokens, total_tokens, seconds and the same figures by_label
+ALTER TABLE keyword_batches ADD COLUMN IF NOT EXISTS token_usage JSONB;
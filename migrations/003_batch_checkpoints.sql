@@ -0,0 +1,12 @@
+-- Pipeline checkpoints so a failed batch can be resumed with /resume
+-- Run this script in Supabase SQL Editor after 002_batch_token_usage.sql
+
+-- One row per completed step: 'clusters' holds the named keyword clusters,
+-- 'cluster:<n>' the outline and post idea generated for cluster n
+CREATE TABLE IF NOT EXISTS batch_checkpoints (
+  batch_id UUID REFERENCES keyword_batches(id) ON DELETE CASCADE,
+  step VARCHAR(50) NOT NULL,
+  data JSONB NOT NULL,
+  updated_at TIMESTAMP DEFAULT NOW(),
+  PRIMARY KEY (batch_id, step)
+);
@@ -0,0 +1,6 @@
+-- Per-batch performance profile
+-- Run this script in Supabase SQL Editor after 003_batch_checkpoints.sql
+
+-- Profiler.summary(): wall_seconds, stages (count, errors, seconds,
+-- max_seconds, bytes, tokens and items per stage name) and the first spans
+ALTER TABLE keyword_batches ADD COLUMN IF NOT EXISTS performance_profile JSONB;
@@ -0,0 +1,15 @@
+-- One row per cluster number in a batch, so clusters can be saved in bulk with upsert
+-- Run this script in Supabase SQL Editor after 004_batch_performance_profile.sql
+
+-- Keep the most recent row of clusters that were saved more than once
+DELETE FROM keyword_clusters a
+USING keyword_clusters b
+WHERE a.batch_id = b.batch_id
+  AND a.cluster_number = b.cluster_number
+  AND (a.created_at, a.id) < (b.created_at, b.id);
+
+ALTER TABLE keyword_clusters
+  ADD CONSTRAINT keyword_clusters_batch_cluster_key UNIQUE (batch_id, cluster_number);
+
+-- The constraint's index starts with batch_id and serves lookups by batch
+DROP INDEX IF EXISTS idx_clusters_batch;
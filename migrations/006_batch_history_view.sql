@@ -0,0 +1,17 @@
+-- Batch history with cluster counts and report flags in one query (/history)
+-- Run this script in Supabase SQL Editor after 005_unique_cluster_number.sql
+
+CREATE OR REPLACE VIEW batch_history AS
+SELECT
+  b.id,
+  b.user_id,
+  b.status,
+  b.keyword_count,
+  b.created_at,
+  b.completed_at,
+  (SELECT COUNT(*) FROM keyword_clusters c WHERE c.batch_id = b.id) AS cluster_count,
+  EXISTS (SELECT 1 FROM reports r WHERE r.batch_id = b.id) AS has_report
+FROM keyword_batches b;
+
+-- A user's latest batches come straight from the index, newest first
+CREATE INDEX IF NOT EXISTS idx_batches_user_created ON keyword_batches(user_id, created_at DESC);
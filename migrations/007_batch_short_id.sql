@@ -0,0 +1,10 @@
+-- Indexed short batch IDs, so `/regenerate abc12345` and similar commands
+-- find a batch by the 8 characters shown in Slack with one index lookup
+-- Run this script in Supabase SQL Editor after 006_batch_history_view.sql
+
+ALTER TABLE keyword_batches
+  ADD COLUMN IF NOT EXISTS short_id VARCHAR(8) GENERATED ALWAYS AS (LEFT(id::text, 8)) STORED;
+
+-- varchar_pattern_ops serves both short_id = 'abc12345' and prefixes
+-- shorter than 8 characters (short_id LIKE 'abc1%')
+CREATE INDEX IF NOT EXISTS idx_batches_short_id ON keyword_batches(short_id varchar_pattern_ops);
@@ -0,0 +1,15 @@
+-- Get or create a user and update last_active_at in one call
+-- Run this script in Supabase SQL Editor after 007_batch_short_id.sql
+
+-- Called by DatabaseService.get_or_create_user; returns the user row
+CREATE OR REPLACE FUNCTION upsert_user(p_slack_user_id VARCHAR, p_display_name VARCHAR DEFAULT NULL)
+RETURNS SETOF users
+LANGUAGE sql
+AS $$
+  INSERT INTO users (slack_user_id, display_name)
+  VALUES (p_slack_user_id, p_display_name)
+  ON CONFLICT (slack_user_id) DO UPDATE
+    SET last_active_at = NOW(),
+        display_name = COALESCE(EXCLUDED.display_name, users.display_name)
+  RETURNING *;
+$$;
@@ -111,8 +111,22 @@ def test_cache_service():
     else:
         print("   [SKIP] Redis not available or TTL not working")
 
+    # Test history caching
+    print("\n8. Testing history caching...")
+    history = [{"id": "batch-1", "status": "completed", "cluster_count": 4, "has_report": True}]
+    cache.cache_history(test_user_id, history, ttl=60)
+    cached_history = cache.get_cached_history(test_user_id)
+
+    if cached_history:
+        assert cached_history[0]["cluster_count"] == 4
+        cache.clear_history(test_user_id)
+        assert cache.get_cached_history(test_user_id) is None
+        print("   [OK] History caching and clearing works")
+    else:
+        print("   [SKIP] Redis not available")
+
     # Test graceful handling when Redis is unavailable
-    print("\n8. Testing graceful Redis unavailability...")
+    print("\n9. Testing graceful Redis unavailability...")
     # This should not crash even if Redis is down
     unavailable_cache = CacheService()
     result = unavailable_cache.get("nonexistent_key")
@@ -18,6 +18,12 @@ def test_database_service():
     assert user['slack_user_id'] == test_slack_id
     print("   [OK] get_or_create_user works")
 
+    # Test get_user_id (cached after the first lookup)
+    print("\n1b. Testing get_user_id...")
+    assert db.get_user_id(test_slack_id) == user['id']
+    assert db.get_user_id(test_slack_id) == user['id']
+    print("   [OK] get_user_id works")
+
     # Test save_batch
     print("\n2. Testing save_batch...")
     raw_keywords = ["test keyword 1", "test keyword 2"]
@@ -73,8 +79,41 @@ def test_database_service():
     assert len(clusters) >= 1
     print("   [OK] get_batch_clusters works")
 
+    # Test checkpoints
+    print("\n9. Testing checkpoints...")
+    db.save_checkpoint(batch['id'], 'clusters', [cluster])
+    db.save_checkpoint(batch['id'], 'cluster:1', {'outline': outline, 'post_idea': post_idea})
+    db.save_checkpoint(batch['id'], 'cluster:1', {'outline': outline, 'post_idea': post_idea})
+    checkpoints = db.get_checkpoints(batch['id'])
+    print(f"   Checkpoints: {sorted(checkpoints)}")
+    assert sorted(checkpoints) == ['cluster:1', 'clusters']
+    assert checkpoints['cluster:1']['post_idea']['title'] == 'Test Post'
+    db.delete_checkpoints(batch['id'])
+    assert db.get_checkpoints(batch['id']) == {}
+    print("   [OK] checkpoints work")
+
+    # Test save_clusters
+    print("\n10. Testing save_clusters...")
+    second = dict(cluster, cluster_number=2, cluster_name='Second Cluster')
+    new_idea = {'title': 'Regenerated Post', 'angle': 'New angle'}
+    db.save_clusters(batch['id'], [(cluster, new_idea, outline), (second, post_idea, outline)])
+    clusters = db.get_batch_clusters(batch['id'])
+    print(f"   Clusters: {[(c['cluster_number'], c['post_idea']) for c in clusters]}")
+    assert [c['cluster_number'] for c in clusters] == [1, 2]
+    assert clusters[0]['post_idea'] == 'Regenerated Post'
+    print("   [OK] save_clusters upserts")
+
+    # Test get_batch_by_id with short IDs
+    print("\n11. Testing get_batch_by_id...")
+    assert db.get_batch_by_id(batch['id'], user['id'])['id'] == batch['id']
+    assert db.get_batch_by_id(batch['id'][:8], user['id'])['id'] == batch['id']
+    assert db.get_batch_by_id(batch['id'][:4].upper(), user['id'])['id'] == batch['id']
+    assert db.get_batch_by_id(batch['id'][:8], str(uuid.uuid4())) is None
+    assert db.get_batch_by_id('not-an-id', user['id']) is None
+    print("   [OK] get_batch_by_id resolves full and short IDs")
+
     # Test error handling with invalid data
-    print("\n9. Testing error handling...")
+    print("\n12. Testing error handling...")
     try:
         # Try to save batch with invalid user_id
         invalid_batch = db.save_batch(str(uuid.uuid4()), [], [], "test")
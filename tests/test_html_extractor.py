@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Test script for the streaming HTML extractor"""
+
+from app.services.processing.html_extractor import extract_page_structure, sniff_encoding
+
+SAMPLE_HTML = b"""<!DOCTYPE html>
+<html>
+<head>
+  <title> Best Running Shoes 2024 </title>
+  <meta name="Description" content="Our picks for every runner">
+  <script>var h2 = "<h2>not a heading</h2>";</script>
+</head>
+<body>
+  <h2>How to Choose Running Shoes</h2>
+  <h1>Running Shoes <span>Guide</span></h1>
+  <h3>Check   the
+      Cushioning</h3>
+  <h2>Top</h2>
+  <h2>Trail Running &amp; Road Running</h2>
+</body>
+</html>"""
+
+
+def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def test_html_extractor():
+    print("Testing extract_page_structure...")
+
+    # Test 1: Full page, fed in small chunks
+    print("\n1. Extracting title, description and headings...")
+    page = extract_page_structure(chunked(SAMPLE_HTML, 7))
+    print(f"   Title: {page['title']}")
+    print(f"   Description: {page['description']}")
+    assert page['title'] == 'Best Running Shoes 2024'
+    assert page['description'] == 'Our picks for every runner'
+    assert not page['truncated']
+    print("   [OK] Title and meta description extracted")
+
+    # Test 2: Headings grouped h1, h2, h3 with cleaned text and positions
+    print("\n2. Checking heading order and cleaning...")
+    headings = [(h['level'], h['text'], h['position']) for h in page['headings']]
+    for heading in headings:
+        print(f"   {heading}")
+    assert headings == [
+        ('h1', 'Running Shoes Guide', 1),
+        ('h2', 'How to Choose Running Shoes', 2),
+        ('h2', 'Trail Running & Road Running', 3),
+        ('h3', 'Check the Cushioning', 4)
+    ]
+    print("   [OK] Headings match previous BeautifulSoup output")
+
+    # Test 3: Byte budget stops reading early
+    print("\n3. Testing byte budget...")
+    budget = SAMPLE_HTML.index(b'<h3>')
+    page = extract_page_structure(chunked(SAMPLE_HTML, 64), max_bytes=budget)
+    print(f"   Bytes read: {page['bytes_read']}, truncated: {page['truncated']}")
+    assert page['truncated']
+    assert page['bytes_read'] == budget
+    assert [h['level'] for h in page['headings']] == ['h1', 'h2']
+    print("   [OK] Parsing stopped at the byte budget")
+
+    # Test 4: Unknown encodings fall back to UTF-8
+    print("\n4. Testing encoding fallback...")
+    page = extract_page_structure([b'<title>Caf\xc3\xa9 Guide</title>'], encoding='not-a-codec')
+    assert page['title'] == 'Café Guide'
+    print("   [OK] Unknown encoding decoded as UTF-8")
+
+    # Test 5: Encodings declared in the page
+    print("\n5. Testing charset sniffing...")
+    assert sniff_encoding(b'<html><head><meta charset="windows-1252">') == 'cp1252'
+    assert sniff_encoding(b'<meta http-equiv="Content-Type" content="text/html; charset=ISO-8859-1">') == 'cp1252'
+    assert sniff_encoding(b'\xef\xbb\xbf<html>') == 'utf-8'
+    assert sniff_encoding(b'<meta charset="no-such-codec">') is None
+    assert sniff_encoding(SAMPLE_HTML) is None
+    page = extract_page_structure([b'<title>Caf\xe9 Guide</title>'], encoding=sniff_encoding(b'<meta charset=latin1>'))
+    assert page['title'] == 'Café Guide'
+    print("   [OK] BOM and <meta> charsets detected")
+
+    print("\nAll HTML extractor tests passed!")
+
+
+if __name__ == "__main__":
+    test_html_extractor()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test script for JobQueue and WorkerPool"""
+
+import threading
+import time
+import uuid
+from app.services.data.job_queue import JobQueue, WorkerPool, register_job_handler
+
+
+def drain(queue, owner):
+    jobs = []
+    while True:
+        job = queue.dequeue(owner)
+        if job is None:
+            return jobs
+        jobs.append(job)
+        queue.finish(job)
+
+
+def test_job_queue():
+    print("Testing JobQueue...")
+    # Process-local, so running this never touches a deployment's Redis queue
+    queue = JobQueue()
+
+    # Test 1: Users take turns
+    print("\n1. Testing round-robin between users...")
+    alice, bob = f"alice_{uuid.uuid4().hex[:6]}", f"bob_{uuid.uuid4().hex[:6]}"
+    for i in range(3):
+        queue.enqueue('test', alice, 'C1', n=i)
+    queued = queue.enqueue('test', bob, 'C1', n=0)
+    print(f"   Bob's job had {queued['ahead']} jobs ahead")
+    assert queued['ahead'] == 1
+    queued = queue.enqueue('test', alice, 'C1', n=3)
+    assert queued['ahead'] == 4
+
+    order = [(job['user_id'], job['n']) for job in drain(queue, 'test-worker')]
+    print(f"   Order: {order}")
+    assert order == [(alice, 0), (bob, 0), (alice, 1), (alice, 2), (alice, 3)]
+    assert queue.stats()['queued'] == 0
+    print("   [OK] Bob did not wait for all of Alice's jobs")
+
+    print("\nAll JobQueue tests passed!")
+
+
+def test_worker_pool():
+    print("Testing WorkerPool...")
+    queue = JobQueue()  # process-local
+    done = []
+    lock = threading.Lock()
+
+    def handler(client, job):
+        time.sleep(0.2)
+        with lock:
+            done.append(job['n'])
+
+    register_job_handler('test_sleep', handler)
+    pool = WorkerPool(queue, client=None, workers=2)
+    pool.start()
+    for i in range(4):
+        queue.enqueue('test_sleep', 'U1', 'C1', n=i)
+    pool.notify()
+
+    start = time.time()
+    while len(done) < 4 and time.time() - start < 5:
+        time.sleep(0.05)
+    elapsed = time.time() - start
+    pool.stop()
+
+    metrics = pool.metrics()
+    print(f"   Ran {sorted(done)} in {elapsed:.2f}s, metrics: {metrics}")
+    assert sorted(done) == [0, 1, 2, 3]
+    assert elapsed >= 0.35  # two at a time, never all four at once
+    assert metrics['completed'] == 4 and metrics['busy_workers'] == 0
+    print("   [OK] Jobs run at most two at a time")
+
+    print("\nAll WorkerPool tests passed!")
+
+
+if __name__ == "__main__":
+    test_job_queue()
+    test_worker_pool()
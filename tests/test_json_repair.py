@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Test script for LLM JSON extraction and repair"""
+
+from app.utils.json_repair import JSONRepairError, parse_llm_json, repair_json
+
+OUTLINE_JSON = '{"title": "Running Shoes Guide", "sections": [{"heading": "Types"}, {"heading": "Fit"}]}'
+
+
+def test_json_repair():
+    print("Testing json_repair...")
+
+    # Test 1: Stray text and fences around the JSON
+    print("\n1. Testing stray text and markdown fences...")
+    wrapped = f"Here is your outline:\n```json\n{OUTLINE_JSON}\n```\nHope this helps!"
+    value, repairs = repair_json(wrapped)
+    print(f"   Repairs: {repairs}")
+    assert value['title'] == 'Running Shoes Guide'
+    value, repairs = repair_json(f"Outline for {{topic}}: {OUTLINE_JSON} Enjoy {{it}}")
+    print(f"   Repairs: {repairs}")
+    assert len(value['sections']) == 2
+    print("   [OK] JSON extracted from surrounding text")
+
+    # Test 2: Trailing commas, including inside strings that must be kept
+    print("\n2. Testing trailing commas...")
+    value, repairs = repair_json('{"title": "A, B,}", "sections": [{"heading": "X",},],}')
+    assert value == {"title": "A, B,}", "sections": [{"heading": "X"}]}
+    assert 'trailing commas' in repairs
+    print("   [OK] Trailing commas removed outside strings only")
+
+    # Test 3: Truncated output keeps complete members
+    print("\n3. Testing truncated output...")
+    truncated = OUTLINE_JSON[:OUTLINE_JSON.index('"Fit"') + 3]
+    value, repairs = repair_json(truncated)
+    print(f"   Recovered: {value}")
+    assert value == {"title": "Running Shoes Guide", "sections": [{"heading": "Types"}]}
+    assert 'truncated' in repairs
+    print("   [OK] Complete sections kept, partial section dropped")
+
+    # Test 4: Arrays and unrecoverable input
+    print("\n4. Testing arrays and failures...")
+    assert parse_llm_json('Names:\n["Running Gear", "Yoga",]', expect=list) == ["Running Gear", "Yoga"]
+    for bad in ['', 'No JSON here', '{"title": "cut off']:
+        try:
+            parse_llm_json(bad)
+            assert False, f"expected failure for {bad!r}"
+        except JSONRepairError:
+            pass
+    print("   [OK] Unrecoverable responses raise JSONRepairError")
+
+    print("\nAll JSON repair tests passed!")
+
+
+if __name__ == "__main__":
+    test_json_repair()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test script for LLMClient response caching and token accounting"""
+
+import time
+import uuid
+from app.services.ai.llm_client import LLMClient, TokenUsage, compact_schema
+
+
+def test_llm_cache():
+    print("Testing LLMClient response cache...")
+
+    # Unique prompt so earlier runs can't have cached it
+    messages = [
+        {"role": "system", "content": "Answer with one word."},
+        {"role": "user", "content": f"Name a color. Request {uuid.uuid4().hex[:8]}"}
+    ]
+
+    # Test 1: Identical requests reuse the first response
+    print("\n1. Sending the same request twice...")
+    client = LLMClient()
+    start = time.time()
+    first = client.chat(messages, temperature=0.7, max_tokens=10)
+    first_time = time.time() - start
+
+    start = time.time()
+    second = client.chat(messages, temperature=0.7, max_tokens=10)
+    second_time = time.time() - start
+
+    print(f"   First: {first!r} ({first_time:.2f}s), second: {second!r} ({second_time:.3f}s)")
+    assert first == second
+    assert second_time < first_time
+    print("   [OK] Second response served from cache")
+
+    # Test 2: A different parameter is a different request
+    print("\n2. Changing max_tokens...")
+    identity = LLMClient.request_identity(client.model, messages, 0.7, 10)
+    assert identity != LLMClient.request_identity(client.model, messages, 0.7, 11)
+    assert identity == LLMClient.request_identity(client.model, [dict(m) for m in messages], 0.7, 10)
+    print("   [OK] Cache identity covers model, messages, temperature and max_tokens")
+
+    # Test 3: Bypass always calls the model
+    print("\n3. Testing use_cache=False...")
+    start = time.time()
+    fresh = LLMClient(use_cache=False).chat(messages, temperature=0.7, max_tokens=10)
+    print(f"   Fresh: {fresh!r} ({time.time() - start:.2f}s)")
+    print("   [OK] Bypass completed a new request")
+
+    # Test 4: Usage is recorded per label, cache hits without tokens
+    print("\n4. Testing token usage accounting...")
+    usage = TokenUsage()
+    counted = LLMClient(usage=usage)
+    counted.chat(messages, temperature=0.7, max_tokens=10, label='color')
+    summary = usage.summary()
+    print(f"   Usage: {summary}")
+    assert summary['calls'] == 1 and summary['cached_calls'] == 1
+    assert summary['total_tokens'] == 0
+    assert summary['by_label']['color']['calls'] == 1
+    print("   [OK] Cached call counted without tokens")
+
+    print("\nAll LLMClient tests passed!")
+
+
+def test_compact_schema():
+    print("Testing compact_schema...")
+    schema = """{
+  "title": "Title",
+  "tags": ["Tag 1", "Tag 2"],
+  "sections": [
+    {"heading": "Section 1", "points": ["Point 1", "Point 2"]},
+    {"heading": "Section 2", "points": ["Point 1", "Point 2"]}
+  ]
+}"""
+    compact = compact_schema(schema)
+    print(f"   {compact}")
+    assert compact == '{"title":"Title","tags":["Tag 1","Tag 2"],"sections":[{"heading":"Section 1","points":["Point 1","Point 2"]}]}'
+    print("   [OK] Repeated objects dropped, placeholders kept")
+
+
+if __name__ == "__main__":
+    test_compact_schema()
+    test_llm_cache()
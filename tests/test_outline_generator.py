@@ -95,5 +95,46 @@ def test_outline_generator():
         import traceback
         traceback.print_exc()
 
+def test_generate_outlines():
+    print("\nTesting OutlineGenerator.generate_outlines...")
+
+    generator = OutlineGenerator()
+    items = [
+        ({'keywords': ['running shoes', 'trail running shoes'], 'cluster_name': 'Running Shoes'}, []),
+        ({'cluster_name': 'Broken Cluster'}, []),  # missing keywords, must fail on its own
+        ({'keywords': ['yoga mats', 'non slip yoga mat'], 'cluster_name': 'Yoga Mats'}, [])
+    ]
+
+    results = generator.generate_outlines(items, max_workers=3)
+
+    assert len(results) == len(items)
+    for (cluster, _), result in zip(items, results):
+        status = 'failed: ' + result['error'] if result['error'] else result['outline'].get('title', 'N/A')
+        print(f"  {cluster['cluster_name']}: {status}")
+
+    assert results[1]['outline'] is None and results[1]['error']
+    assert all(r['outline'] and r['error'] is None for r in (results[0], results[2]))
+    print("  [OK] Results returned in input order with the failure isolated")
+
+def test_generate_outline_with_idea():
+    print("\nTesting OutlineGenerator.generate_outline_with_idea...")
+
+    generator = OutlineGenerator()
+    cluster = {
+        'keywords': ['running shoes', 'best running shoes', 'comfortable sneakers'],
+        'cluster_name': 'Running Shoes'
+    }
+
+    outline, post_idea = generator.generate_outline_with_idea(cluster, [])
+    print(f"  Outline: {outline.get('title', 'N/A')} ({len(outline.get('sections', []))} sections)")
+    print(f"  Post idea: {post_idea.get('title', 'N/A')}")
+
+    # Same shapes the pipeline and SlackFormatter.format_cluster_detail consume
+    assert isinstance(outline.get('sections'), list)
+    assert 'title' in post_idea and 'angle' in post_idea
+    print("  [OK] Outline and post idea parsed from one completion")
+
 if __name__ == "__main__":
-    test_outline_generator()
\ No newline at end of file
+    test_outline_generator()
+    test_generate_outlines()
+    test_generate_outline_with_idea()
\ No newline at end of file
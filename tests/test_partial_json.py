@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Test script for the streaming partial JSON parser"""
+
+import json
+from app.utils.partial_json import PartialJSONParser, parse_partial_json
+
+OUTLINE = {
+    "title": "Running Shoes: The \"Complete\" Guide",
+    "introduction": {"hooks": ["Hook 1", "Hook 2"], "overview": "What this post covers"},
+    "sections": [
+        {"heading": "Types of Running Shoes", "word_count_estimate": 300},
+        {"heading": "How to Choose {the right pair}", "word_count_estimate": 450}
+    ],
+    "conclusion": {"summary": "Key takeaways", "cta": None}
+}
+
+
+def test_partial_json():
+    print("Testing PartialJSONParser...")
+    text = "```json\n" + json.dumps(OUTLINE, indent=2) + "\n```"
+
+    # Test 1: Every prefix parses to something consistent with the final value
+    print("\n1. Feeding the outline one character at a time...")
+    parser = PartialJSONParser()
+    snapshots = []
+    for char in text:
+        parser.feed(char)
+        snapshot = parser.snapshot()
+        if snapshot is not None and (not snapshots or snapshot != snapshots[-1]):
+            snapshots.append(snapshot)
+
+    assert parser.complete
+    assert snapshots[-1] == OUTLINE
+    for snapshot in snapshots:
+        # Titles and headings only appear once complete
+        assert snapshot.get('title') in (None, OUTLINE['title'])
+        for section, expected in zip(snapshot.get('sections', []), OUTLINE['sections']):
+            assert section.get('heading') in (None, expected['heading'])
+    print(f"   {len(snapshots)} distinct snapshots, final value matches")
+    print("   [OK] Partial values are always valid prefixes")
+
+    # Test 2: Title and first section are usable before the document ends
+    print("\n2. Parsing a truncated outline...")
+    cut = text.index('"How to Choose')
+    partial = parse_partial_json(text[:cut])
+    print(f"   {partial}")
+    assert partial['title'] == OUTLINE['title']
+    assert partial['sections'][0] == OUTLINE['sections'][0]
+    assert partial['sections'][1] == {}  # opened, heading not yet complete
+    print("   [OK] Title and first section available mid-stream")
+
+    # Test 3: Numbers are held back until they are terminated
+    print("\n3. Testing number termination...")
+    assert parse_partial_json('{"a": 1, "b": 30') == {"a": 1}
+    assert parse_partial_json('{"a": 1, "b": 300}') == {"a": 1, "b": 300}
+    assert parse_partial_json('No JSON here') is None
+    print("   [OK] Incomplete numbers are not reported")
+
+    print("\nAll partial JSON tests passed!")
+
+
+if __name__ == "__main__":
+    test_partial_json()
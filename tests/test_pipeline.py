@@ -1,16 +1,23 @@
 #!/usr/bin/env python3
 """Test script for ProcessingPipeline"""
 
+from app.config import Config
+from app.services.data import job_queue
+from app.services.data.database import DatabaseService
 from app.services.processing.pipeline import ProcessingPipeline
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 import time
 
+# Process-local queue, so test jobs never reach the workers of a running bot
+job_queue._queue = job_queue.JobQueue()
+
 class MockSlackClient:
     """Mock Slack client for testing"""
 
     def __init__(self):
         self.messages = []
         self.files = []
+        self.updates = 0
 
     def chat_postMessage(self, channel, text=None, blocks=None):
         message = {
@@ -18,6 +25,7 @@ class MockSlackClient:
             'text': text,
             'blocks': blocks
         }
+        message['ts'] = str(len(self.messages) + 1)
         self.messages.append(message)
         # Handle encoding issues with emojis
         safe_text = text or 'Blocks sent'
@@ -25,6 +33,14 @@ class MockSlackClient:
             print(f"Slack Message: {safe_text}")
         except UnicodeEncodeError:
             print(f"Slack Message: {safe_text.encode('ascii', 'ignore').decode('ascii')}")
+        return {'ok': True, 'ts': message['ts']}
+
+    def chat_update(self, channel, ts, text=None, blocks=None):
+        for message in self.messages:
+            if message['ts'] == ts:
+                message.update({'text': text, 'blocks': blocks})
+        self.updates += 1
+        return {'ok': True, 'ts': ts}
 
     def files_upload_v2(self, channel, file, title, initial_comment):
         upload = {
@@ -36,6 +52,99 @@ class MockSlackClient:
         self.files.append(upload)
         print(f"📎 File Uploaded: {title}")
 
+# Payment Gateway Test Scenarios - Based on White-Label Payment Gateways Guide
+payment_gateway_scenarios = {
+    "common_user_prompts": [
+        # Typical keyword lists for payment gateway content
+        [
+            "white label payment gateway",
+            "payment gateway white label solution",
+            "best white label payment gateway",
+            "white label payment gateway software",
+            "white label payment gateway platform"
+        ],
+        [
+            "white label cryptocurrency payment gateway",
+            "crypto payment gateway white label",
+            "white label crypto payment gateway",
+            "white label crypto payments gateway",
+            "white label crypto payment gateway solution"
+        ],
+        [
+            "white label payment gateway uk",
+            "white label payment gateway solution company in europe",
+            "white label payment gateway solution company in uk"
+        ],
+        [
+            "white label payment gateway price",
+            "white label payment gateway prices",
+            "white label payment gateway cost",
+            "how much do white label payment gateways cost"
+        ]
+    ],
+    "edge_cases": [
+        # Empty inputs
+        [],
+        # Single keyword
+        ["white label payment gateway"],
+        # Duplicates
+        ["white label payment gateway", "white label payment gateway", "payment gateway white label solution", "payment gateway white label solution"],
+        # Very long list (50+ keywords)
+        [
+            "white label payment gateway", "white-label payment gateway", "white label payment gateways",
+            "what is white label payment gateway", "what is a white label payment gateway", "white label payment gateway meaning",
+            "benefits of white label payment gateway", "benefits of using a white-label payment gateway",
+            "white label payment gateway uk", "white label payment gateway solution company in europe",
+            "white label payment gateway solution company in uk", "white label payment gateway price",
+            "white label payment gateway prices", "white label payment gateway cost",
+            "white label payment gateway solution", "payment gateway white label solution",
+            "white label payment gateway solutions", "white label payment gateway software",
+            "white-label payment gateway software", "white label payment gateway platform",
+            "best white label payment gateway", "best white-label payment gateway for businesses",
+            "best white label payment gateways", "white label cryptocurrency payment gateway",
+            "crypto payment gateway white label", "white label crypto payment gateway",
+            "white label crypto payments gateway", "white label crypto payments gateway solution",
+            "white label crypto payment gateway development", "white-label cryptocurrency payment gateway development",
+            "how do payment gateways work", "types of businesses use white-label payment gateways",
+            "ecommerce white label payment gateway", "trading white label payment gateway",
+            "PSP white label payment gateway", "crypto white label payment gateway",
+            "benefits of using a white-label payment gateway", "cost effective white label payment gateway",
+            "custom branding white label payment gateway", "fast deployment white label payment gateway",
+            "global access white label payment gateway", "built-in compliance white label payment gateway",
+            "how to choose the right white label payment gateway", "cost structure white label payment gateway",
+            "pricing white label payment gateway", "security standards white label payment gateway",
+            "compliance white label payment gateway", "customization capabilities white label payment gateway",
+            "integration options white label payment gateway", "industry expertise white label payment gateway",
+            "how much do white label payment gateways cost", "best white label payment gateway providers in 2025",
+            "ivy white label payment gateway", "stripe white label payment gateway",
+            "decta white label payment gateway", "corefy white label payment gateway",
+            "payabl white label payment gateway"
+        ],
+        # Ambiguous/unclear keywords
+        ["payment", "gateway", "white", "label", "solution", "best", "2025"],
+        # Mixed with irrelevant terms
+        ["white label payment gateway", "cats", "dogs", "pizza recipes", "best running shoes 2024"],
+        # Special characters and formatting
+        ["white-label payment gateway!", "payment gateway @ white label", "white#label$payment%gateway"],
+        # Very short keywords
+        ["a", "b", "c", "d", "e"]
+    ]
+}
+
+def run_queued(client, slack_user_id, keywords, source):
+    """Queue keywords as /process_keywords does and run the job as a worker would"""
+    pipeline = ProcessingPipeline(client, "test_channel", slack_user_id)
+    pipeline.start_from_keywords(keywords, source=source)
+
+    job = job_queue.get_job_queue().dequeue('test-pipeline')
+    try:
+        ProcessingPipeline.run_job(client, job)
+    finally:
+        job_queue.get_job_queue().finish(job)
+
+    batch = DatabaseService().get_batch(job['batch_id']) if job.get('batch_id') else None
+    return batch['status'] if batch else None
+
 def test_pipeline():
     print("Testing ProcessingPipeline...")
 
@@ -56,98 +165,16 @@ def test_pipeline():
         "cardio workout plans"
     ]
 
-    # Payment Gateway Test Scenarios - Based on White-Label Payment Gateways Guide
-    payment_gateway_scenarios = {
-        "common_user_prompts": [
-            # Typical keyword lists for payment gateway content
-            [
-                "white label payment gateway",
-                "payment gateway white label solution",
-                "best white label payment gateway",
-                "white label payment gateway software",
-                "white label payment gateway platform"
-            ],
-            [
-                "white label cryptocurrency payment gateway",
-                "crypto payment gateway white label",
-                "white label crypto payment gateway",
-                "white label crypto payments gateway",
-                "white label crypto payment gateway solution"
-            ],
-            [
-                "white label payment gateway uk",
-                "white label payment gateway solution company in europe",
-                "white label payment gateway solution company in uk"
-            ],
-            [
-                "white label payment gateway price",
-                "white label payment gateway prices",
-                "white label payment gateway cost",
-                "how much do white label payment gateways cost"
-            ]
-        ],
-        "edge_cases": [
-            # Empty inputs
-            [],
-            # Single keyword
-            ["white label payment gateway"],
-            # Duplicates
-            ["white label payment gateway", "white label payment gateway", "payment gateway white label solution", "payment gateway white label solution"],
-            # Very long list (50+ keywords)
-            [
-                "white label payment gateway", "white-label payment gateway", "white label payment gateways",
-                "what is white label payment gateway", "what is a white label payment gateway", "white label payment gateway meaning",
-                "benefits of white label payment gateway", "benefits of using a white-label payment gateway",
-                "white label payment gateway uk", "white label payment gateway solution company in europe",
-                "white label payment gateway solution company in uk", "white label payment gateway price",
-                "white label payment gateway prices", "white label payment gateway cost",
-                "white label payment gateway solution", "payment gateway white label solution",
-                "white label payment gateway solutions", "white label payment gateway software",
-                "white-label payment gateway software", "white label payment gateway platform",
-                "best white label payment gateway", "best white-label payment gateway for businesses",
-                "best white label payment gateways", "white label cryptocurrency payment gateway",
-                "crypto payment gateway white label", "white label crypto payment gateway",
-                "white label crypto payments gateway", "white label crypto payments gateway solution",
-                "white label crypto payment gateway development", "white-label cryptocurrency payment gateway development",
-                "how do payment gateways work", "types of businesses use white-label payment gateways",
-                "ecommerce white label payment gateway", "trading white label payment gateway",
-                "PSP white label payment gateway", "crypto white label payment gateway",
-                "benefits of using a white-label payment gateway", "cost effective white label payment gateway",
-                "custom branding white label payment gateway", "fast deployment white label payment gateway",
-                "global access white label payment gateway", "built-in compliance white label payment gateway",
-                "how to choose the right white label payment gateway", "cost structure white label payment gateway",
-                "pricing white label payment gateway", "security standards white label payment gateway",
-                "compliance white label payment gateway", "customization capabilities white label payment gateway",
-                "integration options white label payment gateway", "industry expertise white label payment gateway",
-                "how much do white label payment gateways cost", "best white label payment gateway providers in 2025",
-                "ivy white label payment gateway", "stripe white label payment gateway",
-                "decta white label payment gateway", "corefy white label payment gateway",
-                "payabl white label payment gateway"
-            ],
-            # Ambiguous/unclear keywords
-            ["payment", "gateway", "white", "label", "solution", "best", "2025"],
-            # Mixed with irrelevant terms
-            ["white label payment gateway", "cats", "dogs", "pizza recipes", "best running shoes 2024"],
-            # Special characters and formatting
-            ["white-label payment gateway!", "payment gateway @ white label", "white#label$payment%gateway"],
-            # Very short keywords
-            ["a", "b", "c", "d", "e"]
-        ]
-    }
-
     # Initialize pipeline with a valid UUID for user_id
     import uuid
     test_user_id = str(uuid.uuid4())
-    pipeline = ProcessingPipeline(mock_client, "test_channel", test_user_id)
 
     print(f"Starting pipeline with {len(test_keywords)} keywords...")
-    pipeline.start_from_keywords(test_keywords, source='test')
+    start = time.time()
+    status = run_queued(mock_client, test_user_id, test_keywords, 'test')
 
-    # Wait for processing to complete (since it's async)
-    print("Waiting for processing to complete...")
-    time.sleep(30)  # Adjust based on expected processing time
-
-    print(f"\nTest completed!")
+    print(f"\nTest completed in {time.time() - start:.1f}s with batch status: {status}")
+    assert status == 'completed'
     print(f"Messages sent: {len(mock_client.messages)}")
     print(f"Files uploaded: {len(mock_client.files)}")
 
@@ -166,6 +193,48 @@ def test_pipeline():
         for file in mock_client.files:
             print(f"  - {file['title']}")
 
+def test_slack_calls():
+    """A multi-cluster batch costs one status message plus one post per cluster"""
+    print("Testing Slack API calls per batch...")
+    client = MockSlackClient()
+    clusters = [
+        {'cluster_number': n, 'cluster_name': f"Cluster {n}", 'keywords': [f"keyword {n}"], 'keyword_count': 1}
+        for n in range(1, 7)
+    ]
+
+    def stream_outline(cluster, scraped_data, on_partial=None):
+        # A streamed outline reports many partial drafts
+        for sections in range(20):
+            if on_partial:
+                on_partial({'sections': [{'heading': f"Section {i}"} for i in range(sections)]})
+        return {'title': cluster['cluster_name'], 'sections': []}, {'title': cluster['cluster_name']}
+
+    outline_gen = Mock()
+    outline_gen.generate_outline.side_effect = lambda c, d, on_partial=None: stream_outline(c, d, on_partial)[0]
+    outline_gen.generate_outline_with_idea.side_effect = stream_outline
+    search = Mock()
+    search.search_single.return_value = [{'url': 'https://example.com'}]
+    scraper = Mock()
+    scraper.scrape_urls.return_value = [{'url': 'https://example.com', 'success': True, 'bytes_read': 100}]
+
+    module = 'app.services.processing.pipeline'
+    with patch(f"{module}.DatabaseService"), patch(f"{module}.LLMClient"), \
+            patch(f"{module}.WebSearchService", return_value=search), \
+            patch(f"{module}.ContentScraper", return_value=scraper), \
+            patch(f"{module}.OutlineGenerator", return_value=outline_gen), \
+            patch(f"{module}.IdeaGenerator"), patch.object(Config, 'STREAM_OUTLINES', True):
+        pipeline = ProcessingPipeline(client, "test_channel", "U_CALLS")
+        pipeline._send_progress(" Cleaning keywords...")
+        pipeline._process_clusters('batch-calls', clusters)
+        pipeline._send_progress(" Processing complete", emoji="✅", final=True)
+
+    calls = len(client.messages) + client.updates
+    print(f"   {len(client.messages)} posts and {client.updates} updates for {len(clusters)} clusters")
+    assert len(client.messages) == 1 + len(clusters)  # status message and each cluster's details
+    assert calls <= len(clusters) + 4
+    assert 'Clusters done: 6/6' in client.messages[0]['text']
+    print("   [OK] Cluster progress shared the status message")
+
 def test_payment_gateway_scenarios():
     """Test payment gateway scenarios from the White-Label Payment Gateways Guide"""
     print("\n" + "="*60)
@@ -187,13 +256,11 @@ def test_payment_gateway_scenarios():
 
         # Reset mock client for each test
         mock_client = MockSlackClient()
-        pipeline = ProcessingPipeline(mock_client, "test_channel", test_user_id)
 
         try:
-            pipeline.start_from_keywords(keywords, source='payment_gateway_test')
-            time.sleep(15)  # Shorter wait for smaller datasets
+            status = run_queued(mock_client, test_user_id, keywords, 'payment_gateway_test')
 
-            print(f"✓ Processing completed - Messages: {len(mock_client.messages)}, Files: {len(mock_client.files)}")
+            print(f"✓ Processing {status} - Messages: {len(mock_client.messages)}, Files: {len(mock_client.files)}")
 
             # Show cluster summary if available
             cluster_messages = [msg for msg in mock_client.messages if 'cluster' in (msg.get('text') or '').lower()]
@@ -219,17 +286,15 @@ def test_payment_gateway_scenarios():
 
         # Reset mock client for each test
         mock_client = MockSlackClient()
-        pipeline = ProcessingPipeline(mock_client, "test_channel", test_user_id)
 
         try:
             if not keywords:  # Handle empty list
                 print("⚠️  Skipping empty keyword list")
                 continue
 
-            pipeline.start_from_keywords(keywords, source='payment_gateway_edge_case')
-            time.sleep(10)  # Even shorter for edge cases
+            status = run_queued(mock_client, test_user_id, keywords, 'payment_gateway_edge_case')
 
-            print(f"✓ Processing completed - Messages: {len(mock_client.messages)}, Files: {len(mock_client.files)}")
+            print(f"✓ Processing {status} - Messages: {len(mock_client.messages)}, Files: {len(mock_client.files)}")
 
             # Check for errors
             error_messages = [msg for msg in mock_client.messages if 'error' in (msg.get('text') or '').lower()]
@@ -244,5 +309,6 @@ def test_payment_gateway_scenarios():
     print("="*60)
 
 if __name__ == "__main__":
+    test_slack_calls()
     test_pipeline()
     test_payment_gateway_scenarios()
\ No newline at end of file
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Test script for Profiler"""
+
+import json
+import threading
+import time
+from app.utils.profiler import Profiler
+
+
+def test_profiler():
+    print("Testing Profiler...")
+    profiler = Profiler()
+
+    # Test 1: Spans are timed and their counters summed per stage
+    print("\n1. Testing spans...")
+    with profiler.span('scrape', url='https://a.example') as span:
+        time.sleep(0.05)
+        span['bytes'] = 1000
+    profiler.record('scrape', 0.02, url='https://b.example', bytes=500)
+    profiler.record('llm.outline', 0.5, prompt_tokens=900, completion_tokens=300)
+
+    profile = profiler.summary()
+    scrape = profile['stages']['scrape']
+    print(f"   scrape: {scrape}")
+    assert scrape['count'] == 2 and scrape['bytes'] == 1500
+    assert scrape['seconds'] >= 0.07 and scrape['max_seconds'] >= 0.05
+    assert profile['stages']['llm.outline']['prompt_tokens'] == 900
+    assert [s['url'] for s in profile['spans'] if s['name'] == 'scrape'] == ['https://a.example', 'https://b.example']
+    assert profiler.slowest(1) == [('llm.outline', 0.5)]
+    print("   [OK] Durations, bytes and tokens recorded")
+
+    # Test 2: Failing spans are marked and re-raised
+    print("\n2. Testing errors...")
+    try:
+        with profiler.span('search'):
+            raise TimeoutError("slow")
+    except TimeoutError:
+        pass
+    assert profiler.summary()['stages']['search']['errors'] == 1
+    print("   [OK] Error recorded")
+
+    # Test 3: Spans from many threads
+    print("\n3. Testing threads...")
+    threads = [threading.Thread(target=lambda: [profiler.record('outline', 0.01) for _ in range(100)])
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    profile = profiler.summary()
+    assert profile['stages']['outline']['count'] == 800
+    assert len(profile['spans']) + profile['dropped_spans'] == 804
+    json.dumps(profile)
+    print(f"   [OK] 800 spans counted, {profile['dropped_spans']} not kept individually")
+
+    print("\nAll Profiler tests passed!")
+
+
+if __name__ == "__main__":
+    test_profiler()
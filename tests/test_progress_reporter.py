@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Test script for ProgressReporter"""
+
+import time
+from app.utils.progress_reporter import ProgressReporter, backoff_remaining, rate_limit_delay
+
+
+class FakeResponse(dict):
+    def __init__(self, error, status_code, headers=None):
+        super().__init__(ok=False, error=error)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeSlackError(Exception):
+    def __init__(self, response):
+        super().__init__(response['error'])
+        self.response = response
+
+
+class FakeClient:
+    def __init__(self, rate_limit_once=False):
+        self.posts = []
+        self.updates = []
+        self.rate_limit_once = rate_limit_once
+
+    def chat_postMessage(self, **kwargs):
+        self.posts.append(kwargs['text'])
+        return {'ok': True, 'ts': '1.0'}
+
+    def chat_update(self, **kwargs):
+        if self.rate_limit_once:
+            self.rate_limit_once = False
+            raise FakeSlackError(FakeResponse('ratelimited', 429, {'Retry-After': '1'}))
+        self.updates.append(kwargs['text'])
+        return {'ok': True}
+
+
+def test_progress_reporter():
+    print("Testing ProgressReporter...")
+
+    # Test 1: A burst of updates is sent as one edit
+    print("\n1. Testing coalescing...")
+    client = FakeClient()
+    reporter = ProgressReporter(client, 'C_COALESCE', interval=0.3)
+    for i in range(20):
+        reporter.update(f"step {i}")
+    time.sleep(0.5)
+    print(f"   Posts: {client.posts}, updates: {client.updates}")
+    assert client.posts == ['step 0']
+    assert client.updates == ['step 19']
+    assert reporter.api_calls == 2
+    print("   [OK] 20 updates cost 2 Slack calls")
+
+    # Test 2: flush sends pending content right away
+    print("\n2. Testing flush...")
+    reporter.update("done")
+    reporter.flush()
+    assert client.updates[-1] == 'done'
+    print("   [OK] Final content sent")
+
+    # Test 3: Retry-After is respected
+    print("\n3. Testing rate limit backoff...")
+    error = FakeSlackError(FakeResponse('ratelimited', 429, {'Retry-After': '1'}))
+    assert rate_limit_delay(error) == 1.0
+    assert rate_limit_delay(FakeSlackError(FakeResponse('channel_not_found', 404))) is None
+
+    client = FakeClient(rate_limit_once=True)
+    reporter = ProgressReporter(client, 'C_LIMITED', interval=0)
+    reporter.update("first")
+    reporter.update("second")
+    assert backoff_remaining('C_LIMITED') > 0
+    reporter.update("third")
+    start = time.time()
+    reporter.flush()
+    print(f"   Updates: {client.updates}, flushed after {time.time() - start:.2f}s")
+    assert client.updates == ['third']
+    assert time.time() - start >= 0.8
+    print("   [OK] Waited for Retry-After and sent only the latest content")
+
+    print("\nAll ProgressReporter tests passed!")
+
+
+if __name__ == "__main__":
+    test_progress_reporter()
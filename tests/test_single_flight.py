@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Test script for SingleFlight request de-duplication"""
+
+import threading
+import time
+from app.utils.single_flight import SingleFlight
+
+
+def test_single_flight():
+    print("Testing SingleFlight...")
+    flights = SingleFlight()
+
+    # Test 1: Concurrent calls with the same key run once
+    print("\n1. Testing concurrent calls with the same key...")
+    calls = []
+
+    def slow_search():
+        calls.append(1)
+        time.sleep(0.2)
+        return ['result']
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flights.do('running shoes|5', slow_search)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"   Upstream calls: {len(calls)}, results: {len(results)}")
+    assert len(calls) == 1
+    assert results == [['result']] * 5
+    print("   [OK] One upstream call shared by all callers")
+
+    # Test 2: Later calls run again once the flight has landed
+    print("\n2. Testing sequential calls...")
+    flights.do('running shoes|5', slow_search)
+    assert len(calls) == 2
+    print("   [OK] Completed flights are not reused")
+
+    # Test 3: Errors are shared with waiting callers
+    print("\n3. Testing error propagation...")
+
+    def failing_search():
+        time.sleep(0.1)
+        raise ValueError("upstream failed")
+
+    errors = []
+
+    def call_failing():
+        try:
+            flights.do('broken', failing_search)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call_failing) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ['upstream failed'] * 3
+    print("   [OK] All callers received the error")
+
+    print("\nAll SingleFlight tests passed!")
+
+
+if __name__ == "__main__":
+    test_single_flight()